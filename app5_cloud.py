@@ -9,9 +9,16 @@ import requests
 import os
 import shutil
 from pathlib import Path
-import tempfile
+import hashlib
+import functools
+import time
+import uuid
 from datetime import datetime
 
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
 # ============================================================================
 # PAGE CONFIG - MUSS GANZ AM ANFANG SEIN!
 # ============================================================================
@@ -128,6 +135,10 @@ if "show_title" not in st.session_state:
     st.session_state.show_title = True
 if "show_header" not in st.session_state:
     st.session_state.show_header = True
+if "fast_render" not in st.session_state:
+    st.session_state.fast_render = False
+if "word_streaming" not in st.session_state:
+    st.session_state.word_streaming = False
 if "use_new_knr" not in st.session_state:
     st.session_state.use_new_knr = False
 if "use_knr_column" not in st.session_state:
@@ -138,23 +149,41 @@ if "use_meisterschaft" not in st.session_state:
     st.session_state.use_meisterschaft = False
 if "meisterschaft_data" not in st.session_state:
     st.session_state.meisterschaft_data = {}
-
-
-def apply_knr_mapping(starterlist: dict, mapping: dict) -> dict:
-    """Ersetzt cno in allen Pferden gemaess KNr-Mapping (alt -> neu)."""
-    if not mapping:
-        return starterlist
-    import copy
-    sl = copy.deepcopy(starterlist)
-    for starter in sl.get("starters", []):
-        for horse in starter.get("horses", []):
-            old_cno = str(horse.get("cno", ""))
-            if old_cno in mapping:
-                horse["cno"] = mapping[old_cno]
-    return sl
-
-from pdf_export import create_pdf
-from word_export import create_word
+if "export_traces" not in st.session_state:
+    st.session_state.export_traces = []
+if "profile_mode" not in st.session_state:
+    st.session_state.profile_mode = ""
+if "api_refresh" not in st.session_state:
+    st.session_state.api_refresh = False
+if "job_owner" not in st.session_state:
+    st.session_state.job_owner = uuid.uuid4().hex
+
+
+from starterlist_model import Starterlist
+
+def apply_knr_mapping(starterlist: Starterlist, mapping: dict) -> dict:
+    """
+    Liefert das Export-Dict aus dem Session-Modell mit ersetzten cno gemaess
+    KNr-Mapping (alt -> neu). Das Mapping wird als Overlay angewendet: nur
+    betroffene Starter/Pferde werden flach kopiert, der Rest wird geteilt.
+    """
+    return starterlist.to_api(cno_map=mapping)
+
+# pdf_export/word_export (reportlab, PIL, python-docx) werden erst im
+# Export-Job importiert; nach dem Login wärmt export_warmup sie (und in der
+# Sidebar die gewählten Templates) im Hintergrund vor.
+from word_templates import registry as word_template_registry
+from file_index import index as file_index
+import export_history
+import export_jobs
+import export_metrics
+import export_profiler
+import export_warmup
+import output_store
+import template_manifest
+
+export_warmup.start()
+output_store.start_janitor(tasks=(export_history.history.collect,))
 
 # API Configuration
 API_BASE = st.secrets.get("API_BASE", "https://toris.online/api/results/v1")
@@ -164,12 +193,10 @@ BASE_DIR = Path(".")
 TEMPLATES_DIR = BASE_DIR / "templates" / "pdf"
 WORD_TEMPLATES_DIR = BASE_DIR / "templates" / "word"
 LOGOS_DIR = BASE_DIR / "logos"
-OUTPUT_DIR = Path(tempfile.gettempdir()) / "toris_output"
 
 TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 WORD_TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 LOGOS_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # ============================================================================
 # STYLING
@@ -243,29 +270,21 @@ def apply_custom_styles():
 # FILE MANAGEMENT FUNCTIONS
 # ============================================================================
 
+LOGO_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+
 def get_available_templates():
-    templates = []
-    if TEMPLATES_DIR.exists():
-        for f in TEMPLATES_DIR.glob("*.py"):
-            if not f.name.startswith("__"):
-                templates.append(f.stem)
-    return sorted(templates)
+    return file_index.stems(TEMPLATES_DIR, (".py",))
 
 def get_available_word_templates_from_folder():
-    """Liest Word-Templates aus templates/word/ Ordner"""
-    templates = []
-    if WORD_TEMPLATES_DIR.exists():
-        for f in WORD_TEMPLATES_DIR.glob("*.py"):
-            if not f.name.startswith("__"):
-                templates.append(f.stem)
-    return sorted(templates)
+    """Liest Word-Templates aus templates/word/ Ordner (über die Template-Registry)"""
+    return word_template_registry.names()
 
 def get_user_logos_dir():
     """Gibt das Logo-Verzeichnis für den aktuellen User zurück"""
     username = st.session_state.get("username", "Standard")
     if username and username.strip() and username.strip().lower() != "standard":
         user_dir = LOGOS_DIR / username.strip()
-        user_dir.mkdir(parents=True, exist_ok=True)
+        file_index.ensure_dir(user_dir)
         return user_dir
     return LOGOS_DIR
 
@@ -305,10 +324,10 @@ def github_upload_logo(logo_name: str, file_bytes: bytes) -> bool:
 
     r = requests.put(url, headers=_github_api_headers(), json=payload)
     if r.status_code in (200, 201):
-        print(f"GITHUB: Logo hochgeladen: {path}")
+        log.info("GITHUB: Logo hochgeladen: %s", path)
         return True
     else:
-        print(f"GITHUB ERROR: Upload fehlgeschlagen: {r.status_code} {r.text}")
+        log.error("Upload fehlgeschlagen: %s %s", r.status_code, r.text)
         return False
 
 def github_delete_logo(logo_name: str) -> bool:
@@ -320,27 +339,21 @@ def github_delete_logo(logo_name: str) -> bool:
     # SHA ermitteln
     r = requests.get(url, headers=_github_api_headers())
     if r.status_code != 200:
-        print(f"GITHUB ERROR: Datei nicht gefunden: {path}")
+        log.error("Datei nicht gefunden: %s", path)
         return False
     sha = r.json().get("sha")
 
     payload = {"message": f"Logo delete: {path}", "sha": sha}
     r = requests.delete(url, headers=_github_api_headers(), json=payload)
     if r.status_code == 200:
-        print(f"GITHUB: Logo gelöscht: {path}")
+        log.info("GITHUB: Logo gelöscht: %s", path)
         return True
     else:
-        print(f"GITHUB ERROR: Löschen fehlgeschlagen: {r.status_code} {r.text}")
+        log.error("Löschen fehlgeschlagen: %s %s", r.status_code, r.text)
         return False
 
 def get_available_logos():
-    logos = []
-    logos_dir = get_user_logos_dir()
-    if logos_dir.exists():
-        for f in logos_dir.glob("*"):
-            if f.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-                logos.append(f.name)
-    return sorted(logos)
+    return list(file_index.files(get_user_logos_dir(), LOGO_SUFFIXES))
 
 def delete_logo(logo_name):
     """Löscht Logo lokal UND im GitHub-Repository"""
@@ -348,6 +361,7 @@ def delete_logo(logo_name):
     logo_path = get_user_logos_dir() / logo_name
     if logo_path.exists():
         logo_path.unlink()
+        file_index.invalidate(logo_path.parent)
     # GitHub löschen
     return github_delete_logo(logo_name)
 
@@ -355,6 +369,7 @@ def delete_template(template_name):
     template_path = TEMPLATES_DIR / f"{template_name}.py"
     if template_path.exists():
         template_path.unlink()
+        file_index.invalidate(TEMPLATES_DIR)
         return True
     return False
 
@@ -363,6 +378,7 @@ def delete_word_template(template_name):
     template_path = WORD_TEMPLATES_DIR / f"{template_name}.py"
     if template_path.exists():
         template_path.unlink()
+        word_template_registry.invalidate(template_name)
         return True
     return False
 
@@ -370,6 +386,7 @@ def save_uploaded_file(uploaded_file, target_dir):
     target_path = target_dir / uploaded_file.name
     with open(target_path, "wb") as f:
         f.write(uploaded_file.getbuffer())
+    file_index.invalidate(target_dir)
     return target_path
 
 def render_file_manager():
@@ -434,7 +451,11 @@ def render_file_manager():
         if uploaded_word_template:
             if st.button("✅ Template speichern", key="save_word_template"):
                 try:
-                    save_uploaded_file(uploaded_word_template, WORD_TEMPLATES_DIR)
+                    saved_path = save_uploaded_file(uploaded_word_template, WORD_TEMPLATES_DIR)
+                    if saved_path.suffix == ".py":
+                        word_template_registry.invalidate(saved_path.stem)
+                    else:
+                        word_template_registry.invalidate()  # .docx-Vorlage: alle neu laden
                     st.success(f"✅ Template '{uploaded_word_template.name}' gespeichert!")
                     # Clear uploader
                     if "word_template_upload_key" not in st.session_state:
@@ -507,9 +528,10 @@ def render_file_manager():
         
         if logos:
             cols = st.columns(4)
+            logos_dir = get_user_logos_dir()
             for idx, logo in enumerate(logos):
                 with cols[idx % 4]:
-                    logo_path = get_user_logos_dir() / logo
+                    logo_path = logos_dir / logo
                     try:
                         st.image(str(logo_path), caption=logo, width=150)
                         if st.button("🗑️", key=f"del_logo_{logo}"):
@@ -527,31 +549,114 @@ def render_file_manager():
 # API FUNCTIONS
 # ============================================================================
 
-def fetch_shows(api_key, include_closed=False):
+# Gemeinsamer API-Cache für alle Sessions: Schlüssel = Hash des API-Keys +
+# URL + Parameter. Jeder Endpoint hat eine eigene maximale Alterung (Sekunden);
+# Veranstaltungen ändern sich selten, Starterlisten während des Turniers oft.
+API_CACHE_TTL = {
+    "Shows": 900,
+    "Competitions": 300,
+    "Competition": 300,
+    "Starterlist": 60,
+}
+_API_CACHEABLE_STATUS = (200, 404)  # 404 steuert die Umlauf-Prüfung in fetch_starterlist
+
+class _ApiResponse:
+    """Antwort aus dem Cache mit den Teilen von requests.Response, die fetch_* nutzen"""
+
+    def __init__(self, status_code, data, url):
+        self.status_code = status_code
+        self._data = data
+        self.url = url
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+class _ApiNotCacheable(Exception):
+    """Antwort mit Status außerhalb von _API_CACHEABLE_STATUS (wird nicht gecacht)"""
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+@st.cache_data(ttl=max(API_CACHE_TTL.values()), max_entries=500, show_spinner=False)
+def _cached_api_get(url, params, key_hash, generation, _headers, _timeout):
+    response = requests.get(url, headers=_headers, params=params, timeout=_timeout)
+    if response.status_code not in _API_CACHEABLE_STATUS:
+        raise _ApiNotCacheable(response)
+    data = response.json() if response.status_code == 200 else None
+    return response.status_code, data, time.time()
+
+@st.cache_resource
+def _api_generations():
+    """Generation je Anfrage (prozessweit); erhöhen = Cache-Eintrag für alle ersetzen"""
+    return {}
+
+def api_key_hash(api_key):
+    """Kurzer Hash des API-Keys (Cache- und Verlaufs-Schlüssel, ohne den Key selbst zu speichern)"""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+def _api_get(endpoint, url, headers=None, params=None, timeout=10, refresh=False):
+    """
+    GET an die TORIS-API über den gemeinsamen Cache (Span "api" im aktiven
+    Trace, Tags status und cached). refresh=True holt neu vom Server.
+    """
+    headers = headers or {}
+    params = dict(params or {})
+    key_hash = api_key_hash(headers.get("X-API-Key", ""))
+    cache_key = (key_hash, url, tuple(sorted(params.items())))
+    generations = _api_generations()
+    if refresh:
+        generations[cache_key] = generations.get(cache_key, 0) + 1
+
+    with export_metrics.span("api", endpoint=endpoint) as s:
+        started = time.time()
+        try:
+            status, data, fetched_at = _cached_api_get(
+                url, params, key_hash, generations.get(cache_key, 0), headers, timeout
+            )
+            if started - fetched_at > API_CACHE_TTL.get(endpoint, 0):
+                # Für diesen Endpoint zu alt: nächste Generation holen
+                generations[cache_key] = generations.get(cache_key, 0) + 1
+                status, data, fetched_at = _cached_api_get(
+                    url, params, key_hash, generations[cache_key], headers, timeout
+                )
+            response = _ApiResponse(status, data, url)
+            cached = fetched_at < started
+        except _ApiNotCacheable as e:
+            response, cached = e.response, False
+        if s is not None:
+            s["tags"].update(status=response.status_code, cached=cached)
+    return response
+
+def fetch_shows(api_key, include_closed=False, refresh=False):
     try:
         url = f"{API_BASE}/Shows"
         if include_closed:
             url += "?includeCompletedOrClosed=true"
         headers = {"X-API-Key": api_key} if api_key else {}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _api_get("Shows", url, headers=headers, timeout=10, refresh=refresh)
         response.raise_for_status()
         return response.json()
     except Exception as e:
         st.error(f"❌ API Fehler: {e}")
         return []
 
-def fetch_competitions(api_key, show_number):
+def fetch_competitions(api_key, show_number, refresh=False):
     try:
         url = f"{API_BASE}/Shows/{show_number}/Competitions"
         headers = {"X-API-Key": api_key} if api_key else {}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _api_get("Competitions", url, headers=headers, timeout=10, refresh=refresh)
         response.raise_for_status()
         return response.json()
     except Exception as e:
         st.error(f"❌ Fehler beim Laden der Prüfungen: {e}")
         return []
 
-def fetch_starterlist(api_key, show_number, comp_number, comp_div=None, round_number=1):
+def fetch_starterlist(api_key, show_number, comp_number, comp_div=None, round_number=1, refresh=False):
     headers = {"X-API-Key": api_key} if api_key else {}
     params = {"roundNumber": round_number}
 
@@ -559,13 +664,13 @@ def fetch_starterlist(api_key, show_number, comp_number, comp_div=None, round_nu
     if comp_div:
         url = f"{API_BASE}/Shows/{show_number}/Competitions/{comp_number}/{comp_div}/Starterlist"
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = _api_get("Starterlist", url, headers=headers, params=params, timeout=10, refresh=refresh)
             if response.status_code == 200:
                 data = response.json()
-                data = _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_number)
+                data = _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_number, refresh)
                 return data
             elif response.status_code == 404 and round_number > 1:
-                test_response = requests.get(url, headers=headers, params={"roundNumber": 1}, timeout=10)
+                test_response = _api_get("Starterlist", url, headers=headers, params={"roundNumber": 1}, timeout=10, refresh=refresh)
                 if test_response.status_code == 200:
                     raise ValueError(f"Runde {round_number} existiert nicht für diese Prüfung")
         except ValueError:
@@ -576,13 +681,13 @@ def fetch_starterlist(api_key, show_number, comp_number, comp_div=None, round_nu
     # Ohne Division (Fallback)
     url = f"{API_BASE}/Shows/{show_number}/Competitions/{comp_number}/Starterlist"
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _api_get("Starterlist", url, headers=headers, params=params, timeout=10, refresh=refresh)
         if response.status_code == 200:
             data = response.json()
-            data = _patch_breaks(data, api_key, show_number, comp_number, None, round_number)
+            data = _patch_breaks(data, api_key, show_number, comp_number, None, round_number, refresh)
             return data
         elif response.status_code == 404 and round_number > 1:
-            test_response = requests.get(url, headers=headers, params={"roundNumber": 1}, timeout=10)
+            test_response = _api_get("Starterlist", url, headers=headers, params={"roundNumber": 1}, timeout=10, refresh=refresh)
             if test_response.status_code == 200:
                 raise ValueError(f"Runde {round_number} existiert nicht für diese Prüfung")
         response.raise_for_status()
@@ -594,7 +699,7 @@ def fetch_starterlist(api_key, show_number, comp_number, comp_div=None, round_nu
         return None
 
 
-def _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_number):
+def _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_number, refresh=False):
     if round_number <= 1:
         return data
     breaks = data.get("breaks") or []
@@ -615,7 +720,7 @@ def _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_numbe
             r1_url = f"{API_BASE}/Shows/{show_number}/Competitions/{comp_number}/{comp_div}/Starterlist"
         else:
             r1_url = f"{API_BASE}/Shows/{show_number}/Competitions/{comp_number}/Starterlist"
-        r1_resp = requests.get(r1_url, headers=headers, params={"roundNumber": 1}, timeout=10)
+        r1_resp = _api_get("Starterlist", r1_url, headers=headers, params={"roundNumber": 1}, timeout=10, refresh=refresh)
         if r1_resp.status_code == 200:
             r1_breaks = r1_resp.json().get("breaks") or []
             filtered = [b for b in r1_breaks if b.get("afterNumberInCompetition") in start_nums
@@ -623,14 +728,14 @@ def _patch_breaks(data, api_key, show_number, comp_number, comp_div, round_numbe
             if len(filtered) > len(breaks):
                 data["breaks"] = filtered
     except Exception as e:
-        print(f"DEBUG _patch_breaks: {e}")
+        log.debug("_patch_breaks: %s", e)
     return data
 
-def fetch_competition_details(api_key, show_number, comp_number):
+def fetch_competition_details(api_key, show_number, comp_number, refresh=False):
     try:
         headers = {"X-API-Key": api_key} if api_key else {}
         url = f"{API_BASE}/Shows/{show_number}/Competitions/{comp_number}"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _api_get("Competition", url, headers=headers, timeout=10, refresh=refresh)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -645,6 +750,326 @@ def get_status_badge(publishing_status):
     else:
         return '<span class="status-badge status-unpublished">❌ Nicht veröffentlicht</span>'
 
+# ============================================================================
+# PERFORMANCE
+# ============================================================================
+
+MAX_EXPORT_TRACES = 20
+
+def remember_trace(trace):
+    """Fertigen Trace (Laden/Export) in der Session ablegen, die letzten MAX_EXPORT_TRACES"""
+    traces = st.session_state.export_traces
+    traces.append(trace)
+    del traces[:-MAX_EXPORT_TRACES]
+
+def _trace_summary(trace):
+    tags = trace.tags
+    return {
+        "Zeit": trace.to_dict()["started"][11:],
+        "Vorgang": trace.kind,
+        "Template": tags.get("template", ""),
+        "Starter": tags.get("starters"),
+        "Seiten": tags.get("pages"),
+        "gesamt ms": trace.total_ms,
+        "Fehler": trace.error or "",
+    }
+
+def is_admin():
+    """Admins laut secrets (ADMIN_USERS = ["name", ...])"""
+    admins = [str(a).strip().lower() for a in st.secrets.get("ADMIN_USERS", [])]
+    return st.session_state.get("username", "").strip().lower() in admins
+
+def profile_mode():
+    """Profiler für Exporte: TORIS_PROFILE (Umgebung) oder Admin-Schalter in der Sidebar"""
+    return export_profiler.ENV_MODE or st.session_state.get("profile_mode", "")
+
+# ============================================================================
+# EXPORT-JOBS
+# ============================================================================
+
+EXPORT_MIME = {
+    "pdf": "application/pdf",
+    "word": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+@st.cache_resource
+def get_export_jobs():
+    """Prozessweite Job-Registry; überlebt Reruns und ist für alle Sessions dieselbe"""
+    return export_jobs.JobRegistry(on_discard=output_store.discard)
+
+def job_output_dir():
+    """Eigener Ordner pro Session und Export, damit parallele Jobs und User sich nicht überschreiben"""
+    return Path(output_store.job_dir(st.session_state.job_owner))
+
+def _pdf_job(starterlist, knr_mapping, *args, **kwargs):
+    """Läuft im Export-Worker: KNr-Mapping anwenden, PDF erzeugen"""
+    from pdf_export import create_pdf
+    with export_metrics.span("remap"):
+        data = apply_knr_mapping(starterlist, knr_mapping)
+    return create_pdf(data, *args, **kwargs)
+
+def _word_job(starterlist, knr_mapping, *args, **kwargs):
+    """Läuft im Export-Worker: KNr-Mapping anwenden, Word-Dokument erzeugen"""
+    from word_export import create_word
+    with export_metrics.span("remap"):
+        data = apply_knr_mapping(starterlist, knr_mapping)
+    return create_word(data, *args, **kwargs)
+
+def _history_user():
+    """History-Schlüssel: Benutzer plus API-Key, damit fremde Keys keine Exporte sehen"""
+    username = st.session_state.get("username") or "Standard"
+    return f"{username}-{st.session_state.get('api_key_hash', '')}"
+
+def _asset_stamp(kind, template):
+    """Stand von Template-Datei und Logos; ändert sich eins, gilt ein früherer Export nicht mehr als identisch"""
+    template_path = TEMPLATES_DIR / f"{template}.py" if kind == "pdf" else Path(word_template_registry.path(template))
+    paths = [template_path]
+    for directory in {LOGOS_DIR, get_user_logos_dir()}:
+        paths += [directory / name for name in file_index.files(directory, LOGO_SUFFIXES)]
+    stamp = []
+    for path in paths:
+        try:
+            st_ = path.stat()
+            stamp.append((str(path), st_.st_mtime_ns, st_.st_size))
+        except OSError:
+            stamp.append((str(path), None, None))
+    return sorted(stamp)
+
+def _archived(func, user, meta):
+    """Job-Funktion, die das fertige Dokument zusätzlich im Export-Verlauf ablegt"""
+    def run(*args, **kwargs):
+        path = func(*args, **kwargs)
+        try:
+            with export_metrics.span("history"):
+                export_history.history.record(user, meta, path)
+        except OSError as e:
+            log.warning("Export nicht im Verlauf abgelegt: %s", e)
+        return path
+    return run
+
+def _history_job(user, entry_id, target):
+    """Läuft im Export-Worker: Datei aus dem Verlauf kopieren statt neu zu rendern"""
+    with export_metrics.span("history"):
+        entry = export_history.history.get(user, entry_id)
+        if entry is None:
+            raise FileNotFoundError("Eintrag nicht mehr im Verlauf")
+        shutil.copyfile(export_history.history.artifact_path(entry), target)
+    return target
+
+def submit_export(kind, template, filename, starterlist, target, key_parts, func, *args, **kwargs):
+    """
+    Export einreihen. Gibt es im Verlauf schon ein Dokument mit identischen
+    Eingaben (Starterliste, Template, Optionen, Logos), wird es kopiert statt
+    neu gerendert ("Neu vom Server laden" erzwingt das Rendern). Liefert den
+    Verlaufseintrag bei einem Treffer, sonst None.
+    """
+    user = _history_user()
+    starterlist_hash = st.session_state.get("starterlist_hash")
+    key = export_history.render_key(kind=kind, template=template, starterlist=starterlist_hash,
+                                    assets=_asset_stamp(kind, template), **key_parts)
+    registry = get_export_jobs()
+    hit = None
+    if starterlist_hash and not st.session_state.api_refresh:
+        hit = export_history.history.find(user, key)
+    if hit is not None:
+        job = registry.submit(kind, template, filename, st.session_state.job_owner,
+                              _history_job, user, hit["id"], str(target), cost="light")
+        job.note = f"♻️ aus dem Verlauf, unverändert seit {datetime.fromtimestamp(hit['created']).strftime('%H:%M')}"
+        return hit
+    meta = {
+        "kind": kind,
+        "template": template,
+        "filename": filename,
+        "selection": st.session_state.get("starterlist_selection"),
+        "competition": starterlist.get("competitionNumber"),
+        "competition_title": starterlist.get("competitionTitle") or "",
+        "division": starterlist.get("divisionNumber") or 0,
+        "round": starterlist.get("roundNumber") or st.session_state.round_number,
+        "starterlist_hash": starterlist_hash,
+        "render_key": key if starterlist_hash else None,
+    }
+    registry.submit(kind, template, filename, st.session_state.job_owner, _archived(func, user, meta), *args, **kwargs)
+    return None
+
+def _history_label(entry):
+    comp = entry.get("competition")
+    try:
+        comp = f"{int(comp):02d}"
+    except (ValueError, TypeError):
+        comp = str(comp or "?")
+    division = f"/{entry['division']}" if entry.get("division") else ""
+    title = f" {entry['competition_title']}" if entry.get("competition_title") else ""
+    return f"Prüfung {comp}{division}{title} · Umlauf {entry.get('round') or 1}"
+
+def render_export_history():
+    """Frühere Exporte des Users mit Download aus der Ablage und Hinweis bei geänderter Starterliste"""
+    user = _history_user()
+    entries = export_history.history.entries(user)
+    if not entries:
+        return
+    with st.expander(f"🕘 Verlauf ({len(entries)})", expanded=False):
+        for entry in entries:
+            icon = {"pdf": "🎨", "word": "📝"}.get(entry["kind"], "📄")
+            current = export_history.history.is_current(user, entry)
+            status = {True: "🟢 Starterliste unverändert", False: "🟠 Starterliste inzwischen geändert"}.get(current, "")
+            col1, col2, col3 = st.columns([4, 1, 1])
+            col1.markdown(
+                f"{icon} **{_history_label(entry)}** · {entry['template']}  \n"
+                f"{datetime.fromtimestamp(entry['created']).strftime('%d.%m. %H:%M')} · "
+                f"`{(entry.get('starterlist_hash') or '')[:8]}` {status}"
+            )
+            col2.download_button(
+                label="📥",
+                data=functools.partial(export_history.history.read, user, entry["id"]),
+                file_name=entry["filename"],
+                mime=EXPORT_MIME.get(entry["kind"]),
+                key=f"history_download_{entry['id']}",
+                on_click="ignore",
+                help="Datei aus dem Verlauf herunterladen (ohne neues Rendern)",
+                use_container_width=True,
+            )
+            col3.button("✖", key=f"history_remove_{entry['id']}", on_click=export_history.history.remove,
+                        args=(user, entry["id"]), help="Aus dem Verlauf entfernen", use_container_width=True)
+
+def _read_job_result(job):
+    """
+    Datei eines fertigen Jobs lesen - erst beim Klick auf den Download-Button
+    (deferred, ohne Script-Kontext, also kein st.session_state hier). Beim
+    ersten Mal die Download-Phase in den Trace; verbucht wird er beim
+    nächsten Rerun in _render_job.
+    """
+    t0 = time.perf_counter()
+    with open(job.path, "rb") as f:
+        data = f.read()
+    if not job.seen:
+        job.seen = True
+        job.trace.add_span("download", (time.perf_counter() - t0) * 1000.0)
+    return data
+
+def _render_job(registry, job):
+    icon = {"pdf": "🎨", "word": "📝"}.get(job.kind, "📄")
+    with st.container(border=True):
+        col1, col2 = st.columns([3, 1])
+        col1.markdown(f"{icon} **{job.filename}** · {job.template}")
+        if job.active:
+            col1.progress(job.progress, text=f"{job.message} ({job.seconds:.0f} s)")
+            return
+        if job.seen and not job.remembered:
+            job.remembered = True
+            remember_trace(job.trace)
+        if job.status == export_jobs.DONE and os.path.exists(job.path):
+            col1.caption(f"✅ Fertig in {job.seconds:.1f} s" + (f" · {job.note}" if job.note else ""))
+            col2.download_button(
+                label="📥 Herunterladen",
+                data=functools.partial(_read_job_result, job),
+                file_name=job.filename,
+                mime=EXPORT_MIME.get(job.kind),
+                type="primary",
+                key=f"job_download_{job.id}",
+                on_click="ignore",
+                use_container_width=True,
+            )
+            with col1:
+                render_profile_downloads(job.profile, os.path.splitext(job.filename)[0], f"job_profile_{job.id}")
+        elif job.status == export_jobs.DONE:
+            col1.warning("⚠️ Datei nicht mehr vorhanden")
+        else:
+            col1.error(f"❌ Fehler: {job.error}")
+            with col1.expander("Details", expanded=False):
+                st.code(job.traceback or "")
+        col2.button("✖ Entfernen", key=f"job_remove_{job.id}", on_click=registry.remove, args=(job.id,),
+                    use_container_width=True)
+
+def _render_export_jobs():
+    registry = get_export_jobs()
+    jobs = registry.jobs(st.session_state.job_owner)
+    if jobs:
+        st.markdown('<div class="section-header">📦 Exporte</div>', unsafe_allow_html=True)
+    for job in jobs:
+        _render_job(registry, job)
+    return any(job.active for job in jobs)
+
+@st.fragment(run_every=1.0)
+def _render_export_jobs_live():
+    # Nur dieser Teil wird jede Sekunde neu gezeichnet; ist der letzte Job
+    # fertig, einmal die ganze Seite neu laden (Performance-Panel, Buttons).
+    if not _render_export_jobs():
+        st.rerun()
+
+def render_export_jobs():
+    """Laufende und fertige Exporte der Session mit Fortschritt und Download"""
+    registry = get_export_jobs()
+    if any(job.active for job in registry.jobs(st.session_state.job_owner)):
+        _render_export_jobs_live()
+    else:
+        _render_export_jobs()
+
+def render_profile_downloads(profile, basename, key):
+    """Profil neben dem Dokument zum Download anbieten"""
+    if profile is None:
+        return
+    with st.expander(f"🔬 Profil: {profile.label} ({profile.seconds:.2f} s)", expanded=False):
+        st.code(profile.top_text[:6000], language=None)
+        for i, (fname, data, mime) in enumerate(profile.files(basename)):
+            st.download_button(
+                label=f"📥 {fname}",
+                data=data,
+                file_name=fname,
+                mime=mime,
+                key=f"{key}_{i}",
+                on_click="ignore",  # Dokument und weitere Profil-Dateien bleiben stehen
+            )
+
+def render_performance_panel():
+    """Zeiten des letzten Vorgangs je Phase, Verlauf und JSONL-Export"""
+    traces = st.session_state.export_traces
+    if not traces:
+        return
+    with st.expander("⏱️ Performance", expanded=False):
+        last = traces[-1]
+        summary = _trace_summary(last)
+        st.caption(
+            f"{summary['Vorgang']} {summary['Template']} · {summary['Starter'] or 0} Starter"
+            + (f" · {summary['Seiten']} Seiten" if summary["Seiten"] else "")
+            + f" · gesamt {last.total_ms:.0f} ms"
+        )
+        st.dataframe(
+            [
+                {
+                    "Phase": "\u2003" * span["depth"] + span["name"],
+                    "ms": span.get("ms"),
+                    "Eigenzeit ms": span.get("self_ms"),
+                    "Details": ", ".join(f"{k}={v}" for k, v in span.get("tags", {}).items()),
+                }
+                for span in last.spans
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption("Eigenzeit von render = Aufbau der Tabellen/Flowables ohne build/save")
+        if len(traces) > 1:
+            st.markdown("**Letzte Vorgänge**")
+            st.dataframe([_trace_summary(t) for t in reversed(traces)], hide_index=True, use_container_width=True)
+        st.download_button(
+            label="📥 Messwerte (JSON Lines)",
+            data=export_metrics.to_jsonl(traces),
+            file_name="toris_metrics.jsonl",
+            mime="application/x-ndjson",
+            key="download_metrics_jsonl",
+        )
+        warmup = export_warmup.status()
+        if warmup:
+            st.caption(
+                "Warm-up" + (" (läuft)" if export_warmup.running() else "") + ": "
+                + ", ".join(f"{name} {ms:.0f} ms" + (" ⚠️" if error else "") for name, ms, error in warmup)
+            )
+        swept = output_store.last_sweep()
+        if swept:
+            st.caption(
+                f"Ausgabeordner zuletzt aufgeräumt {datetime.fromtimestamp(swept[0]).strftime('%H:%M')}"
+                f" · {swept[1]} Exporte, {swept[2] / output_store.MB:.1f} MB freigegeben"
+            )
+
 def enhance_starterlist(starterlist, comp_obj, comp_details):
     if st.session_state.get("selected_show"):
         starterlist["showTitle"] = st.session_state["selected_show"].get("title")
@@ -717,6 +1142,7 @@ with st.sidebar:
     if not api_key:
         st.warning("⚠️ Bitte API Key eingeben!")
         st.stop()
+    st.session_state.api_key_hash = api_key_hash(api_key)
     
     st.markdown("---")
     
@@ -746,6 +1172,11 @@ with st.sidebar:
     else:
         st.warning("⚠️ Keine Word-Templates vorhanden!")
         st.info("💡 Tipp: Templates in Tab 3 'Verwaltung' hochladen")
+
+    export_warmup.start(
+        [st.session_state.pdf_template] if available_templates else [],
+        [st.session_state.word_template] if available_word_templates else [],
+    )
     
     # Logo-Breite
     st.subheader("🖼️ Logo")
@@ -786,6 +1217,17 @@ with st.sidebar:
         st.session_state.single_sided = st.checkbox(
             "Einseitiger Druck", value=st.session_state.single_sided, key="single_sided_cb"
         )
+        # Schnelle Pfade nur anbieten, wenn das gewählte Template sie laut TEMPLATE_INFO kennt
+        if template_manifest.supports("pdf", st.session_state.pdf_template, "fast_render"):
+            st.session_state.fast_render = st.checkbox(
+                "Schnellrenderer", value=st.session_state.fast_render, key="fast_render_cb",
+                help=f"Tabelle von {st.session_state.pdf_template} direkt zeichnen – schneller bei langen Listen"
+            )
+        if template_manifest.supports("word", st.session_state.word_template, "word_streaming"):
+            st.session_state.word_streaming = st.checkbox(
+                "Word speicherschonend", value=st.session_state.word_streaming, key="word_streaming_cb",
+                help=f"Tabellenzeilen von {st.session_state.word_template} direkt in die DOCX-Datei schreiben – für sehr lange Listen"
+            )
 
     # --- Neue Kopfnummern ---
     st.markdown("---")
@@ -802,24 +1244,19 @@ with st.sidebar:
         )
         if knr_file is not None:
             try:
-                import pandas as _pd, json as _json
-                if knr_file.name.endswith(".json"):
-                    raw = _json.loads(knr_file.read().decode("utf-8"))
-                    st.session_state.knr_mapping = {str(k): int(v) for k, v in raw.items()}
-                elif knr_file.name.endswith(".csv"):
-                    df_m = _pd.read_csv(knr_file, sep=";")
-                    st.session_state.knr_mapping = {str(int(r["KNr_alt"])): int(r["KNr_neu"]) for _, r in df_m.iterrows()}
-                else:
-                    df_m = _pd.read_excel(knr_file)
-                    st.session_state.knr_mapping = {str(int(r["KNr_alt"])): int(r["KNr_neu"]) for _, r in df_m.iterrows()}
+                import data_import
+                result = data_import.load_knr_mapping(knr_file.getvalue(), knr_file.name)
+                st.session_state.knr_mapping = result.data
                 st.success(f"✅ {len(st.session_state.knr_mapping)} Kopfnummern geladen")
+                if result.bad_rows:
+                    st.warning(f"⚠️ {len(result.bad_rows)} Zeilen übersprungen: {result.bad_rows_text()}")
             except Exception as _e:
                 st.error(f"Fehler beim Laden: {_e}")
         elif st.session_state.knr_mapping:
             st.info(f"ℹ️ {len(st.session_state.knr_mapping)} Kopfnummern aktiv")
 
-    # --- Meisterschaft (nur für Templates mit "Meisterschaft" im Namen) ---
-    if "meisterschaft" in (st.session_state.get("pdf_template") or "").lower():
+    # --- Meisterschaft (nur für Templates, die sie auswerten) ---
+    if template_manifest.needs("pdf", st.session_state.get("pdf_template"), "meisterschaft"):
         st.markdown("---")
         st.session_state.use_meisterschaft = st.checkbox(
             "🏆 Meisterschaft",
@@ -834,39 +1271,21 @@ with st.sidebar:
             )
             if meister_file is not None:
                 try:
-                    import pandas as _pd
-                    df_ms = _pd.read_excel(meister_file, header=None)
-                    header_row = None
-                    for idx, row in df_ms.iterrows():
-                        row_vals = [str(v).strip() for v in row.values]
-                        if any("Summe" in v for v in row_vals):
-                            header_row = idx
-                            break
-                    if header_row is None:
-                        st.error("❌ Keine Spalte 'Summe' in der Datei gefunden!")
-                    else:
-                        df_ms.columns = df_ms.iloc[header_row]
-                        df_ms = df_ms.iloc[header_row + 1:].reset_index(drop=True)
-                        knr_col = next((c for c in df_ms.columns if str(c).strip().lower().startswith("knr")), None)
-                        summe_col = next((c for c in df_ms.columns if str(c).strip() == "Summe"), None)
-                        if knr_col is None or summe_col is None:
-                            st.error(f"❌ Spalten 'KNr' und/oder 'Summe' nicht gefunden. Gefunden: {list(df_ms.columns)}")
-                        else:
-                            ms_dict = {}
-                            for _, r in df_ms.iterrows():
-                                try:
-                                    ms_dict[str(int(float(r[knr_col])))] = float(r[summe_col])
-                                except:
-                                    pass
-                            st.session_state.meisterschaft_data = ms_dict
-                            st.success(f"✅ {len(ms_dict)} Meisterschafts-Einträge geladen")
+                    import data_import
+                    result = data_import.load_meisterschaft(meister_file.getvalue())
+                    st.session_state.meisterschaft_data = result.data
+                    st.success(f"✅ {len(result.data)} Meisterschafts-Einträge geladen")
+                    if result.bad_rows:
+                        st.warning(f"⚠️ {len(result.bad_rows)} Zeilen übersprungen: {result.bad_rows_text()}")
+                except ValueError as _e:
+                    st.error(f"❌ {_e}")
                 except Exception as _e:
                     st.error(f"Fehler beim Laden: {_e}")
             elif st.session_state.meisterschaft_data:
                 st.info(f"ℹ️ {len(st.session_state.meisterschaft_data)} Meisterschafts-Einträge aktiv")
 
     # --- KNr.-Spalte (nur für Hinderniskarte) ---
-    if (st.session_state.get("pdf_template") or "").startswith("pdf_vs_"):
+    if template_manifest.needs("pdf", st.session_state.get("pdf_template"), "knr_column"):
         st.markdown("---")
         st.session_state.use_knr_column = st.checkbox(
             "KNr. statt R-Nr. anzeigen",
@@ -907,6 +1326,22 @@ with st.sidebar:
         st.session_state.spacing_top_cm = 0.0
         st.session_state.spacing_bottom_cm = 0.0
 
+    # Profiler (nur Admins; TORIS_PROFILE in der Umgebung gilt für alle)
+    if is_admin():
+        st.markdown("---")
+        if export_profiler.ENV_MODE:
+            st.caption(f"🔬 Profiler aktiv über TORIS_PROFILE: {export_profiler.PROFILE_MODES[export_profiler.ENV_MODE]}")
+        else:
+            modes = [""] + list(export_profiler.PROFILE_MODES)
+            st.session_state.profile_mode = st.selectbox(
+                "🔬 Export profilieren",
+                modes,
+                index=modes.index(st.session_state.profile_mode) if st.session_state.profile_mode in modes else 0,
+                format_func=lambda m: export_profiler.PROFILE_MODES.get(m, "Aus"),
+                key="profile_mode_select",
+                help="Nächste Exporte laufen unter dem Profiler; das Profil wird neben dem Dokument zum Download angeboten"
+            )
+
 # ============================================================================
 # TAB LAYOUT
 # ============================================================================
@@ -925,6 +1360,12 @@ with tab1:
         "Geschlossene Veranstaltungen anzeigen", 
         value=st.session_state.include_closed
     )
+    st.checkbox(
+        "Neu vom Server laden",
+        key="api_refresh",
+        help="Veranstaltungen, Prüfungen und Starterlisten nicht aus dem gemeinsamen Cache nehmen, "
+             "sondern direkt von TORIS abrufen (Cache wird dabei für alle aktualisiert)"
+    )
     
     # Button und Status - mehr Platz für Status
     col1, col2 = st.columns([1, 2])
@@ -932,7 +1373,7 @@ with tab1:
     with col1:
         if st.button("🔄 Veranstaltungen laden", type="primary", use_container_width=True):
             with st.spinner("Lade Veranstaltungen..."):
-                shows = fetch_shows(api_key, include_closed)
+                shows = fetch_shows(api_key, include_closed, refresh=st.session_state.api_refresh)
                 if shows:
                     st.session_state.shows = shows
                     st.session_state.include_closed = include_closed
@@ -975,7 +1416,7 @@ with tab1:
                 if st.button("🔄 Prüfungen laden", type="primary", key="load_comps_tab1", use_container_width=True):
                     with st.spinner("Lade Prüfungen..."):
                         show_num = st.session_state.selected_show.get("number")
-                        competitions = fetch_competitions(api_key, show_num)
+                        competitions = fetch_competitions(api_key, show_num, refresh=st.session_state.api_refresh)
                         if competitions:
                             st.session_state.competitions = competitions
                             st.rerun()
@@ -1062,25 +1503,45 @@ with tab2:
             with col1:
                 if st.button("🔄 Starterliste laden", type="primary", use_container_width=True):
                     try:
-                        with st.spinner("Lade Daten..."):
+                        with st.spinner("Lade Daten..."), export_metrics.trace(
+                            "load", show=show_number, competition=comp_obj.get("number")
+                        ) as load_trace:
                             starterlist = fetch_starterlist(
                                 api_key,
                                 show_number,
                                 comp_obj.get("number"),
                                 comp_div,
-                                st.session_state.round_number
+                                st.session_state.round_number,
+                                refresh=st.session_state.api_refresh
                             )
                             
                             if starterlist:
                                 comp_details = fetch_competition_details(
                                     api_key, 
                                     show_number, 
-                                    comp_obj.get("number")
+                                    comp_obj.get("number"),
+                                    refresh=st.session_state.api_refresh
                                 )
                                 
-                                starterlist = enhance_starterlist(starterlist, comp_obj, comp_details)
-                                st.session_state.starterlist = starterlist
-                                st.rerun()
+                                with export_metrics.span("normalize"):
+                                    starterlist = enhance_starterlist(starterlist, comp_obj, comp_details)
+                                    # Kompaktes Modell in der Session; normalisiert wird dabei einmalig,
+                                    # alle Exporte nutzen die vorberechneten Zeilen
+                                    st.session_state.starterlist = Starterlist.from_api(starterlist)
+                                with export_metrics.span("fingerprint"):
+                                    # Für den Export-Verlauf: welche Liste, in welchem Stand
+                                    st.session_state.starterlist_hash = export_history.fingerprint(starterlist)
+                                    st.session_state.starterlist_selection = export_history.selection_key(
+                                        show_number, comp_obj.get("number"), comp_div, st.session_state.round_number
+                                    )
+                                    export_history.history.note_starterlist(
+                                        _history_user(), st.session_state.starterlist_selection,
+                                        st.session_state.starterlist_hash,
+                                    )
+                                load_trace.tag(starters=len(starterlist.get("starters") or []))
+                        remember_trace(load_trace)
+                        if starterlist:
+                            st.rerun()
                     except ValueError as ve:
                         st.error(f"❌ {str(ve)}")
                     except Exception as e:
@@ -1137,8 +1598,8 @@ with tab2:
                 # ============================================================
                 selected_tpl = st.session_state.pdf_template
 
-                is_derby        = selected_tpl in ("pdf_dre_derby_cloud", "pdf_dre_derby_int_cloud")
-                is_pfwechsel    = selected_tpl in ("pdf_dre_pferdewechsel_cloud", "pdf_dre_pferdewechsel_int_cloud")
+                is_derby        = template_manifest.needs("pdf", selected_tpl, "derby_times")
+                is_pfwechsel    = template_manifest.needs("pdf", selected_tpl, "pw_config")
 
                 if is_derby:
                     st.markdown('<div class="section-header">🏇 Derby – Zeiten</div>', unsafe_allow_html=True)
@@ -1245,79 +1706,82 @@ with tab2:
                             st.error("❌ Keine Templates vorhanden!")
                         else:
                             try:
-                                with st.spinner("Erstelle PDF..."):
-                                    comp_number = starterlist.get('competitionNumber', '00')
-                                    div_number = starterlist.get('divisionNumber', 0)
-                                    
-                                    try:
-                                        comp_formatted = f"{int(comp_number):02d}"
-                                    except (ValueError, TypeError):
-                                        comp_formatted = str(comp_number).zfill(2)
-                                    
-                                    div_formatted = f"{int(div_number)}" if div_number else "0"
-                                    
-                                    timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")
-                                    pdf_filename = f"{comp_formatted}{div_formatted}_start_{timestamp}.pdf"
-                                    
-                                    print_options = {
-                                        "sponsor_top":      st.session_state.get("sponsor_top", False),
-                                        "sponsor_bottom":   st.session_state.get("sponsor_bottom", False),
-                                        "single_sided":     st.session_state.get("single_sided", False),
-                                        "show_banner":      st.session_state.get("show_banner", True),
-                                        "show_sponsor_bar": st.session_state.get("show_sponsor_bar", True),
-                                        "show_title":       st.session_state.get("show_title", True),
-                                        "show_header":      st.session_state.get("show_header", True),
-                                        "use_knr_column":   st.session_state.get("use_knr_column", False),
-                                        "meisterschaft_data": st.session_state.meisterschaft_data if st.session_state.get("use_meisterschaft", False) else {},
-                                    }
+                                comp_number = starterlist.get('competitionNumber', '00')
+                                div_number = starterlist.get('divisionNumber', 0)
+                                
+                                try:
+                                    comp_formatted = f"{int(comp_number):02d}"
+                                except (ValueError, TypeError):
+                                    comp_formatted = str(comp_number).zfill(2)
+                                
+                                div_formatted = f"{int(div_number)}" if div_number else "0"
+                                
+                                timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")
+                                pdf_filename = f"{comp_formatted}{div_formatted}_start_{timestamp}.pdf"
+                                
+                                print_options = {
+                                    "sponsor_top":      st.session_state.get("sponsor_top", False),
+                                    "sponsor_bottom":   st.session_state.get("sponsor_bottom", False),
+                                    "single_sided":     st.session_state.get("single_sided", False),
+                                    "show_banner":      st.session_state.get("show_banner", True),
+                                    "show_sponsor_bar": st.session_state.get("show_sponsor_bar", True),
+                                    "show_title":       st.session_state.get("show_title", True),
+                                    "show_header":      st.session_state.get("show_header", True),
+                                    "use_knr_column":   st.session_state.get("use_knr_column", False),
+                                    "fast_render":      st.session_state.get("fast_render", False)
+                                                        and template_manifest.supports("pdf", st.session_state.pdf_template, "fast_render"),
+                                    "meisterschaft_data": st.session_state.meisterschaft_data if st.session_state.get("use_meisterschaft", False) else {},
+                                }
 
-                                    # Template-spezifische Konfigurationen eintragen
-                                    selected_tpl = st.session_state.pdf_template
-                                    if selected_tpl in ("pdf_dre_derby_cloud", "pdf_dre_derby_int_cloud"):
-                                        starterlist["derby_config"] = {
-                                            "begin_time": st.session_state.get("derby_begin", ""),
-                                            "final_time": st.session_state.get("derby_final", ""),
-                                        }
-                                    if selected_tpl in ("pdf_dre_pferdewechsel_cloud", "pdf_dre_pferdewechsel_int_cloud"):
-                                        starterlist["derby_config"] = st.session_state.get("pw_config", {})
-
-                                    _starterlist_for_pdf = apply_knr_mapping(
-                                        starterlist,
-                                        st.session_state.knr_mapping if st.session_state.use_new_knr else {}
-                                    )
-                                    pdf_path = create_pdf(
-                                        _starterlist_for_pdf,
-                                        pdf_filename,
-                                        st.session_state.pdf_template,
-                                        st.session_state.spacing_top_cm,
-                                        st.session_state.spacing_bottom_cm,
-                                        st.session_state.logo_max_width_cm,
-                                        output_dir=str(OUTPUT_DIR),
-                                        print_options=print_options,
-                                        username=st.session_state.get("username")
-                                    )
-                                    
-                                    if not pdf_path or not os.path.exists(pdf_path):
-                                        st.error("❌ PDF konnte nicht erstellt werden!")
-                                    else:
-                                        st.success("✅ PDF erfolgreich erstellt!")
-                                        
-                                        with open(pdf_path, "rb") as f:
-                                            st.download_button(
-                                                label="📥 PDF herunterladen",
-                                                data=f,
-                                                file_name=pdf_filename,
-                                                mime="application/pdf",
-                                                type="primary",
-                                                use_container_width=True
-                                            )
+                                # Template-spezifische Konfigurationen eintragen
+                                selected_tpl = st.session_state.pdf_template
+                                if template_manifest.needs("pdf", selected_tpl, "derby_times"):
+                                    starterlist["derby_config"] = {
+                                        "begin_time": st.session_state.get("derby_begin", ""),
+                                        "final_time": st.session_state.get("derby_final", ""),
+                                    }
+                                if template_manifest.needs("pdf", selected_tpl, "pw_config"):
+                                    starterlist["derby_config"] = st.session_state.get("pw_config", {})
+
+                                knr_mapping = st.session_state.knr_mapping if st.session_state.use_new_knr else {}
+                                pdf_dir = job_output_dir()
+                                hit = submit_export(
+                                    "pdf",
+                                    st.session_state.pdf_template,
+                                    pdf_filename,
+                                    starterlist,
+                                    pdf_dir / pdf_filename,
+                                    {
+                                        "knr_mapping": knr_mapping,
+                                        "print_options": print_options,
+                                        "derby_config": starterlist.get("derby_config"),
+                                        "spacing": [st.session_state.spacing_top_cm, st.session_state.spacing_bottom_cm],
+                                        "logo_max_width_cm": st.session_state.logo_max_width_cm,
+                                        "username": st.session_state.get("username"),
+                                    },
+                                    _pdf_job,
+                                    starterlist,
+                                    knr_mapping,
+                                    pdf_filename,
+                                    st.session_state.pdf_template,
+                                    st.session_state.spacing_top_cm,
+                                    st.session_state.spacing_bottom_cm,
+                                    st.session_state.logo_max_width_cm,
+                                    output_dir=str(pdf_dir),
+                                    print_options=print_options,
+                                    username=st.session_state.get("username"),
+                                    profile_mode=profile_mode(),
+                                    cost=template_manifest.cost("pdf", st.session_state.pdf_template),
+                                )
+                                if hit is not None:
+                                    st.info(f"♻️ Unverändert seit {datetime.fromtimestamp(hit['created']).strftime('%H:%M')} - Datei aus dem Verlauf, unter „Exporte“")
+                                else:
+                                    st.info("⏳ PDF-Export gestartet - Fortschritt unter „Exporte“")
                             
                             except Exception as e:
                                 import traceback
                                 st.error(f"❌ Fehler: {e}")
                                 st.code(traceback.format_exc())
-                                import traceback
-                                st.code(traceback.format_exc())
                 
                 with col2:
                     st.markdown(f"**Template:** {st.session_state.pdf_template}")
@@ -1334,60 +1798,63 @@ with tab2:
                 with col1:
                     if st.button("📝 Word erstellen", type="secondary", use_container_width=True):
                         try:
-                            with st.spinner("Erstelle Word-Dokument..."):
-                                comp_number = starterlist.get('competitionNumber', '00')
-                                div_number = starterlist.get('divisionNumber', 0)
-                                
-                                try:
-                                    comp_formatted = f"{int(comp_number):02d}"
-                                except (ValueError, TypeError):
-                                    comp_formatted = str(comp_number).zfill(2)
-                                
-                                div_formatted = f"{int(div_number)}" if div_number else "0"
-                                
-                                timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")
-                                word_filename = f"{comp_formatted}{div_formatted}_start_{timestamp}.docx"
-                                word_path = str(OUTPUT_DIR / word_filename)
-                                
-                                word_print_options = {
-                                    "sponsor_top":        st.session_state.get("sponsor_top", False),
-                                    "sponsor_bottom":     st.session_state.get("sponsor_bottom", False),
-                                    "single_sided":       st.session_state.get("single_sided", False),
-                                    "show_banner":        st.session_state.get("show_banner", True),
-                                    "show_sponsor_bar":   st.session_state.get("show_sponsor_bar", True),
-                                    "show_title":         st.session_state.get("show_title", True),
-                                    "show_header":        st.session_state.get("show_header", True),
-                                    "spacing_top_cm":     st.session_state.get("spacing_top_cm", 3.0),
-                                    "spacing_bottom_cm":  st.session_state.get("spacing_bottom_cm", 2.0),
-                                }
-                                _starterlist_for_word = apply_knr_mapping(
-                                    starterlist,
-                                    st.session_state.knr_mapping if st.session_state.use_new_knr else {}
-                                )
-                                word_path = create_word(
-                                    _starterlist_for_word,
-                                    st.session_state.word_template,
-                                    word_path,
-                                    logos_enabled=True,
-                                    print_options=word_print_options,
-                                    logo_max_width_cm=st.session_state.get("logo_max_width_cm", 5.0),
-                                    username=st.session_state.get("username")
-                                )
-                                
-                                if not word_path or not os.path.exists(word_path):
-                                    st.error("❌ Word-Dokument konnte nicht erstellt werden!")
-                                else:
-                                    st.success("✅ Word-Dokument erfolgreich erstellt!")
-                                    
-                                    with open(word_path, "rb") as f:
-                                        st.download_button(
-                                            label="📥 Word herunterladen",
-                                            data=f,
-                                            file_name=word_filename,
-                                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                            type="secondary",
-                                            use_container_width=True
-                                        )
+                            comp_number = starterlist.get('competitionNumber', '00')
+                            div_number = starterlist.get('divisionNumber', 0)
+                            
+                            try:
+                                comp_formatted = f"{int(comp_number):02d}"
+                            except (ValueError, TypeError):
+                                comp_formatted = str(comp_number).zfill(2)
+                            
+                            div_formatted = f"{int(div_number)}" if div_number else "0"
+                            
+                            timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")
+                            word_filename = f"{comp_formatted}{div_formatted}_start_{timestamp}.docx"
+                            word_path = str(job_output_dir() / word_filename)
+                            
+                            word_print_options = {
+                                "sponsor_top":        st.session_state.get("sponsor_top", False),
+                                "sponsor_bottom":     st.session_state.get("sponsor_bottom", False),
+                                "single_sided":       st.session_state.get("single_sided", False),
+                                "show_banner":        st.session_state.get("show_banner", True),
+                                "show_sponsor_bar":   st.session_state.get("show_sponsor_bar", True),
+                                "show_title":         st.session_state.get("show_title", True),
+                                "show_header":        st.session_state.get("show_header", True),
+                                "spacing_top_cm":     st.session_state.get("spacing_top_cm", 3.0),
+                                "spacing_bottom_cm":  st.session_state.get("spacing_bottom_cm", 2.0),
+                                "word_streaming":     st.session_state.get("word_streaming", False)
+                                                      and template_manifest.supports("word", st.session_state.word_template, "word_streaming"),
+                            }
+                            knr_mapping = st.session_state.knr_mapping if st.session_state.use_new_knr else {}
+                            hit = submit_export(
+                                "word",
+                                st.session_state.word_template,
+                                word_filename,
+                                starterlist,
+                                word_path,
+                                {
+                                    "knr_mapping": knr_mapping,
+                                    "print_options": word_print_options,
+                                    "derby_config": starterlist.get("derby_config"),
+                                    "logo_max_width_cm": st.session_state.get("logo_max_width_cm", 5.0),
+                                    "username": st.session_state.get("username"),
+                                },
+                                _word_job,
+                                starterlist,
+                                knr_mapping,
+                                st.session_state.word_template,
+                                word_path,
+                                logos_enabled=True,
+                                print_options=word_print_options,
+                                logo_max_width_cm=st.session_state.get("logo_max_width_cm", 5.0),
+                                username=st.session_state.get("username"),
+                                profile_mode=profile_mode(),
+                                cost=template_manifest.cost("word", st.session_state.word_template),
+                            )
+                            if hit is not None:
+                                st.info(f"♻️ Unverändert seit {datetime.fromtimestamp(hit['created']).strftime('%H:%M')} - Datei aus dem Verlauf, unter „Exporte“")
+                            else:
+                                st.info("⏳ Word-Export gestartet - Fortschritt unter „Exporte“")
                         
                         except Exception as e:
                             st.error(f"❌ Fehler: {e}")
@@ -1397,6 +1864,10 @@ with tab2:
                 with col2:
                     st.markdown(f"**Template:** {st.session_state.word_template}")
                     st.markdown(f"**Umlauf:** {st.session_state.round_number}")
+
+                render_export_jobs()
+                render_export_history()
+                render_performance_panel()
             
             else:
                 st.info("👆 Bitte erst Starterliste laden")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# app_logging.py
+#
+# Logging für App, Exporter und Templates.
+#
+# Bisher liefen Debug-Ausgaben per print(f"...") - auch pro Starterzeile in
+# den Templates. Auf Streamlit Cloud wird stdout mitgeschnitten und
+# weitergeleitet, jede Zeile kostet also Formatierung und I/O.
+#
+# Jetzt:
+#   - ein Logger pro Modul unterhalb von "toris" (get_logger)
+#   - Level über die Umgebungsvariable TORIS_LOG_LEVEL (Standard: WARNING),
+#     zur Laufzeit änderbar mit set_level()
+#   - Meldungen im %-Stil: log.debug("Flagge: %s", pfad) formatiert erst,
+#     wenn das Level aktiv ist; teure Debug-Blöcke zusätzlich mit
+#     log.isEnabledFor(logging.DEBUG) absichern
+#
+import logging
+import os
+import sys
+
+ROOT_LOGGER = "toris"
+DEFAULT_LEVEL = "WARNING"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_root = logging.getLogger(ROOT_LOGGER)
+
+
+def _parse_level(value):
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).strip().upper())
+    return level if isinstance(level, int) else logging.getLevelName(DEFAULT_LEVEL)
+
+
+def set_level(level):
+    """Level für alle toris-Logger setzen (Name wie "DEBUG" oder logging-Konstante)"""
+    _root.setLevel(_parse_level(level))
+
+
+def _configure():
+    if _root.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _root.addHandler(handler)
+    # Nicht zusätzlich über den Root-Logger (Streamlit) ausgeben
+    _root.propagate = False
+    set_level(os.environ.get("TORIS_LOG_LEVEL", DEFAULT_LEVEL))
+
+
+def get_logger(name):
+    """Logger für ein Modul, z.B. get_logger(__name__) oder get_logger("templates.pdf.pdf_nat")"""
+    if name == ROOT_LOGGER or name.startswith(ROOT_LOGGER + "."):
+        return logging.getLogger(name)
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+_configure()
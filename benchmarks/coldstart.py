@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# benchmarks/coldstart.py
+#
+# Kaltstart der App messen (wie nach dem Aufwachen auf Streamlit Cloud):
+# jeder Lauf ist ein frischer Python-Prozess, die App läuft über
+# streamlit.testing.AppTest.
+#
+#     boot_ms         Interpreter-Start bis zur ersten Zeile des Messskripts
+#     streamlit_ms    import streamlit + AppTest
+#     login_ms        erster Skriptlauf bis zur Login-Seite
+#     main_ms         Skriptlauf nach dem Login (API-Key gesetzt, Sidebar/Tabs)
+#     warmup_ms       Warten auf export_warmup (nur mit Warm-up)
+#     first_pdf_ms    erster create_pdf im Prozess (150 Starter)
+#     first_word_ms   erster create_word im Prozess
+#
+# Gemessen wird jeweils mit und ohne Warm-up (TORIS_WARMUP). Ohne Warm-up
+# zahlt der erste Export die Importe von reportlab/python-docx und das Laden
+# des Templates; mit Warm-up ist das erledigt, während der User noch
+# Veranstaltung und Prüfung auswählt.
+#
+# Aufruf aus dem Projektordner:
+#     python -m benchmarks.coldstart
+#     python -m benchmarks.coldstart --repeat 5 --pdf pdf_int --word word_int
+#
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.run import RESULTS_DIR, ROOT, git_info
+
+APP = os.path.join(ROOT, "app5_cloud.py")
+FIELDS = ["boot_ms", "streamlit_ms", "login_ms", "main_ms", "warmup_ms", "first_pdf_ms", "first_word_ms"]
+
+
+def _ms(t0):
+    return round((time.perf_counter() - t0) * 1000.0, 1)
+
+
+def child(args):
+    """Ein Kaltstart (läuft im frischen Prozess, Ausgabe als JSON auf stdout)"""
+    result = {"boot_ms": round((time.time() - args.t0) * 1000.0, 1)}
+
+    t = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    result["streamlit_ms"] = _ms(t)
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets["APP_PASSWORD"] = "benchmark"
+    t = time.perf_counter()
+    at.run()
+    result["login_ms"] = _ms(t)
+
+    at.session_state["authenticated"] = True
+    at.session_state["pdf_template"] = args.pdf
+    at.session_state["word_template"] = args.word
+    t = time.perf_counter()
+    at.run()
+    at.sidebar.text_input[0].input("benchmark")
+    at.run()
+    result["main_ms"] = _ms(t)
+    if at.exception:
+        result["error"] = str(at.exception[0].message)
+
+    import export_warmup
+    if export_warmup.ENABLED:
+        t = time.perf_counter()
+        while export_warmup.running():
+            time.sleep(0.01)
+        result["warmup_ms"] = _ms(t)
+        result["warmup_steps"] = export_warmup.status()
+
+    from benchmarks.run import PRINT_OPTIONS
+    from benchmarks.synthetic import make_starterlist, scenario_for
+    out_dir = tempfile.mkdtemp(prefix="toris_coldstart_")
+
+    t = time.perf_counter()
+    from pdf_export import create_pdf
+    create_pdf(make_starterlist(args.starters, scenario_for(args.pdf)), "coldstart.pdf", args.pdf, 0, 0, 5.0,
+               output_dir=out_dir, print_options=dict(PRINT_OPTIONS))
+    result["first_pdf_ms"] = _ms(t)
+
+    t = time.perf_counter()
+    from word_export import create_word
+    create_word(make_starterlist(args.starters, scenario_for(args.word)), args.word,
+                os.path.join(out_dir, "coldstart.docx"), print_options=dict(PRINT_OPTIONS))
+    result["first_word_ms"] = _ms(t)
+
+    json.dump(result, sys.stdout)
+
+
+def run_once(args, warmup):
+    env = dict(os.environ, TORIS_WARMUP="1" if warmup else "0")
+    cmd = [sys.executable, "-m", "benchmarks.coldstart", "--child", "--t0", repr(time.time()),
+           "--pdf", args.pdf, "--word", args.word, "--starters", str(args.starters)]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"Kaltstart fehlgeschlagen:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kaltstart von Login-Seite und erstem Export messen")
+    parser.add_argument("--repeat", type=int, default=3, help="Prozesse je Variante (Standard: %(default)s)")
+    parser.add_argument("--pdf", default="pdf_nat", help="PDF-Template (Standard: %(default)s)")
+    parser.add_argument("--word", default="word_nat", help="Word-Template (Standard: %(default)s)")
+    parser.add_argument("--starters", type=int, default=150, help="Starter im ersten Export (Standard: %(default)s)")
+    parser.add_argument("--out", help="Ergebnis-JSON (Standard: benchmarks/results/coldstart/<zeit>.json)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--t0", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return child(args)
+
+    variants = {}
+    for warmup in (False, True):
+        label = "mit Warm-up" if warmup else "ohne Warm-up"
+        runs = [run_once(args, warmup) for _ in range(args.repeat)]
+        variants[label] = {
+            "median": {f: statistics.median(r[f] for r in runs) for f in FIELDS if all(f in r for r in runs)},
+            "runs": runs,
+        }
+
+    print(f"\nKaltstart ({args.repeat} Prozesse je Variante, Median, ms)")
+    print(f"  {'':16s} " + " ".join(f"{label:>14s}" for label in variants))
+    for field in FIELDS:
+        values = [v["median"].get(field) for v in variants.values()]
+        print(f"  {field:16s} " + " ".join(f"{x:14.0f}" if x is not None else f"{'-':>14s}" for x in values))
+
+    out = args.out or os.path.join(RESULTS_DIR, "coldstart", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"git": git_info(), "python": sys.version.split()[0], "pdf": args.pdf,
+                            "word": args.word, "starters": args.starters},
+                   "variants": variants}, f, ensure_ascii=False, indent=1)
+    print(f"\nErgebnis: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
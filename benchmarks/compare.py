@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# benchmarks/compare.py
+#
+# Regressions-Check gegen gespeicherte Baselines.
+#
+# Eine Baseline hält pro Template und Starterzahl-Bucket die Laufzeit
+# (wall_ms) und den Spitzenspeicher (peak_kb) eines Benchmark-Laufs
+# (benchmarks/run.py). compare vergleicht einen neuen Lauf damit und meldet
+# alles, was um mehr als die Schwelle langsamer/größer geworden ist - die
+# schlimmsten Ausreißer zuerst. Exit-Code 1 bei Regressionen, damit sich der
+# Check vor dem Deployment oder nach Template-Uploads als Gate nutzen lässt.
+#
+# Aufruf aus dem Projektordner:
+#     python -m benchmarks.run --sizes 10,150,500
+#     python -m benchmarks.compare --save-baseline          # letzten Lauf als Baseline
+#     ... Änderungen ...
+#     python -m benchmarks.run --sizes 10,150,500
+#     python -m benchmarks.compare --threshold 0.2          # letzten Lauf prüfen
+#
+# Zeiten sind maschinenabhängig: Baseline und Vergleich auf derselben
+# Maschine erzeugen (Plattform steht in den Metadaten der Baseline).
+#
+import argparse
+import glob
+import json
+import os
+import sys
+from datetime import datetime
+
+from benchmarks.run import RESULTS_DIR, ROOT
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Starterzahl-Buckets: (obere Grenze inkl., Name)
+BUCKETS = [(25, "xs"), (100, "s"), (250, "m"), (None, "l")]
+
+METRICS = {
+    "wall_ms": "Zeit",
+    "peak_kb": "Speicher",
+}
+
+
+def bucket(starters):
+    for limit, name in BUCKETS:
+        if limit is None or starters <= limit:
+            return name
+    return BUCKETS[-1][1]
+
+
+def latest_run(results_dir=RESULTS_DIR):
+    runs = sorted(glob.glob(os.path.join(results_dir, "*.json")))
+    if not runs:
+        raise SystemExit(f"Kein Benchmark-Lauf in {results_dir} - zuerst python -m benchmarks.run")
+    return runs[-1]
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def summarize(run):
+    """Lauf -> {"kind/template/bucket": {wall_ms, peak_kb, starters, error}} (bestes Ergebnis je Bucket)"""
+    entries = {}
+    for r in run["results"]:
+        key = f"{r['kind']}/{r['template']}/{bucket(r['starters'])}"
+        entry = entries.setdefault(key, {"starters": r["starters"]})
+        if "error" in r:
+            entry.setdefault("error", r["error"])
+            continue
+        entry.pop("error", None)
+        for metric in METRICS:
+            value = r.get(metric)
+            if value is not None and (metric not in entry or value < entry[metric]):
+                entry[metric] = value
+                entry["starters"] = r["starters"]
+    return entries
+
+
+def save_baseline(run_path, baseline_path=BASELINE_FILE):
+    run = load_json(run_path)
+    baseline = load_json(baseline_path) if os.path.exists(baseline_path) else {"entries": {}}
+    baseline["entries"].update(summarize(run))
+    baseline["meta"] = {
+        "updated": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.relpath(run_path, ROOT),
+        "git": run["meta"].get("git", {}),
+        "platform": run["meta"].get("platform", ""),
+    }
+    with open(baseline_path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=1, sort_keys=True)
+    return baseline
+
+
+def compare(baseline, run, threshold=0.25, memory_threshold=None, min_ms=20.0):
+    """
+    Liefert (regressions, improvements, new_errors, missing); Regression =
+    Verhältnis neu/alt über 1 + Schwelle und (bei Zeit) mindestens min_ms langsamer.
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    current = summarize(run)
+    base = baseline["entries"]
+    regressions, improvements, new_errors, missing = [], [], [], []
+    for key, now in sorted(current.items()):
+        old = base.get(key)
+        if old is None:
+            continue
+        if "error" in now:
+            if "error" not in old:
+                new_errors.append((key, now["error"]))
+            continue
+        for metric, label in METRICS.items():
+            a, b = old.get(metric), now.get(metric)
+            if not a or b is None:
+                continue
+            ratio = b / a
+            limit = threshold if metric == "wall_ms" else memory_threshold
+            row = {"key": key, "metric": label, "old": a, "new": b, "ratio": ratio}
+            if ratio > 1 + limit and (metric != "wall_ms" or b - a >= min_ms):
+                regressions.append(row)
+            elif ratio < 1 - limit:
+                improvements.append(row)
+    measured = {key.rsplit("/", 1)[0] for key in current}
+    for key in sorted(base):
+        if key not in current and key.rsplit("/", 1)[0] in measured:
+            missing.append(key)
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+    improvements.sort(key=lambda r: r["ratio"])
+    return regressions, improvements, new_errors, missing
+
+
+def _print_rows(title, rows, top):
+    print(f"\n{title} ({len(rows)})")
+    print(f"  {'Template/Bucket':48s} {'Wert':9s} {'Baseline':>10s} {'Neu':>10s} {'Faktor':>7s}")
+    for r in rows[:top]:
+        print(f"  {r['key']:48s} {r['metric']:9s} {r['old']:10.1f} {r['new']:10.1f} {r['ratio']:6.2f}x")
+    if len(rows) > top:
+        print(f"  ... und {len(rows) - top} weitere")
+
+
+def report(regressions, improvements, new_errors, missing, top=10):
+    if regressions:
+        _print_rows("REGRESSIONEN", regressions, top)
+    if new_errors:
+        print(f"\nNEU FEHLERHAFT ({len(new_errors)})")
+        for key, error in new_errors:
+            print(f"  {key:48s} {error[:100]}")
+    if improvements:
+        _print_rows("Verbesserungen", improvements, top)
+    if missing:
+        print(f"\nIn der Baseline, aber nicht gemessen: {', '.join(missing)}")
+    if not regressions and not new_errors:
+        print("\nKeine Regressionen.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Lauf mit Baseline vergleichen")
+    parser.add_argument("run", nargs="?", help="Ergebnis-JSON von benchmarks.run (Standard: letzter Lauf)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline-Datei (Standard: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Lauf als Baseline übernehmen (ergänzt/überschreibt vorhandene Einträge)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="erlaubte Verschlechterung der Zeit, 0.25 = +25%% (Standard: %(default)s)")
+    parser.add_argument("--memory-threshold", type=float, default=None,
+                        help="erlaubte Verschlechterung des Speichers (Standard: wie --threshold)")
+    parser.add_argument("--min-ms", type=float, default=20.0,
+                        help="kleinere Zeitdifferenzen gelten nie als Regression (Standard: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl Einträge im Bericht")
+    args = parser.parse_args(argv)
+
+    run_path = args.run or latest_run()
+    if args.save_baseline:
+        baseline = save_baseline(run_path, args.baseline)
+        print(f"Baseline aktualisiert: {args.baseline} ({len(baseline['entries'])} Einträge aus {run_path})")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        raise SystemExit(f"Keine Baseline {args.baseline} - zuerst --save-baseline")
+    baseline = load_json(args.baseline)
+    run = load_json(run_path)
+    print(f"Lauf:     {run_path} ({run['meta'].get('git', {}).get('commit', '')[:8]})")
+    print(f"Baseline: {args.baseline} ({baseline.get('meta', {}).get('git', {}).get('commit', '')[:8]})")
+    if baseline.get("meta", {}).get("platform") not in (None, run["meta"].get("platform")):
+        print("Achtung: Baseline stammt von einer anderen Plattform")
+    regressions, improvements, new_errors, missing = compare(
+        baseline, run, args.threshold, args.memory_threshold, args.min_ms
+    )
+    report(regressions, improvements, new_errors, missing, args.top)
+    return 1 if regressions or new_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
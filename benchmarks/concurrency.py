@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# benchmarks/concurrency.py
+#
+# Stresstest: viele Exporte verschiedener User mit verschiedenen Druckoptionen
+# gleichzeitig in einem Prozess (wie mehrere Sessions mit den Export-Workern).
+#
+# Jeder Test-User bekommt ein eigenes Banner und eine eigene Sponsorenleiste
+# (logos/_concurrency_<n>/) mit eindeutiger Pixelbreite; dazu kommt ein User
+# ohne eigene Dateien (gemeinsamer logos/-Ordner). Zuerst läuft jeder
+# Export einzeln (Referenz), dann alle zusammen in --threads Threads, mehrfach
+# gemischt. Geprüft wird pro Ausgabedatei:
+#     - Seitenzahl und eingebettete Bilder gleich wie in der Referenz
+#     - kein Bild eines anderen Test-Users im Dokument
+#
+# Aufruf aus dem Projektordner:
+#     python -m benchmarks.concurrency
+#     python -m benchmarks.concurrency --users 8 --threads 8 --rounds 3 --pdf pdf_nat,pdf_int_spr --word word_nat
+#
+# Exit-Code 1 bei Abweichungen.
+#
+import argparse
+import io
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.run import ROOT
+
+USER_PREFIX = "_concurrency_"
+BANNER_WIDTH = 1200   # + Nummer des Users
+SPONSOR_WIDTH = 1400  # + Nummer des Users
+_WIDTH_RE = re.compile(rb"/Width (\d+)")
+
+
+def make_users(count):
+    """Test-User mit eigenem Banner/Sponsorenleiste anlegen; liefert [(name, nummer)]"""
+    from PIL import Image
+    users = []
+    for i in range(count):
+        name = f"{USER_PREFIX}{i}"
+        user_dir = os.path.join("logos", name)
+        os.makedirs(user_dir, exist_ok=True)
+        color = ((37 * i) % 256, (91 * i) % 256, (151 * i) % 256)
+        Image.new("RGB", (BANNER_WIDTH + i, 120), color).save(os.path.join(user_dir, "banner.png"))
+        Image.new("RGB", (SPONSOR_WIDTH + i, 60), color).save(os.path.join(user_dir, "sponsorenleiste.png"))
+        users.append((name, i))
+    # User ohne eigene Dateien: nimmt Banner/Sponsorenleiste aus logos/
+    users.append(("standard", count))
+    return users
+
+
+def remove_users(users):
+    for name, _ in users:
+        if not name.startswith(USER_PREFIX):
+            continue
+        shutil.rmtree(os.path.join("logos", name), ignore_errors=True)
+
+
+def print_options_for(i):
+    """Unterschiedliche Druckoptionen je User"""
+    return {
+        "sponsor_top": i % 5 == 4,
+        "sponsor_bottom": False,
+        "single_sided": i % 2 == 1,
+        "show_banner": i % 3 != 2,
+        "show_sponsor_bar": i % 4 != 3,
+        "show_title": True,
+        "show_header": True,
+        "spacing_top_cm": 3.0,
+        "spacing_bottom_cm": 2.0,
+    }
+
+
+def _pdf_signature(path):
+    from export_metrics import count_pdf_pages
+    with open(path, "rb") as f:
+        data = f.read()
+    return count_pdf_pages(path), tuple(sorted({int(w) for w in _WIDTH_RE.findall(data)}))
+
+
+def _docx_signature(path):
+    from PIL import Image
+    widths = set()
+    with zipfile.ZipFile(path) as z:
+        for name in z.namelist():
+            if name.startswith("word/media/"):
+                try:
+                    widths.add(Image.open(io.BytesIO(z.read(name))).size[0])
+                except Exception:
+                    pass
+    return None, tuple(sorted(widths))
+
+
+def run_case(case, out_dir):
+    """Ein Export; liefert (Signatur, ms)"""
+    kind, template, user, i, data = case
+    options = print_options_for(i)
+    os.makedirs(out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    if kind == "pdf":
+        from pdf_export import create_pdf
+        path = create_pdf(data, f"{template}_{user}.pdf", template, options["spacing_top_cm"],
+                          options["spacing_bottom_cm"], 5.0, print_options=options,
+                          output_dir=out_dir, username=user)
+        signature = _pdf_signature(path)
+    else:
+        from word_export import create_word
+        path = create_word(data, template, os.path.join(out_dir, f"{template}_{user}.docx"),
+                           print_options=options, username=user)
+        signature = _docx_signature(path)
+    return signature, (time.perf_counter() - t0) * 1000.0
+
+
+def foreign_images(signature, i, user_count):
+    """Bildbreiten anderer Test-User in einer Signatur"""
+    own = {BANNER_WIDTH + i, SPONSOR_WIDTH + i}
+    test_widths = {BANNER_WIDTH + n for n in range(user_count)} | {SPONSOR_WIDTH + n for n in range(user_count)}
+    return sorted((set(signature[1]) & test_widths) - own)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallele Exporte verschiedener User prüfen")
+    parser.add_argument("--users", type=int, default=6, help="Test-User (Standard: %(default)s)")
+    parser.add_argument("--threads", type=int, default=6, help="parallele Exporte (Standard: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=2, help="parallele Durchgänge (Standard: %(default)s)")
+    parser.add_argument("--starters", type=int, default=40, help="Starter je Liste (Standard: %(default)s)")
+    parser.add_argument("--pdf", default="pdf_nat,pdf_int_spr,pdf_dre_3", help="PDF-Templates, Komma-getrennt")
+    parser.add_argument("--word", default="word_nat,word_dre_3_logo", help="Word-Templates, Komma-getrennt")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    from benchmarks.synthetic import make_starterlist, scenario_for
+
+    templates = [("pdf", t) for t in args.pdf.split(",") if t] + [("word", t) for t in args.word.split(",") if t]
+    users = make_users(args.users)
+    out_root = tempfile.mkdtemp(prefix="toris_concurrency_")
+    failures = []
+    try:
+        cases = []
+        for kind, template in templates:
+            data = make_starterlist(args.starters, scenario_for(template))
+            for user, i in users:
+                cases.append((kind, template, user, i, data))
+
+        print(f"{len(cases)} Exporte ({len(templates)} Templates x {len(users)} User), Referenz einzeln ...")
+        reference = {}
+        t0 = time.perf_counter()
+        for case in cases:
+            reference[case[:3]] = run_case(case, os.path.join(out_root, "ref"))[0]
+        sequential_ms = (time.perf_counter() - t0) * 1000.0
+
+        for case in cases:
+            foreign = foreign_images(reference[case[:3]], case[3], args.users)
+            if foreign:
+                failures.append(f"Referenz {case[1]} {case[2]}: fremde Bilder {foreign}")
+
+        rng = random.Random(args.seed)
+        parallel_ms = []
+        for round_no in range(args.rounds):
+            order = list(cases)
+            rng.shuffle(order)
+            out_dir = os.path.join(out_root, f"round{round_no}")
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                futures = [(case, pool.submit(run_case, case, os.path.join(out_dir, case[2]))) for case in order]
+                for case, future in futures:
+                    try:
+                        signature = future.result()[0]
+                    except Exception as e:
+                        failures.append(f"Durchgang {round_no + 1} {case[1]} {case[2]}: {type(e).__name__}: {e}")
+                        continue
+                    if signature != reference[case[:3]]:
+                        failures.append(f"Durchgang {round_no + 1} {case[1]} {case[2]}: {signature} statt {reference[case[:3]]}")
+                    foreign = foreign_images(signature, case[3], args.users)
+                    if foreign:
+                        failures.append(f"Durchgang {round_no + 1} {case[1]} {case[2]}: fremde Bilder {foreign}")
+            parallel_ms.append((time.perf_counter() - t0) * 1000.0)
+    finally:
+        remove_users(users)
+        shutil.rmtree(out_root, ignore_errors=True)
+
+    print(f"  einzeln:   {sequential_ms:8.0f} ms")
+    for n, ms in enumerate(parallel_ms, 1):
+        print(f"  parallel {n}: {ms:7.0f} ms ({args.threads} Threads)")
+    if failures:
+        print(f"\n{len(failures)} Abweichungen:")
+        for line in failures[:50]:
+            print("  " + line)
+        return 1
+    print("\nKeine Abweichungen.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
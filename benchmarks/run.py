@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# benchmarks/run.py
+#
+# Benchmark aller Templates aus templates/pdf und templates/word über
+# create_pdf / create_word mit synthetischen Starterlisten.
+#
+# Aufruf aus dem Projektordner:
+#     python -m benchmarks.run                       # alle Templates, 10/50/150/500 Starter
+#     python -m benchmarks.run --sizes 150 --only pdf_nat,word_nat --repeat 5
+#     python -m benchmarks.run --kinds word --stream --label streaming
+#
+# Pro Template und Größe wird gemessen:
+#     wall_ms   beste Laufzeit aus --repeat Läufen (Median zusätzlich)
+#     peak_kb   Spitzenspeicher des Python-Heaps (tracemalloc, eigener Lauf;
+#               Speicher von lxml/reportlab-C-Code ist nicht enthalten)
+#     bytes     Größe der Ausgabedatei
+#     pages     Seitenzahl (nur PDF)
+#     phases    Eigenzeiten je Phase aus export_metrics (render, build, save ...)
+#
+# Die Ergebnisse landen als JSON in benchmarks/results/<zeit>_<commit>.json
+# und können mit anderen Läufen (anderer Commit) verglichen werden
+# (Baseline und Regressions-Check: benchmarks/compare.py).
+#
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [10, 50, 150, 500]
+
+# Wie in app5_cloud.py beim Export
+PRINT_OPTIONS = {
+    "sponsor_top": False,
+    "sponsor_bottom": False,
+    "single_sided": False,
+    "show_banner": True,
+    "show_sponsor_bar": True,
+    "show_title": True,
+    "show_header": True,
+    "use_knr_column": False,
+    "fast_render": False,
+    "meisterschaft_data": {},
+    "spacing_top_cm": 3.0,
+    "spacing_bottom_cm": 2.0,
+    "word_streaming": False,
+}
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def git_info():
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def discover(kinds, only):
+    """(kind, template_name) für alle Templates, optional gefiltert"""
+    found = []
+    for kind in kinds:
+        for path in sorted(glob.glob(os.path.join(ROOT, "templates", kind, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name.startswith("__"):
+                continue
+            if only and not any(o in name for o in only):
+                continue
+            found.append((kind, name))
+    return found
+
+
+def _export(kind, name, data, out_dir, print_options):
+    import export_metrics
+    import template_manifest
+    from pdf_export import create_pdf
+    from word_export import create_word
+    from starterlist_model import Starterlist
+
+    with export_metrics.span("normalize"):
+        export = Starterlist.from_api(data).to_api()
+    if template_manifest.needs(kind, name, "derby_times"):
+        export["derby_config"] = {"begin_time": "10:00", "final_time": "12:00"}
+    elif template_manifest.needs(kind, name, "pw_config"):
+        export["derby_config"] = {}
+    if kind == "pdf":
+        return create_pdf(export, f"{name}.pdf", name, 0, 0, 5.0,
+                          output_dir=out_dir, print_options=dict(print_options))
+    return create_word(export, name, os.path.join(out_dir, f"{name}.docx"),
+                       print_options=dict(print_options), logo_max_width_cm=5.0)
+
+
+def run_case(kind, name, size, scenario, repeat, memory, print_options):
+    import export_metrics
+    from benchmarks.synthetic import make_starterlist, scenario_for
+
+    scenario = scenario_for(name) if scenario == "auto" else scenario
+    data = make_starterlist(size, scenario=scenario)
+    result = {"kind": kind, "template": name, "starters": size, "scenario": scenario}
+    out_dir = tempfile.mkdtemp(prefix="toris_bench_")
+    try:
+        times, trace, path = [], None, None
+        for _ in range(repeat):
+            with export_metrics.trace(kind, template=name) as trace:
+                t0 = time.perf_counter()
+                path = _export(kind, name, data, out_dir, print_options)
+                times.append((time.perf_counter() - t0) * 1000.0)
+        result["wall_ms"] = round(min(times), 1)
+        result["wall_ms_median"] = round(statistics.median(times), 1)
+        result["bytes"] = os.path.getsize(path)
+        result["pages"] = export_metrics.count_pdf_pages(path) if kind == "pdf" else None
+        phases = {}
+        for span in trace.spans:
+            phases[span["name"]] = round(phases.get(span["name"], 0.0) + span["self_ms"], 1)
+        result["phases"] = phases
+        if memory:
+            tracemalloc.start()
+            try:
+                _export(kind, name, data, out_dir, print_options)
+                result["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024.0)
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark aller PDF-/Word-Templates")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Starterzahlen, kommagetrennt (Standard: %(default)s)")
+    parser.add_argument("--kinds", default="pdf,word", help="pdf, word oder beides")
+    parser.add_argument("--only", default="", help="nur Templates, deren Name einen dieser Teile enthält")
+    parser.add_argument("--scenario", default="auto",
+                        help="Szenario aus benchmarks.synthetic.SCENARIOS oder auto (nach Template-Name)")
+    parser.add_argument("--repeat", type=int, default=3, help="Läufe pro Messung, gewertet wird der schnellste")
+    parser.add_argument("--no-memory", action="store_true", help="ohne tracemalloc-Lauf")
+    parser.add_argument("--fast", action="store_true", help="PDF mit fast_render")
+    parser.add_argument("--stream", action="store_true", help="Word mit word_streaming")
+    parser.add_argument("--label", default="", help="Zusatz für den Dateinamen des Ergebnisses")
+    parser.add_argument("--out", default=RESULTS_DIR, help="Ordner für Ergebnis-JSON")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)  # Templates, Logos und Flaggen liegen relativ zum Projektordner
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    only = [o.strip() for o in args.only.split(",") if o.strip()]
+    print_options = dict(PRINT_OPTIONS, fast_render=args.fast, word_streaming=args.stream)
+    had_output_dir = os.path.exists("Ausgabe")
+
+    # Einmalige Importkosten nicht dem ersten Template anrechnen
+    import pdf_export, word_export, starterlist_model  # noqa: F401
+
+    cases = discover(kinds, only)
+    results = []
+    print(f"{'Template':40s} {'Starter':>7s} {'ms':>9s} {'peak KB':>9s} {'Bytes':>9s} {'Seiten':>6s}")
+    for kind, name in cases:
+        for size in sizes:
+            r = run_case(kind, name, size, args.scenario, max(1, args.repeat), not args.no_memory, print_options)
+            results.append(r)
+            if "error" in r:
+                print(f"{name:40s} {size:7d}  FEHLER {r['error']}")
+            else:
+                print(f"{name:40s} {size:7d} {r['wall_ms']:9.1f} {r.get('peak_kb', 0):9d} "
+                      f"{r['bytes']:9d} {r['pages'] if r['pages'] is not None else '-':>6}")
+
+    # Word-Templates legen beim Import einen Ausgabe-Ordner an
+    if not had_output_dir and os.path.isdir("Ausgabe") and not os.listdir("Ausgabe"):
+        os.rmdir("Ausgabe")
+
+    info = git_info()
+    run = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": info,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    fname = f"{stamp}_{(info['commit'] or 'nogit')[:8]}{'_' + args.label if args.label else ''}.json"
+    path = os.path.join(args.out, fname)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, ensure_ascii=False, indent=1)
+    failed = sum(1 for r in results if "error" in r)
+    print(f"\n{len(results)} Messungen, {failed} Fehler -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
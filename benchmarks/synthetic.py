@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# benchmarks/synthetic.py
+#
+# Synthetische Starterlisten im Format der TORIS-API (nach enhance_starterlist)
+# für Benchmarks. Alles ist über den Seed reproduzierbar.
+#
+# make_starterlist(150, scenario="int") liefert z.B. eine internationale
+# Liste mit 150 Startern; die Szenarien unten decken die Varianten ab, die die
+# Templates unterscheiden (Abteilungen, Pausen, Gruppen, zurückgezogene und
+# AK-Starter, Nationen, Dressurrichter mit dressageTests).
+#
+import random
+from datetime import datetime, timedelta
+
+NATIONS_NAT = ["GER"] * 9 + ["AUT", "NED", "SUI"]
+NATIONS_INT = ["GER", "NED", "BEL", "FRA", "GBR", "IRL", "SUI", "AUT", "SWE", "USA",
+               "ITA", "ESP", "DEN", "POL", "CZE", "BRA", "AUS", "NZL", "JPN", "UAE"]
+STUDBOOKS = ["HANN", "OLDBG", "WESTF", "HOLST", "TRAK", "KWPN", "SF", "BWP"]
+COLORS = ["Fuchs", "Braun", "Dunkelbraun", "Rappe", "Schimmel"]
+SEXES = ["MARE", "GELDING", "STALLION"]
+CLUBS = ["RV Musterstadt", "RFV Am Deich", "ZRFV Heide", "PSV Nord", "RC Tal"]
+FIRST = ["Anna", "Lena", "Jonas", "Marie", "Paul", "Sophie", "Lukas", "Emma", "Felix", "Clara"]
+LAST = ["Müller", "Schmidt", "Meyer", "Schulz", "Wagner", "Becker", "Hoffmann", "Koch", "Richter", "Wolf"]
+HORSES = ["Carlos", "Diamant", "For Fun", "Quidam", "Cornet", "Balou", "Donna", "Lady", "Sir", "Chacco"]
+
+# Dressurrichter (Position wie in der API: 0=E, 1=H, 2=C, 3=M, 4=B)
+DRESSAGE_JUDGES = [
+    {"position": 0, "name": "Richterin E"},
+    {"position": 1, "name": "Richter H"},
+    {"position": 2, "name": "Richterin C"},
+    {"position": 3, "name": "Richter M"},
+    {"position": 4, "name": "Richterin B"},
+]
+JUMPING_JUDGES = [
+    {"position": 2, "name": "Richter C"},
+    {"position": 10, "name": "Aufsicht"},
+]
+
+# Szenarien: Standardwerte für make_starterlist
+SCENARIOS = {
+    "nat": dict(international=False, divisions=1, breaks=True),
+    "int": dict(international=True, divisions=1, breaks=True),
+    "divisions": dict(international=False, divisions=3, breaks=True),
+    "groups": dict(international=False, divisions=1, breaks=True, groups=10),
+    "dressage": dict(international=False, divisions=1, breaks=True, dressage=True),
+    "dressage_int": dict(international=True, divisions=1, breaks=True, dressage=True),
+    "plain": dict(international=False, divisions=1, breaks=False, withdrawn_every=0, ak_every=0),
+}
+
+
+def scenario_for(template_name):
+    """Passendes Szenario für ein Template (nach Namenskonvention)"""
+    name = template_name.lower()
+    intl = "_int" in name or name.endswith("int")
+    if "_dre_" in name:
+        return "dressage_int" if intl else "dressage"
+    if "kompakt" in name or "_komp" in name:
+        return "groups"
+    if intl:
+        return "int"
+    return "divisions" if "abstammung" in name else "nat"
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def make_starterlist(n, scenario="nat", seed=1, **overrides):
+    """
+    Starterliste mit n Startern.
+    overrides: international, divisions, breaks, groups (Starter pro Gruppe),
+    withdrawn_every, ak_every, dressage
+    """
+    opts = dict(withdrawn_every=13, ak_every=17, groups=0, dressage=False)
+    opts.update(SCENARIOS[scenario])
+    opts.update(overrides)
+    rng = random.Random(seed)
+    nations = NATIONS_INT if opts["international"] else NATIONS_NAT
+    start = datetime(2025, 6, 1, 9, 0)
+    per_division = max(1, -(-n // max(1, opts["divisions"])))
+
+    starters = []
+    for i in range(1, n + 1):
+        nation = rng.choice(nations)
+        division = (i - 1) // per_division + 1
+        t = start + timedelta(minutes=2 * i + 15 * (division - 1))
+        horse = {
+            "name": f"{rng.choice(HORSES)} {i}",
+            "cno": 100000 + i,
+            "studbook": rng.choice(STUDBOOKS),
+            "breed": rng.choice(STUDBOOKS),
+            "breedingSeason": rng.randint(2008, 2019),
+            "color": rng.choice(COLORS),
+            "sex": rng.choice(SEXES),
+            "sire": f"{rng.choice(HORSES)} {rng.randint(1, 9)}",
+            "damSire": f"{rng.choice(HORSES)} {rng.randint(1, 9)}",
+            "owner": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "breeder": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "feiNumber": f"10{rng.randint(10000, 99999)}",
+            "horseInformation": "",
+        }
+        starters.append({
+            "startNumber": i,
+            "backNumber": 100 + i,
+            "startTime": _iso(t),
+            "divisionNumber": division,
+            "withdrawn": bool(opts["withdrawn_every"]) and i % opts["withdrawn_every"] == 0,
+            "horsConcours": bool(opts["ak_every"]) and i % opts["ak_every"] == 0,
+            "groupNumber": (i - 1) // opts["groups"] + 1 if opts["groups"] else None,
+            "athlete": {
+                "name": f"{rng.choice(LAST)}, {rng.choice(FIRST)}",
+                "club": rng.choice(CLUBS) if nation == "GER" else "",
+                "nation": nation,
+                "feiId": f"1{rng.randint(100000, 999999)}",
+            },
+            "horses": [horse],
+        })
+
+    breaks = []
+    if opts["breaks"]:
+        breaks.append({"afterNumberInCompetition": 0, "totalSeconds": 0, "informationText": "Abreiten"})
+        for k in range(20, n, 20):
+            breaks.append({"afterNumberInCompetition": k, "totalSeconds": 900, "informationText": "Platzpflege"})
+
+    divisions = [
+        {"number": d, "start": _iso(start + timedelta(minutes=2 * per_division * (d - 1) + 15 * (d - 1)))}
+        for d in range(1, opts["divisions"] + 1)
+    ]
+
+    dressage = opts["dressage"]
+    return {
+        "showTitle": "Benchmark-Turnier",
+        "showNumber": "999001",
+        "competitionTitle": "Dressurprüfung Kl. M" if dressage else "Springprüfung Kl. L",
+        "competitionNumber": 5,
+        "divisionNumber": 1 if opts["divisions"] > 1 else 0,
+        "subtitle": "Benchmark",
+        "informationText": "Synthetische Starterliste\nZweite Zeile",
+        "location": "Hauptplatz",
+        "start": _iso(start),
+        "roundNumber": 1,
+        "judgingRule": "402C" if dressage else "A",
+        "judges": [dict(j) for j in (DRESSAGE_JUDGES if dressage else JUMPING_JUDGES)],
+        "dressageTests": [
+            {"name": "M 6 (Trense)", "judgePositions": [0, 2, 4]},
+            {"name": "M 8", "judgePositions": [1, 3]},
+        ] if dressage else [],
+        "divisions": divisions,
+        "starters": starters,
+        "breaks": breaks,
+    }
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# data_import.py
+#
+# Import der Zusatzdateien aus der Sidebar:
+#   - KNr-Vergleichstabelle (alt -> neu) als .json / .csv (Semikolon) / .xlsx
+#     mit den Spalten KNr_alt und KNr_neu
+#   - Meisterschaftsdatei (.xlsx): Kopfzeile ist die erste Zeile mit "Summe",
+#     darunter KNr... und Summe je Pferd
+#
+# Bisher wurde in der App Zeile für Zeile mit iterrows() und int()/float()
+# umgewandelt; Verbandsdateien mit tausenden Pferden brauchten Sekunden, und
+# das bei jedem Rerun, solange die Datei im Uploader liegt. Jetzt:
+#   - Spalten werden einmal geprüft, Umwandlung spaltenweise (pd.to_numeric)
+#   - unbrauchbare Zeilen werden gesammelt gemeldet statt still verworfen
+#     (bzw. statt den ganzen Import abzubrechen)
+#   - Ergebnisse werden nach SHA1 des Dateiinhalts gecacht
+#
+# Fehler in der Datei (fehlende Spalten, kein JSON-Objekt ...) -> ValueError
+# mit Text für die Anzeige.
+#
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+KNR_COLUMNS = ("KNr_alt", "KNr_neu")
+CACHE_SIZE = 16
+
+
+class ImportResult:
+    """Geladene Zuordnung plus übersprungene Einträge [("Zeile 7", Grund), ...]"""
+
+    def __init__(self, data, rows, bad_rows):
+        self.data = data
+        self.rows = rows
+        self.bad_rows = bad_rows
+
+    def bad_rows_text(self, limit=20):
+        """Kurzfassung für die Anzeige: "Zeile 5 (KNr_neu 'abc'), Zeile 9 ..." """
+        text = ", ".join(f"{where} ({reason})" for where, reason in self.bad_rows[:limit])
+        if len(self.bad_rows) > limit:
+            text += f" ... und {len(self.bad_rows) - limit} weitere"
+        return text
+
+
+_cache = OrderedDict()  # (art, sha1) -> ImportResult
+_cache_lock = threading.Lock()
+
+
+def _cached(kind, content, parse, *args):
+    key = (kind, hashlib.sha1(content).hexdigest())
+    with _cache_lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+    if result is None:
+        result = parse(content, *args)
+        with _cache_lock:
+            _cache[key] = result
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+        log.debug("%s importiert: %d Einträge, %d Zeilen übersprungen", kind, len(result.data), len(result.bad_rows))
+    # Kopie: die Session darf ihr Dict ändern, ohne den Cache zu verändern
+    return ImportResult(dict(result.data), result.rows, result.bad_rows)
+
+
+INT64_LIMIT = 2.0 ** 63
+
+
+def _not_int64(numbers):
+    """
+    Maske der Werte, die astype("int64") verfälschen würde: Nachkommastellen
+    ("17.9" -> 17) oder außerhalb des int64-Bereichs (Überlauf)
+    """
+    f = pd.to_numeric(numbers, errors="coerce").astype("float64")
+    return f.notna() & ((f != f.round()) | (f.abs() >= INT64_LIMIT))
+
+
+def _int_reason(label, raw, numbers, pos):
+    f = float(numbers.iat[pos])
+    return f"{label} {raw!r} " + ("außerhalb des Zahlenbereichs" if abs(f) >= INT64_LIMIT else "keine ganze Zahl")
+
+
+def _numeric_pairs(keys, values, key_label, value_label, first_row, value_type):
+    """
+    Zwei Spalten spaltenweise umwandeln; liefert (dict, bad_rows).
+    Schlüssel werden wie bisher als str(int(KNr)) abgelegt, Zeilen ohne
+    jeden Eintrag (Leer-/Fußzeilen) zählen nicht als Fehler. Schlüssel (und
+    bei value_type int64 die Werte) müssen ganze Zahlen im int64-Bereich sein.
+    """
+    k = pd.to_numeric(keys, errors="coerce")
+    v = pd.to_numeric(values, errors="coerce")
+    k_int = _not_int64(k)
+    v_int = _not_int64(v) if value_type == "int64" else pd.Series(False, index=v.index)
+    ok = k.notna() & v.notna() & ~k_int & ~v_int
+    empty = keys.isna() & values.isna()
+
+    bad_rows = []
+    bad = ~ok & ~empty
+    if bad.any():
+        for pos in bad.to_numpy().nonzero()[0]:
+            if k_int.iat[pos]:
+                reason = _int_reason(key_label, keys.iat[pos], k, pos)
+            elif v_int.iat[pos]:
+                reason = _int_reason(value_label, values.iat[pos], v, pos)
+            else:
+                label, raw = (key_label, keys.iat[pos]) if pd.isna(k.iat[pos]) else (value_label, values.iat[pos])
+                reason = f"{label} {raw!r}" if not pd.isna(raw) else f"{label} leer"
+            bad_rows.append((f"Zeile {first_row + int(pos)}", reason))
+
+    k, v = k[ok], v[ok]
+    data = dict(zip(k.astype("int64").astype(str).tolist(), v.astype(value_type).tolist()))
+    return data, bad_rows
+
+
+def _knr_frame(content, suffix):
+    if suffix == ".csv":
+        df = pd.read_csv(io.BytesIO(content), sep=";", dtype=str, skipinitialspace=True)
+    else:
+        df = pd.read_excel(io.BytesIO(content), usecols=lambda c: str(c).strip() in KNR_COLUMNS)
+    df.columns = [str(c).strip() for c in df.columns]
+    missing = [c for c in KNR_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Spalte(n) {', '.join(missing)} fehlen. Gefunden: {list(df.columns)}")
+    return df
+
+
+def _parse_knr(content, suffix):
+    if suffix == ".json":
+        raw = json.loads(content.decode("utf-8"))
+        if not isinstance(raw, dict):
+            raise ValueError("JSON muss ein Objekt {\"KNr_alt\": KNr_neu, ...} sein")
+        keys = pd.Series(list(raw.keys()), dtype=object)
+        values = pd.Series(list(raw.values()), dtype=object)
+        v = pd.to_numeric(values, errors="coerce")
+        v_int = _not_int64(v)
+        ok = v.notna() & ~v_int
+        bad_rows = [
+            (f"KNr_alt {keys.iat[pos]}",
+             _int_reason("KNr_neu", values.iat[pos], v, pos) if v_int.iat[pos] else f"KNr_neu {values.iat[pos]!r}")
+            for pos in (~ok).to_numpy().nonzero()[0]
+        ]
+        data = dict(zip(keys[ok].astype(str).tolist(), v[ok].astype("int64").tolist()))
+        return ImportResult(data, len(raw), bad_rows)
+
+    df = _knr_frame(content, suffix)
+    # Zeile 1 = Kopfzeile
+    data, bad_rows = _numeric_pairs(df["KNr_alt"], df["KNr_neu"], "KNr_alt", "KNr_neu", 2, "int64")
+    return ImportResult(data, len(df), bad_rows)
+
+
+def load_knr_mapping(content, filename):
+    """KNr-Vergleichstabelle (.json/.csv/.xlsx) -> ImportResult mit {"KNr_alt": KNr_neu}"""
+    suffix = "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if suffix not in (".json", ".csv", ".xlsx"):
+        raise ValueError(f"Dateityp {suffix or filename} wird nicht unterstützt")
+    return _cached("knr" + suffix, content, _parse_knr, suffix)
+
+
+def _parse_meisterschaft(content):
+    df = pd.read_excel(io.BytesIO(content), header=None)
+    is_header = pd.Series(False, index=df.index)
+    for col in df.columns:
+        is_header |= df[col].astype(str).str.contains("Summe", regex=False)
+    if not is_header.any():
+        raise ValueError("Keine Spalte 'Summe' in der Datei gefunden!")
+    header_pos = int(is_header.to_numpy().nonzero()[0][0])
+
+    header = [str(c).strip() for c in df.iloc[header_pos]]
+    knr_pos = next((i for i, c in enumerate(header) if c.lower().startswith("knr")), None)
+    summe_pos = next((i for i, c in enumerate(header) if c == "Summe"), None)
+    if knr_pos is None or summe_pos is None:
+        raise ValueError(f"Spalten 'KNr' und/oder 'Summe' nicht gefunden. Gefunden: {header}")
+
+    body = df.iloc[header_pos + 1:]
+    # Excel-Zeilennummer der ersten Datenzeile (1-basiert)
+    data, bad_rows = _numeric_pairs(
+        body.iloc[:, knr_pos], body.iloc[:, summe_pos], header[knr_pos], "Summe", header_pos + 2, "float64"
+    )
+    return ImportResult(data, len(body), bad_rows)
+
+
+def load_meisterschaft(content):
+    """Meisterschaftsdatei (.xlsx) -> ImportResult mit {"KNr": Summe}"""
+    return _cached("meisterschaft", content, _parse_meisterschaft)
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# export_history.py
+#
+# Export-Verlauf pro User mit Ablage der fertigen Dateien.
+#
+# Der Download-Button eines Exports verschwand bisher mit dem nächsten
+# Rerun bzw. Job-Ablauf; wer die Datei ein paar Minuten später noch einmal
+# brauchte, hat dieselbe Prüfung neu exportiert. Jetzt wird jeder fertige
+# Export hier abgelegt:
+#
+#     <ROOT>/artifacts/<sha1>.<endung>   Datei, nach Inhalt benannt (Duplikate einmal)
+#     <ROOT>/users/<schlüssel>.json      Verlauf und zuletzt geladene Starterlisten
+#
+# Der Schlüssel ("user" in den Methoden) ist Benutzername plus Hash des
+# TORIS-API-Keys: Organisatoren mit demselben Login, aber verschiedenen Keys
+# sehen und laden nur ihre eigenen Exporte.
+#
+# Ein Eintrag merkt sich Prüfung, Abteilung, Umlauf, Template, Zeit, den
+# Fingerabdruck der Starterliste (fingerprint) und den Render-Schlüssel (alle
+# Eingaben des Exports, render_key). Damit kann die App
+#   - frühere Exporte ohne neues Rendern wieder zum Download anbieten
+#   - einen Export mit identischen Eingaben direkt aus der Ablage bedienen
+#   - anzeigen, ob sich die Starterliste seit dem Export geändert hat
+#     (note_starterlist beim Laden, is_current beim Anzeigen)
+#
+# Aufbewahrung: MAX_ENTRIES pro User, MAX_AGE, Ablage insgesamt unter
+# TOTAL_QUOTA (älteste Einträge zuerst); nicht mehr referenzierte Dateien
+# werden gelöscht. collect() liest dafür alle User-Dateien und läuft deshalb
+# nicht bei jedem Export, sondern im Aufräum-Thread von output_store und nur
+# dann sofort, wenn ein Export die Ablage über TOTAL_QUOTA bringt.
+# Einstellungen über TORIS_HISTORY_* Umgebungsvariablen.
+#
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+MB = 1024 * 1024
+
+ROOT = os.environ.get("TORIS_HISTORY_DIR") or os.path.join(tempfile.gettempdir(), "toris_history")
+MAX_ENTRIES = int(os.environ.get("TORIS_HISTORY_ENTRIES", "30"))
+MAX_AGE = float(os.environ.get("TORIS_HISTORY_MAX_AGE", str(24 * 3600)))   # Sekunden
+TOTAL_QUOTA = int(float(os.environ.get("TORIS_HISTORY_TOTAL_MB", "500")) * MB)
+GRACE = 600  # Sekunden; jüngere *.tmp-Dateien gehören evtl. zu einem laufenden record()
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def fingerprint(data):
+    """Fingerabdruck einer Starterliste (bzw. beliebiger JSON-Daten), unabhängig von der Schlüssel-Reihenfolge"""
+    return hashlib.sha1(_canonical(data)).hexdigest()
+
+
+def render_key(**parts):
+    """Schlüssel über alle Eingaben eines Exports (Template, Starterliste, Optionen ...)"""
+    return hashlib.sha1(_canonical(parts)).hexdigest()
+
+
+def selection_key(show, competition, division, round_number):
+    """Welche Starterliste: Veranstaltung / Prüfung / Abteilung / Umlauf"""
+    return f"{show}/{competition}/{division or 0}/{round_number or 1}"
+
+
+def _user_stem(user):
+    """
+    Dateiname (ohne .json) für einen History-Schlüssel: lesbarer Teil plus
+    Hash des ganzen Schlüssels, damit sich z.B. "a.b" und "ab" nicht teilen
+    """
+    user = str(user)
+    readable = "".join(c for c in user.strip().lower() if c.isalnum() or c in "-_")[:40] or "standard"
+    return f"{readable}-{hashlib.sha1(user.encode('utf-8')).hexdigest()[:12]}"
+
+
+class ExportHistory:
+    """
+    Verlauf je History-Schlüssel (JSON) plus inhaltsadressierte Ablage der
+    Dateien. Der Schlüssel ("user") kommt von der App und trennt nach
+    Benutzername und API-Key: wer den Key nicht hat, sieht die Exporte nicht.
+    """
+
+    def __init__(self, root=ROOT):
+        self.root = root
+        self.artifacts_dir = os.path.join(root, "artifacts")
+        self.users_dir = os.path.join(root, "users")
+        self._states = {}  # dateiname -> {"entries": [...], "seen": {auswahl: {"hash", "time"}}}
+        self._lock = threading.RLock()
+        self._stored = None  # geschätzte Größe der Ablage in Bytes (None = noch nicht gezählt)
+
+    # --- Zustand pro User -------------------------------------------------
+
+    def _path(self, stem):
+        return os.path.join(self.users_dir, f"{stem}.json")
+
+    def _load(self, stem):
+        state = self._states.get(stem)
+        if state is None:
+            try:
+                with open(self._path(stem), encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            state.setdefault("entries", [])
+            state.setdefault("seen", {})
+            # Abgelaufene Einträge gleich beim Laden verwerfen, nicht erst beim nächsten Export
+            if self._prune_user(state):
+                self._write(stem, state)
+            self._states[stem] = state
+        return state
+
+    def _state(self, user):
+        return self._load(_user_stem(user))
+
+    def _write(self, stem, state):
+        os.makedirs(self.users_dir, exist_ok=True)
+        path = self._path(stem)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _save(self, user):
+        stem = _user_stem(user)
+        self._write(stem, self._load(stem))
+
+    def _store_size(self):
+        """Summe der Dateien in artifacts/ (einmal zählen, danach in record() mitführen)"""
+        if self._stored is None:
+            try:
+                self._stored = sum(e.stat().st_size for e in os.scandir(self.artifacts_dir) if e.is_file())
+            except OSError:
+                self._stored = 0
+        return self._stored
+
+    def artifact_path(self, entry):
+        return os.path.join(self.artifacts_dir, entry["artifact"])
+
+    # --- Verlauf ------------------------------------------------------------
+
+    def record(self, user, meta, path):
+        """
+        Fertigen Export ablegen. meta: kind, template, filename, selection,
+        competition, division, round, starterlist_hash, render_key.
+        Liefert den neuen Eintrag.
+        """
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        artifact = digest + os.path.splitext(path)[1].lower()
+        target = os.path.join(self.artifacts_dir, artifact)
+        # Kopieren und Eintragen unter der Sperre: collect() darf die Datei
+        # nicht dazwischen als unbenutzt löschen
+        with self._lock:
+            if not os.path.exists(target):
+                os.makedirs(self.artifacts_dir, exist_ok=True)
+                tmp = f"{target}.{uuid.uuid4().hex[:8]}.tmp"
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, target)
+                self._stored = self._store_size() + os.path.getsize(target)
+            entry = dict(meta)
+            entry.update(id=uuid.uuid4().hex[:12], created=time.time(), artifact=artifact,
+                         bytes=os.path.getsize(target))
+            state = self._state(user)
+            state["entries"].insert(0, entry)
+            self._prune_user(state)
+            self._save(user)
+            over_quota = self._store_size() > TOTAL_QUOTA
+        if over_quota:
+            self.collect()
+        log.debug("Export im Verlauf: %s %s (%s)", entry["template"], entry.get("selection"), artifact)
+        return entry
+
+    def _live(self, user):
+        """Kopien der nicht abgelaufenen Einträge (neueste zuerst); Aufruf unter der Sperre"""
+        now = time.time()
+        return [dict(e) for e in self._state(user)["entries"] if now - e["created"] <= MAX_AGE]
+
+    def entries(self, user):
+        """Einträge des Users, neueste zuerst (nur solche, deren Datei noch da ist)"""
+        with self._lock:
+            entries = self._live(user)
+        return [e for e in entries if os.path.exists(self.artifact_path(e))]
+
+    def get(self, user, entry_id):
+        with self._lock:
+            for e in self._live(user):
+                if e["id"] == entry_id:
+                    return e
+        return None
+
+    def find(self, user, key):
+        """Neuester Eintrag mit diesem Render-Schlüssel, dessen Datei noch vorhanden ist"""
+        with self._lock:
+            candidates = [e for e in self._live(user) if e.get("render_key") == key]
+        for entry in candidates:
+            if os.path.exists(self.artifact_path(entry)):
+                return entry
+        return None
+
+    def read(self, user, entry_id):
+        """Dateiinhalt eines Eintrags (für den Download)"""
+        entry = self.get(user, entry_id)
+        if entry is None:
+            raise FileNotFoundError(entry_id)
+        with open(self.artifact_path(entry), "rb") as f:
+            return f.read()
+
+    def remove(self, user, entry_id):
+        with self._lock:
+            state = self._state(user)
+            state["entries"] = [e for e in state["entries"] if e["id"] != entry_id]
+            self._save(user)
+        # Die Datei selbst räumt der nächste collect() im Aufräum-Thread weg
+
+    # --- Änderungsanzeige -------------------------------------------------
+
+    def note_starterlist(self, user, selection, digest):
+        """Beim Laden einer Starterliste: aktuellen Fingerabdruck merken"""
+        with self._lock:
+            state = self._state(user)
+            seen = state["seen"].get(selection)
+            if seen is not None and seen.get("hash") == digest:
+                return
+            state["seen"][selection] = {"hash": digest, "time": time.time()}
+            self._save(user)
+
+    def is_current(self, user, entry):
+        """
+        True: zuletzt geladene Starterliste dieser Auswahl ist die des Exports,
+        False: inzwischen anders geladen, None: Auswahl nicht (mehr) bekannt.
+        """
+        with self._lock:
+            seen = self._state(user)["seen"].get(entry.get("selection"))
+        if seen is None:
+            return None
+        return seen["hash"] == entry.get("starterlist_hash")
+
+    # --- Aufbewahrung -----------------------------------------------------
+
+    def _prune_user(self, state):
+        """MAX_AGE/MAX_ENTRIES anwenden; True, wenn sich etwas geändert hat"""
+        now = time.time()
+        entries = [e for e in state["entries"] if now - e["created"] <= MAX_AGE][:MAX_ENTRIES]
+        used = {e["selection"] for e in entries if e.get("selection")}
+        seen = {k: v for k, v in state["seen"].items() if k in used or now - v["time"] <= MAX_AGE}
+        changed = len(entries) != len(state["entries"]) or len(seen) != len(state["seen"])
+        state["entries"], state["seen"] = entries, seen
+        return changed
+
+    def collect(self):
+        """
+        Dateien ohne Eintrag löschen; Ablage unter TOTAL_QUOTA halten (älteste
+        Einträge zuerst). Liest alle User-Dateien - für den Aufräum-Thread.
+        """
+        now = time.time()
+        sizes = {}
+        doomed = []
+        try:
+            files = list(os.scandir(self.artifacts_dir))
+        except OSError:
+            return
+        for f in files:
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            if f.name.endswith(".del"):
+                doomed.append(f.path)  # Rest eines abgebrochenen Laufs
+            elif f.name.endswith(".tmp"):
+                if now - st.st_mtime > GRACE:
+                    doomed.append(f.path)  # abgebrochene Kopie in record()
+            else:
+                sizes[f.name] = st.st_size
+        with self._lock:
+            stems = set(self._states)
+            try:
+                stems |= {name[:-5] for name in os.listdir(self.users_dir) if name.endswith(".json")}
+            except OSError:
+                pass
+            entries = []  # (erstellt, dateiname, eintrag)
+            refs = {}     # artifact -> Anzahl Einträge
+            for stem in stems:
+                for e in self._load(stem)["entries"]:
+                    entries.append((e["created"], stem, e))
+                    refs[e["artifact"]] = refs.get(e["artifact"], 0) + 1
+            used = sum(sizes.get(name, 0) for name in refs)
+            dropped = {}  # dateiname -> ids der verworfenen Einträge
+            for _, stem, e in sorted(entries, key=lambda x: x[0]):
+                if used <= TOTAL_QUOTA:
+                    break
+                dropped.setdefault(stem, set()).add(e["id"])
+                refs[e["artifact"]] -= 1
+                if not refs[e["artifact"]]:
+                    del refs[e["artifact"]]
+                    used -= sizes.get(e["artifact"], 0)
+            for stem, ids in dropped.items():
+                state = self._load(stem)
+                state["entries"] = [e for e in state["entries"] if e["id"] not in ids]
+                self._write(stem, state)
+            # Unter der Sperre nur umbenennen: ein record() danach legt die Datei
+            # neu an, statt auf eine gleich gelöschte zu verweisen
+            for name in sizes:
+                if name in refs:
+                    continue
+                path = os.path.join(self.artifacts_dir, name)
+                target = f"{path}.{uuid.uuid4().hex[:8]}.del"
+                try:
+                    os.replace(path, target)
+                except OSError:
+                    continue
+                doomed.append(target)
+            self._stored = used
+        # Löschen außerhalb der Sperre
+        for path in doomed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+history = ExportHistory()
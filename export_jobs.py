@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# export_jobs.py
+#
+# Export-Jobs im Hintergrund (Worker-Pool + Job-Registry).
+#
+# Bisher liefen create_pdf/create_word direkt im Button-Handler unter
+# st.spinner: das Streamlit-Skript der Session war blockiert, und jede
+# Widget-Interaktion startete einen Rerun, der die laufende Arbeit verwarf.
+#
+# Jetzt legt der Button nur einen Job an; ein Thread aus dem Pool erzeugt das
+# Dokument. Die Registry ist prozessweit (st.cache_resource in der App) und
+# überlebt damit Reruns; die UI fragt Status und Fortschritt ab und bietet
+# fertige Dokumente zum Download an. Mehrere Exporte laufen parallel (bis
+# TORIS_EXPORT_WORKERS, Standard 2).
+#
+# Fortschritt kommt aus den Spans von export_metrics (assets, template_load,
+# render, build/save ...), die Exporter ohnehin melden.
+#
+# Verworfene Jobs (Entfernen, JOB_TTL, MAX_JOBS_PER_OWNER) melden ihre Datei
+# an on_discard - die App löscht damit den Job-Ordner (output_store).
+#
+# Leichte Templates (cost "light" im template_manifest, z.B. Hinderniskarte,
+# Derby) laufen in einem eigenen Worker, damit sie nicht hinter langen
+# Springlisten warten.
+#
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import export_metrics
+import export_profiler
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+MAX_WORKERS = max(1, int(os.environ.get("TORIS_EXPORT_WORKERS", "2")))
+JOB_TTL = 3600       # Sekunden, danach werden fertige Jobs verworfen
+MAX_JOBS_PER_OWNER = 20
+
+QUEUED, RUNNING, DONE, ERROR = "queued", "running", "done", "error"
+
+# Phase (Span-Name) -> (Fortschritt, Anzeige)
+PHASES = {
+    "remap": (0.05, "KNr-Mapping"),
+    "assets": (0.10, "Logos ermitteln"),
+    "template_load": (0.15, "Template laden"),
+    "render": (0.20, "Tabellen aufbauen"),
+    "build": (0.60, "PDF schreiben"),
+    "save": (0.85, "Dokument speichern"),
+}
+
+
+class ExportJob:
+    """Ein Export; Felder werden vom Worker-Thread geschrieben und von der UI gelesen"""
+
+    def __init__(self, kind, template, filename, owner, cost="normal"):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.template = template
+        self.filename = filename
+        self.owner = owner
+        self.cost = cost
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Wartet"
+        self.path = None
+        self.error = None
+        self.traceback = None
+        self.trace = None
+        self.profile = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.seen = False        # Datei heruntergeladen, Download-Phase im Trace
+        self.remembered = False  # Trace schon in der Session verbucht (Performance-Panel)
+        self.note = ""     # Hinweis für die Anzeige, z.B. Datei aus dem Verlauf
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def _phase(self, name, depth):
+        phase = PHASES.get(name)
+        if phase is not None and phase[0] > self.progress:
+            self.progress, self.message = phase
+
+
+class JobRegistry:
+    """Prozessweite Job-Liste mit Worker-Pool"""
+
+    def __init__(self, max_workers=MAX_WORKERS, on_discard=None):
+        self._on_discard = on_discard  # on_discard(pfad) wenn ein fertiger Job verworfen wird
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="toris-export")
+        self._fast = ThreadPoolExecutor(max_workers=1, thread_name_prefix="toris-export-light")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, template, filename, owner, func, *args, profile_mode="", cost="normal", **kwargs):
+        """
+        Job anlegen und einreihen; func(*args, **kwargs) muss den Pfad der Datei
+        liefern. cost "light" -> eigener Worker für schnelle Templates.
+        """
+        self.prune()
+        job = ExportJob(kind, template, filename, owner, cost)
+        with self._lock:
+            self._jobs[job.id] = job
+        executor = self._fast if cost == "light" else self._executor
+        executor.submit(self._run, job, func, args, kwargs, profile_mode)
+        return job
+
+    def _run(self, job, func, args, kwargs, profile_mode):
+        job.status, job.started, job.message = RUNNING, time.time(), "Läuft"
+        try:
+            with export_metrics.trace(job.kind, on_span=job._phase, template=job.template) as t:
+                job.trace = t
+                if profile_mode:
+                    path, job.profile = export_profiler.run_profiled(profile_mode, func, *args, **kwargs)
+                else:
+                    path = func(*args, **kwargs)
+            if not path or not os.path.exists(path):
+                raise RuntimeError("Ausgabedatei wurde nicht erstellt")
+            job.path = path
+            job.progress, job.message = 1.0, "Fertig"
+            job.finished = time.time()
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.traceback = traceback.format_exc()
+            job.message = "Fehler"
+            job.finished = time.time()
+            job.status = ERROR
+            log.error("Export-Job %s (%s) fehlgeschlagen: %s", job.id, job.template, e)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner):
+        """Jobs einer Session, neueste zuerst"""
+        with self._lock:
+            return [j for j in reversed(self._jobs.values()) if j.owner == owner]
+
+    def remove(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.active:
+                del self._jobs[job_id]
+            else:
+                job = None
+        if job is not None:
+            self._discard([job])
+
+    def _discard(self, jobs):
+        if self._on_discard is None:
+            return
+        for job in jobs:
+            if job.path:
+                try:
+                    self._on_discard(job.path)
+                except Exception as e:
+                    log.warning("Ausgabe von Job %s nicht gelöscht: %s", job.id, e)
+
+    def prune(self):
+        """Alte fertige Jobs verwerfen (Alter oder mehr als MAX_JOBS_PER_OWNER pro Session)"""
+        now = time.time()
+        dropped = []
+        with self._lock:
+            per_owner = {}
+            for job_id, job in reversed(list(self._jobs.items())):
+                if job.active:
+                    continue
+                per_owner[job.owner] = per_owner.get(job.owner, 0) + 1
+                if now - job.finished > JOB_TTL or per_owner[job.owner] > MAX_JOBS_PER_OWNER:
+                    del self._jobs[job_id]
+                    dropped.append(job)
+        self._discard(dropped)
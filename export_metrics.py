@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# export_metrics.py
+#
+# Zeitmessung pro Export (und pro Laden einer Starterliste).
+#
+# Ein Trace fasst einen Vorgang zusammen (z.B. "pdf" mit Template-Name,
+# Starterzahl, Seitenzahl) und enthält Spans für die einzelnen Phasen:
+#
+#     api           ein Request an die TORIS-API (Tags endpoint, status, cached)
+#     normalize     Starterliste aufbereiten / Modell bauen
+#     remap         KNr-Mapping für den Export
+#     assets        Logo-, Banner- und Sponsorpfade ermitteln
+#     template_load Template-Modul laden
+#     render        render() des Templates; Eigenzeit = Aufbau der Flowables/Zeilen
+#       build       reportlab doc.build (PDF)
+#       save        python-docx doc.save (Word)
+#     download      Datei lesen und an st.download_button übergeben
+#
+# Verwendung:
+#     with export_metrics.trace("pdf", template=name) as t:
+#         with export_metrics.span("assets"):
+#             ...
+#
+# span()/tag() ohne aktiven Trace sind No-ops, Exporter und Templates können
+# sie also immer aufrufen. Fertige Traces lassen sich als JSON Lines
+# exportieren (to_jsonl) und werden zusätzlich an die Datei in
+# TORIS_METRICS_FILE angehängt, wenn die Variable gesetzt ist.
+#
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+METRICS_FILE = os.environ.get("TORIS_METRICS_FILE", "")
+
+_current = ContextVar("toris_export_trace", default=None)
+_file_lock = threading.Lock()
+_NULL = nullcontext()
+
+
+class ExportTrace:
+    """Spans eines Vorgangs, Zeiten in Millisekunden relativ zum Start"""
+
+    def __init__(self, kind, on_span=None, **tags):
+        self.kind = kind
+        self.on_span = on_span  # Callback(name, depth) bei Span-Beginn, z.B. für Fortschrittsanzeigen
+        self.tags = dict(tags)
+        self.started = time.time()
+        self.spans = []
+        self.total_ms = None
+        self.error = None
+        self._t0 = time.perf_counter()
+        self._depth = 0
+
+    def _now_ms(self):
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    @contextmanager
+    def span(self, name, **tags):
+        entry = {"name": name, "depth": self._depth, "start_ms": round(self._now_ms(), 2)}
+        if tags:
+            entry["tags"] = dict(tags)
+        self.spans.append(entry)
+        if self.on_span is not None:
+            self.on_span(name, self._depth)
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            yield entry
+        except BaseException as e:
+            entry["error"] = type(e).__name__
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - t0) * 1000.0, 2)
+            self._depth -= 1
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def add_span(self, name, ms, **tags):
+        """Nachträglich gemessene Phase anhängen (z.B. Download nach Abschluss eines Export-Jobs)"""
+        entry = {"name": name, "depth": 0, "start_ms": self.total_ms or round(self._now_ms(), 2),
+                 "ms": round(ms, 2), "self_ms": round(ms, 2)}
+        if tags:
+            entry["tags"] = dict(tags)
+        self.spans.append(entry)
+
+    def finish(self):
+        self.total_ms = round(self._now_ms(), 2)
+        # Eigenzeit: Dauer abzüglich direkt verschachtelter Spans
+        for i, entry in enumerate(self.spans):
+            children = 0.0
+            for child in self.spans[i + 1:]:
+                if child["depth"] <= entry["depth"]:
+                    break
+                if child["depth"] == entry["depth"] + 1:
+                    children += child.get("ms", 0.0)
+            entry["self_ms"] = round(entry.get("ms", 0.0) - children, 2)
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "total_ms": self.total_ms,
+            "error": self.error,
+            "tags": self.tags,
+            "spans": self.spans,
+        }
+
+
+@contextmanager
+def trace(kind, on_span=None, **tags):
+    """Startet einen Trace; Spans aus span() landen darin, bis der Block endet"""
+    t = ExportTrace(kind, on_span=on_span, **tags)
+    token = _current.set(t)
+    try:
+        yield t
+    except BaseException as e:
+        t.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        t.finish()
+        if METRICS_FILE:
+            _append(METRICS_FILE, t)
+
+
+def current():
+    return _current.get()
+
+
+def span(name, **tags):
+    """Span im aktiven Trace (ohne Trace: No-op)"""
+    t = _current.get()
+    if t is None:
+        return _NULL
+    return t.span(name, **tags)
+
+
+def tag(**tags):
+    """Tags am aktiven Trace setzen (ohne Trace: No-op)"""
+    t = _current.get()
+    if t is not None:
+        t.tag(**tags)
+
+
+def to_jsonl(traces):
+    return "".join(json.dumps(t.to_dict(), ensure_ascii=False, default=str) + "\n" for t in traces)
+
+
+def _append(path, t):
+    try:
+        with _file_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(to_jsonl([t]))
+    except OSError:
+        pass
+
+
+_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+def count_pdf_pages(path):
+    """Seitenzahl einer von reportlab geschriebenen PDF (Seitenobjekte zählen)"""
+    try:
+        with open(path, "rb") as f:
+            return len(_PAGE_RE.findall(f.read()))
+    except OSError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# build/save der Bibliotheken messen, ohne jedes Template anzufassen
+# ---------------------------------------------------------------------------
+
+def _wrap(owner, attr, span_name):
+    original = getattr(owner, attr)
+    if getattr(original, "_toris_span", None):
+        return
+
+    def wrapper(*args, **kwargs):
+        if _current.get() is None:
+            return original(*args, **kwargs)
+        with span(span_name):
+            return original(*args, **kwargs)
+
+    wrapper._toris_span = span_name
+    wrapper.__name__ = original.__name__
+    wrapper.__doc__ = original.__doc__
+    setattr(owner, attr, wrapper)
+
+
+def instrument_reportlab():
+    from reportlab.platypus.doctemplate import BaseDocTemplate
+    _wrap(BaseDocTemplate, "build", "build")
+
+
+def instrument_docx():
+    from docx.document import Document
+    _wrap(Document, "save", "save")
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# export_profiler.py
+#
+# Optionales Profiling eines einzelnen Exports (create_pdf / create_word).
+#
+# Zwei Modi:
+#   sample    Sampling-Profiler: ein Hintergrund-Thread liest alle paar
+#             Millisekunden den Stack des Export-Threads. Geringer Overhead,
+#             liefert Top-Funktionen und Stacks im "collapsed"-Format
+#             (eine Zeile "a;b;c anzahl" pro Stack) für flamegraph.pl,
+#             speedscope oder inferno.
+#   cprofile  Deterministisch mit cProfile: exakte Aufrufzahlen, Top-Funktionen
+#             nach kumulierter/eigener Zeit und die Rohdaten als .prof
+#             (pstats, snakeviz).
+#
+# Aktiv wird das Profiling über die Umgebungsvariable TORIS_PROFILE
+# (sample/cprofile, für alle Exporte) oder den Admin-Schalter in der Sidebar.
+#
+#     result, profile = run_profiled("sample", create_pdf, ...)
+#     for filename, data, mime in profile.files("0510_start"):
+#         ...
+#
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_MODES = {
+    "sample": "Sampling (Flamegraph)",
+    "cprofile": "cProfile (deterministisch)",
+}
+ENV_MODE = os.environ.get("TORIS_PROFILE", "").strip().lower()
+if ENV_MODE not in PROFILE_MODES:
+    ENV_MODE = ""
+
+SAMPLE_INTERVAL = 0.005  # Sekunden
+TOP_N = 40
+
+
+class ProfileResult:
+    """Ergebnis eines profilierten Exports"""
+
+    def __init__(self, mode, seconds, top_text, collapsed=None, pstats_data=None, samples=0):
+        self.mode = mode
+        self.seconds = seconds
+        self.top_text = top_text
+        self.collapsed = collapsed
+        self.pstats_data = pstats_data
+        self.samples = samples
+
+    @property
+    def label(self):
+        return PROFILE_MODES.get(self.mode, self.mode)
+
+    def files(self, basename):
+        """(Dateiname, Bytes, MIME) für die Download-Buttons"""
+        out = [(f"{basename}.profile.txt", self.top_text.encode("utf-8"), "text/plain")]
+        if self.collapsed is not None:
+            out.append((f"{basename}.collapsed.txt", self.collapsed.encode("utf-8"), "text/plain"))
+        if self.pstats_data is not None:
+            out.append((f"{basename}.prof", self.pstats_data, "application/octet-stream"))
+        return out
+
+
+def _frame_name(code):
+    return f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_name}"
+
+
+class _Sampler(threading.Thread):
+    """Liest periodisch den Stack eines Threads bis unterhalb von stop_code"""
+
+    def __init__(self, thread_id, stop_code, interval):
+        super().__init__(name="toris-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.stop_code = stop_code
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def _sample(func, args, kwargs, interval):
+    sampler = _Sampler(threading.get_ident(), sys._getframe().f_code, interval)
+    sampler.start()
+    t0 = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - t0
+        sampler.stop()
+
+    total = sum(sampler.stacks.values())
+    own, inclusive = Counter(), Counter()
+    lines = []
+    for stack, count in sampler.stacks.most_common():
+        names = [_frame_name(code) for code in stack]
+        own[names[-1]] += count
+        for name in set(names):
+            inclusive[name] += count
+        lines.append(f"{';'.join(names)} {count}")
+
+    text = io.StringIO()
+    text.write(f"Sampling-Profil: {total} Samples à {interval * 1000:.0f} ms, Laufzeit {seconds:.3f} s\n\n")
+    for title, counter in (("Eigene Zeit (Funktion oben auf dem Stack)", own),
+                           ("Inklusive Aufrufe", inclusive)):
+        text.write(f"{title}\n{'Anteil':>7s} {'Samples':>8s}  Funktion\n")
+        for name, count in counter.most_common(TOP_N):
+            text.write(f"{100.0 * count / max(1, total):6.1f}% {count:8d}  {name}\n")
+        text.write("\n")
+    return result, ProfileResult("sample", seconds, text.getvalue(), collapsed="\n".join(lines) + "\n", samples=total)
+
+
+def _cprofile(func, args, kwargs):
+    profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - t0
+    text = io.StringIO()
+    text.write(f"cProfile: Laufzeit {seconds:.3f} s (mit Profiler-Overhead)\n\n")
+    stats = pstats.Stats(profiler, stream=text)
+    stats.strip_dirs()
+    for order in ("cumulative", "tottime"):
+        text.write(f"=== sortiert nach {order} ===\n")
+        stats.sort_stats(order).print_stats(TOP_N)
+    profiler.create_stats()
+    return result, ProfileResult("cprofile", seconds, text.getvalue(), pstats_data=marshal.dumps(profiler.stats))
+
+
+def run_profiled(mode, func, *args, **kwargs):
+    """Ruft func(*args, **kwargs) unter dem Profiler auf; liefert (Ergebnis, ProfileResult)"""
+    if mode == "sample":
+        return _sample(func, args, kwargs, SAMPLE_INTERVAL)
+    if mode == "cprofile":
+        return _cprofile(func, args, kwargs)
+    raise ValueError(f"Unbekannter Profiler-Modus: {mode}")
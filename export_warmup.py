@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# export_warmup.py
+#
+# Vorwärmen der Exporter im Hintergrund.
+#
+# Die App importiert pdf_export/word_export (und damit reportlab, PIL,
+# python-docx) erst beim ersten Export - die Login-Seite und die erste Seite
+# nach dem Login kommen so ohne diese Importe aus. Damit der erste Export
+# trotzdem nicht die Importzeit zahlt, startet die App nach dem Login einen
+# Hintergrund-Thread, der die Bibliotheken importiert und die ausgewählten
+# Templates einmal lädt (Bytecode landet in __pycache__, Schriften und
+# reportlab-Module sind danach geladen).
+#
+# Vorher wird das Bytecode-Bundle der Templates abgeglichen (template_bundle).
+#
+# Einmal pro Prozess und Template; mit TORIS_WARMUP=0 abschaltbar.
+#
+import os
+import threading
+import time
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+ENABLED = os.environ.get("TORIS_WARMUP", "1").strip() not in ("0", "false", "no", "")
+
+_lock = threading.Lock()
+_requested = set()  # ("pdf"/"word", name) bzw. ("lib", modul)
+_steps = []         # [(schritt, ms, fehler oder None)] in Reihenfolge
+_running = 0
+
+
+def _step(name, func, *args):
+    t0 = time.perf_counter()
+    error = None
+    try:
+        func(*args)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        log.warning("Warm-up %s fehlgeschlagen: %s", name, e)
+    ms = (time.perf_counter() - t0) * 1000.0
+    with _lock:
+        _steps.append((name, round(ms, 1), error))
+    log.debug("Warm-up %s: %.0f ms", name, ms)
+
+
+def _check_bundle():
+    import template_bundle
+    template_bundle.startup_check()
+
+
+def _import_pdf():
+    import pdf_export  # noqa: F401  (reportlab + Instrumentierung)
+
+
+def _import_word():
+    import word_export  # noqa: F401  (python-docx + Instrumentierung)
+
+
+def _load_pdf(name):
+    import pdf_export
+    pdf_export.preload_template(name)
+
+
+def _load_word(name):
+    from word_templates import registry
+    registry.get(name)
+
+
+def _run(tasks):
+    global _running
+    try:
+        for name, func, args in tasks:
+            _step(name, func, *args)
+    finally:
+        with _lock:
+            _running -= 1
+
+
+def start(pdf_templates=(), word_templates=()):
+    """
+    Warm-up im Hintergrund starten; bereits vorgewärmte Templates werden
+    übersprungen. Liefert False, wenn nichts zu tun ist (oder abgeschaltet).
+    """
+    global _running
+    if not ENABLED:
+        return False
+    wanted = [
+        ("lib", "template_bundle", _check_bundle, ()),
+        ("lib", "pdf_export", _import_pdf, ()),
+        ("lib", "word_export", _import_word, ()),
+    ]
+    wanted += [("pdf", name, _load_pdf, (name,)) for name in pdf_templates if name]
+    wanted += [("word", name, _load_word, (name,)) for name in word_templates if name]
+    with _lock:
+        tasks = []
+        for kind, name, func, args in wanted:
+            if (kind, name) not in _requested:
+                _requested.add((kind, name))
+                tasks.append((name, func, args))
+        if not tasks:
+            return False
+        _running += 1
+    threading.Thread(target=_run, args=(tasks,), name="toris-warmup", daemon=True).start()
+    return True
+
+
+def running():
+    return _running > 0
+
+
+def status():
+    """Bisherige Schritte [(name, ms, fehler)] für die Anzeige"""
+    with _lock:
+        return list(_steps)
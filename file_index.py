@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# file_index.py
+#
+# Gecachte Verzeichnislisten für Templates und Logos.
+#
+# Die Sidebar und die Datei-Verwaltung listen templates/pdf, templates/word
+# und den Logo-Ordner bei jedem Streamlit-Rerun - also bei jeder
+# Widget-Änderung. Auf Netzwerk-Speicher ist jeder Scan spürbar.
+#
+# Der Index hält pro Ordner (und Endungs-Filter) die sortierten Dateinamen:
+#   - invalidate(ordner) nach Upload/Löschen verwirft die Liste sofort
+#   - ändert sich ein Ordner von außen (git pull, zweiter Prozess), merkt das
+#     die mtime des Ordners; geprüft wird höchstens alle CHECK_INTERVAL
+#     Sekunden, dazwischen kostet ein Zugriff keinen Dateisystem-Aufruf
+#
+import os
+import threading
+import time
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+CHECK_INTERVAL = float(os.environ.get("TORIS_DIR_CHECK_INTERVAL", "5"))
+
+
+class _Listing:
+    __slots__ = ("mtime_ns", "checked", "names", "stems")
+
+    def __init__(self, mtime_ns, checked, names):
+        self.mtime_ns = mtime_ns
+        self.checked = checked
+        self.names = names
+        self.stems = tuple(os.path.splitext(name)[0] for name in names)
+
+
+class DirectoryIndex:
+    """Sortierte Dateinamen je Ordner, bis zur Invalidierung oder mtime-Änderung gecacht"""
+
+    def __init__(self, check_interval=CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._listings = {}  # (ordner, endungen) -> _Listing
+        self._ensured = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(directory):
+        # Reine String-Operation (kein getcwd wie bei abspath)
+        return os.path.normpath(os.fspath(directory))
+
+    def files(self, directory, suffixes=None):
+        """
+        Dateinamen im Ordner (ohne "__*" und Unterordner), sortiert, als Tupel.
+        suffixes: Tupel erlaubter Endungen in Kleinbuchstaben, z.B. (".py",)
+        """
+        return self._listing(directory, suffixes).names
+
+    def stems(self, directory, suffixes):
+        """Wie files(), aber ohne Endung (z.B. Template-Namen), als Liste"""
+        return list(self._listing(directory, suffixes).stems)
+
+    def _listing(self, directory, suffixes):
+        key = (self._key(directory), suffixes)
+        now = time.monotonic()
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is not None and now - listing.checked < self.check_interval:
+                return listing
+        try:
+            mtime_ns = os.stat(key[0]).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            listing.checked = now
+            return listing
+        listing = _Listing(mtime_ns, now, self._scan(key[0], suffixes) if mtime_ns is not None else ())
+        with self._lock:
+            self._listings[key] = listing
+        log.debug("%s gelistet: %d Dateien", key[0], len(listing.names))
+        return listing
+
+    @staticmethod
+    def _scan(path, suffixes):
+        names = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("__") or not entry.is_file():
+                    continue
+                if suffixes and not entry.name.lower().endswith(suffixes):
+                    continue
+                names.append(entry.name)
+        return tuple(sorted(names))
+
+    def invalidate(self, directory=None):
+        """Listen eines Ordners (oder alle) verwerfen - nach Upload/Löschen aufrufen"""
+        with self._lock:
+            if directory is None:
+                self._listings.clear()
+                return
+            path = self._key(directory)
+            for key in [k for k in self._listings if k[0] == path]:
+                del self._listings[key]
+
+    def ensure_dir(self, directory):
+        """Ordner einmal pro Prozess anlegen statt bei jedem Aufruf mkdir"""
+        path = self._key(directory)
+        if path in self._ensured:
+            return
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            self._ensured.add(path)
+
+
+index = DirectoryIndex()
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# output_store.py
+#
+# Ausgabeordner der Exporte: Namensräume pro Session und Job, Quoten, Aufräumen.
+#
+# Bisher schrieben alle Sessions nach <tmp>/toris_output, Dateinamen nur mit
+# Minute (zwei Exporte derselben Prüfung in einer Minute überschrieben sich,
+# auch zwischen Usern), gelöscht wurde nie - auf langen Turnierwochenenden
+# lief das Temp-Volume voll. Jetzt:
+#
+#     <ROOT>/<session>/<job>/<dateiname>
+#
+#   - jeder Export bekommt einen eigenen Job-Ordner (job_dir); der Dateiname
+#     für den Download bleibt wie gewohnt
+#   - pro Session höchstens SESSION_QUOTA Bytes; beim neuen Export werden die
+#     ältesten Job-Ordner der Session verworfen
+#   - ein Hintergrund-Thread (start_janitor) löscht alle JANITOR_INTERVAL
+#     Sekunden Job-Ordner älter als MAX_AGE und hält die Summe unter
+#     TOTAL_QUOTA (älteste zuerst); leere Session-Ordner werden entfernt
+#   - Job-Ordner jünger als GRACE werden nie angefasst (Export läuft evtl. noch)
+#
+# Einstellungen über Umgebungsvariablen (TORIS_OUTPUT_DIR, TORIS_OUTPUT_*).
+# Von Hand aufräumen und Belegung anzeigen:
+#     python -m output_store
+#
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+MB = 1024 * 1024
+
+ROOT = os.environ.get("TORIS_OUTPUT_DIR") or os.path.join(tempfile.gettempdir(), "toris_output")
+MAX_AGE = float(os.environ.get("TORIS_OUTPUT_MAX_AGE", str(2 * 3600)))           # Sekunden
+SESSION_QUOTA = int(float(os.environ.get("TORIS_OUTPUT_SESSION_MB", "200")) * MB)
+TOTAL_QUOTA = int(float(os.environ.get("TORIS_OUTPUT_TOTAL_MB", "2000")) * MB)
+JANITOR_INTERVAL = float(os.environ.get("TORIS_OUTPUT_JANITOR_INTERVAL", "300"))  # Sekunden
+GRACE = 600  # Sekunden
+
+_lock = threading.Lock()
+_janitor = None
+_last_sweep = None  # (zeit, gelöschte Ordner, freigegebene Bytes)
+
+
+def _safe_name(value):
+    return "".join(c for c in str(value) if c.isalnum() or c in "-_")[:64] or "anon"
+
+
+def session_dir(session):
+    return os.path.join(ROOT, _safe_name(session))
+
+
+def job_dir(session):
+    """Neuer, leerer Ordner für einen Export der Session (vorher Session-Quote durchsetzen)"""
+    enforce_session_quota(session)
+    path = os.path.join(session_dir(session), uuid.uuid4().hex[:12])
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def _job_dirs(session_path):
+    """[(mtime, pfad, bytes)] der Job-Ordner einer Session"""
+    result = []
+    try:
+        entries = list(os.scandir(session_path))
+    except OSError:
+        return result
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            result.append((mtime, entry.path, _dir_size(entry.path)))
+    return result
+
+
+def _remove(path):
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def discard(path):
+    """Job-Ordner einer Datei (oder den Ordner selbst) löschen, z.B. wenn der Job entfernt wird"""
+    if not path:
+        return
+    directory = os.path.realpath(path if os.path.isdir(path) else os.path.dirname(path))
+    # Nur Job-Ordner (<ROOT>/<session>/<job>) löschen, nie Session oder ROOT selbst
+    if os.path.dirname(os.path.dirname(directory)) == os.path.realpath(ROOT):
+        _remove(directory)
+
+
+def enforce_session_quota(session, now=None):
+    """Älteste Job-Ordner der Session löschen, bis sie unter SESSION_QUOTA liegt"""
+    now = now or time.time()
+    dirs = sorted(_job_dirs(session_dir(session)))
+    total = sum(size for _, _, size in dirs)
+    freed = 0
+    for mtime, path, size in dirs:
+        if total - freed <= SESSION_QUOTA:
+            break
+        if now - mtime < GRACE:
+            continue
+        _remove(path)
+        freed += size
+    if freed:
+        log.info("Session %s: %.1f MB Exporte verworfen (Quote %.0f MB)", session, freed / MB, SESSION_QUOTA / MB)
+    return freed
+
+
+def _remove_loose_files(path, now):
+    """Einzelne Dateien (altes Layout ohne Job-Ordner) nach MAX_AGE löschen"""
+    removed, freed = 0, 0
+    try:
+        entries = [e for e in os.scandir(path) if e.is_file(follow_symlinks=False)]
+    except OSError:
+        return removed, freed
+    for entry in entries:
+        try:
+            st = entry.stat(follow_symlinks=False)
+            if now - st.st_mtime > MAX_AGE:
+                os.remove(entry.path)
+                removed, freed = removed + 1, freed + st.st_size
+        except OSError:
+            pass
+    return removed, freed
+
+
+def sweep(now=None):
+    """
+    Aufräumen: Job-Ordner älter als MAX_AGE löschen, dann die ältesten, bis
+    die Summe unter TOTAL_QUOTA liegt; leere Session-Ordner entfernen.
+    Liefert (gelöschte Ordner, freigegebene Bytes).
+    """
+    global _last_sweep
+    now = now or time.time()
+    removed, freed = _remove_loose_files(ROOT, now)
+    keep = []
+    try:
+        sessions = [e.path for e in os.scandir(ROOT) if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        sessions = []
+    for session_path in sessions:
+        n, size = _remove_loose_files(session_path, now)
+        removed, freed = removed + n, freed + size
+        for mtime, path, size in _job_dirs(session_path):
+            if now - mtime > MAX_AGE:
+                _remove(path)
+                removed, freed = removed + 1, freed + size
+            else:
+                keep.append((mtime, path, size))
+    total = sum(size for _, _, size in keep)
+    for mtime, path, size in sorted(keep):
+        if total <= TOTAL_QUOTA:
+            break
+        if now - mtime < GRACE:
+            continue
+        _remove(path)
+        total -= size
+        removed, freed = removed + 1, freed + size
+    if total > TOTAL_QUOTA:
+        log.warning("Ausgabeordner %.0f MB über Quote %.0f MB, nur laufende Exporte übrig",
+                    total / MB, TOTAL_QUOTA / MB)
+    for session_path in sessions:
+        try:
+            os.rmdir(session_path)  # nur wenn leer
+        except OSError:
+            pass
+    with _lock:
+        _last_sweep = (now, removed, freed)
+    if removed:
+        log.info("Ausgabeordner aufgeräumt: %d Exporte, %.1f MB", removed, freed / MB)
+    return removed, freed
+
+
+def usage():
+    """(Bytes, Job-Ordner, Sessions) im Ausgabeordner"""
+    total, jobs, sessions = 0, 0, 0
+    try:
+        entries = [e.path for e in os.scandir(ROOT) if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        entries = []
+    for session_path in entries:
+        dirs = _job_dirs(session_path)
+        sessions += 1
+        jobs += len(dirs)
+        total += sum(size for _, _, size in dirs)
+    return total, jobs, sessions
+
+
+def last_sweep():
+    with _lock:
+        return _last_sweep
+
+
+def _janitor_loop(interval, tasks):
+    while True:
+        try:
+            sweep()
+        except Exception as e:
+            log.warning("Aufräumen des Ausgabeordners fehlgeschlagen: %s", e)
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                log.warning("Aufräumen (%s) fehlgeschlagen: %s", getattr(task, "__qualname__", task), e)
+        time.sleep(interval)
+
+
+def start_janitor(interval=JANITOR_INTERVAL, tasks=()):
+    """
+    Aufräum-Thread einmal pro Prozess starten (erster Lauf sofort); tasks:
+    weitere Aufräum-Funktionen, die bei jedem Lauf nach sweep() laufen
+    (z.B. export_history.history.collect)
+    """
+    global _janitor
+    with _lock:
+        if _janitor is not None or interval <= 0:
+            return False
+        os.makedirs(ROOT, exist_ok=True)
+        _janitor = threading.Thread(target=_janitor_loop, args=(interval, tuple(tasks)), name="toris-janitor", daemon=True)
+        _janitor.start()
+    return True
+
+
+def main():
+    removed, freed = sweep()
+    total, jobs, sessions = usage()
+    print(f"{ROOT}: {total / MB:.1f} MB in {jobs} Exporten, {sessions} Sessions "
+          f"(aufgeräumt: {removed} Exporte, {freed / MB:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
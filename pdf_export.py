@@ -7,8 +7,16 @@
 # - pdf_nat.py - National style with flags (German)
 #
 import os
-import importlib.util
-import shutil
+
+import export_metrics
+import template_bundle
+import template_manifest
+from app_logging import get_logger
+from render_context import RenderContext
+
+log = get_logger(__name__)
+
+export_metrics.instrument_reportlab()
 
 TEMPLATES_DIR = os.path.join("templates", "pdf")
 OUTPUT_DIR = "Ausgabe"  # Einheitlicher Ausgabeordner
@@ -74,10 +82,10 @@ def _get_competition_logo_path(starterlist: dict, username: str = None) -> str:
     if not comp_number:
         fallback_path = _find_logo_file(logo_dir, "logo")
         if fallback_path:
-            print(f"PDF DEBUG: Verwende Standard-Logo: {fallback_path}")
+            log.debug("Verwende Standard-Logo: %s", fallback_path)
             return fallback_path
         else:
-            print("PDF DEBUG: Kein Standard-Logo gefunden, ohne Logo fortfahren")
+            log.debug("Kein Standard-Logo gefunden, ohne Logo fortfahren")
             return None
 
     try:
@@ -96,18 +104,18 @@ def _get_competition_logo_path(starterlist: dict, username: str = None) -> str:
     logo_basename = f"{comp_formatted}{div_formatted}"
     logo_path = _find_logo_file(logo_dir, logo_basename)
 
-    print(f"PDF DEBUG: Suche Logo: {logo_dir}/{logo_basename}.*")
+    log.debug("Suche Logo: %s/%s.*", logo_dir, logo_basename)
 
     if logo_path:
-        print(f"PDF DEBUG: Prüfungsspezifisches Logo gefunden: {logo_path}")
+        log.debug("Prüfungsspezifisches Logo gefunden: %s", logo_path)
         return logo_path
     else:
         fallback_path = _find_logo_file(logo_dir, "logo")
         if fallback_path:
-            print(f"PDF DEBUG: Verwende Standard-Logo: {fallback_path}")
+            log.debug("Verwende Standard-Logo: %s", fallback_path)
             return fallback_path
         else:
-            print("PDF DEBUG: Kein Logo gefunden, ohne Logo fortfahren")
+            log.debug("Kein Logo gefunden, ohne Logo fortfahren")
             return None
 
 def _get_banner_sponsor_paths(username: str = None) -> dict:
@@ -129,7 +137,7 @@ def _get_banner_sponsor_paths(username: str = None) -> dict:
             found = _find_logo_file("logos", basename)
         if found:
             result[key] = found
-            print(f"PDF DEBUG: {key} = {found}")
+            log.debug("%s = %s", key, found)
     return result
     """
     Ermittelt den Pfad zum prüfungsspezifischen Logo basierend auf XXY-Schema
@@ -142,10 +150,10 @@ def _get_banner_sponsor_paths(username: str = None) -> dict:
     if not comp_number:
         fallback_path = _find_logo_file("logos", "logo")
         if fallback_path:
-            print(f"PDF DEBUG: Verwende Standard-Logo: {fallback_path}")
+            log.debug("Verwende Standard-Logo: %s", fallback_path)
             return fallback_path
         else:
-            print("PDF DEBUG: Kein Standard-Logo gefunden, ohne Logo fortfahren")
+            log.debug("Kein Standard-Logo gefunden, ohne Logo fortfahren")
             return None
 
     try:
@@ -164,20 +172,29 @@ def _get_banner_sponsor_paths(username: str = None) -> dict:
     logo_basename = f"{comp_formatted}{div_formatted}"
     logo_path = _find_logo_file("logos", logo_basename)
 
-    print(f"PDF DEBUG: Suche Logo: logos/{logo_basename}.*")
+    log.debug("Suche Logo: logos/%s.*", logo_basename)
 
     if logo_path:
-        print(f"PDF DEBUG: Prüfungsspezifisches Logo gefunden: {logo_path}")
+        log.debug("Prüfungsspezifisches Logo gefunden: %s", logo_path)
         return logo_path
     else:
         fallback_path = _find_logo_file("logos", "logo")
         if fallback_path:
-            print(f"PDF DEBUG: Verwende Standard-Logo: {fallback_path}")
+            log.debug("Verwende Standard-Logo: %s", fallback_path)
             return fallback_path
         else:
-            print("PDF DEBUG: Kein Logo gefunden, ohne Logo fortfahren")
+            log.debug("Kein Logo gefunden, ohne Logo fortfahren")
             return None
 
+def preload_template(template_name: str):
+    """
+    Template einmal laden (Warm-up): Bytecode wird nach __pycache__
+    geschrieben, die vom Template genutzten reportlab-Module sind danach
+    importiert. Das Modul selbst wird verworfen.
+    """
+    template_path = os.path.join(TEMPLATES_DIR, _find_template_file(template_name))
+    template_bundle.exec_template("pdf_template_module", template_path)
+
 def create_pdf(starterlist: dict, filename: str, template_name: str, spacing_top_cm: float = 0, spacing_bottom_cm: float = 0, logo_max_width_cm: float = 5.0, print_options: dict = None, output_dir: str = None, username: str = None):
     """
     Lädt das angegebene Template-Modul aus templates/pdf und ruft dessen render(starterlist, filename) auf.
@@ -200,43 +217,33 @@ def create_pdf(starterlist: dict, filename: str, template_name: str, spacing_top
     # Vollständigen Pfad für Ausgabedatei erstellen
     output_path = os.path.join(target_dir, filename)
 
-    # Prüfungsspezifisches Logo ermitteln
-    logo_path = _get_competition_logo_path(starterlist, username=username)
-
-    # Starterlist um Logo-Information erweitern (nur wenn Logo vorhanden)
-    enhanced_starterlist = starterlist.copy()
+    export_metrics.tag(template=template_name, starters=len(starterlist.get("starters") or []))
+
+    # Prüfungsspezifisches Logo, Banner und Sponsorenleiste ermitteln
+    with export_metrics.span("assets"):
+        logo_path = _get_competition_logo_path(starterlist, username=username)
+        banner_sponsor = _get_banner_sponsor_paths(username=username)
+
+    # Alles für das Template in einem Kontext (eigene Kopien pro Export)
+    context = RenderContext(
+        print_options,
+        banner_path=banner_sponsor.get("bannerPath", ""),
+        sponsor_path=banner_sponsor.get("sponsorPath", ""),
+        logo_path=logo_path,
+        locale=template_manifest.info("pdf", template_name)["language"],
+        username=username,
+    )
+    enhanced_starterlist = context.apply(starterlist)
     if logo_path:
         enhanced_starterlist["logoPath"] = logo_path
-        print(f"PDF DEBUG: Logo-Pfad hinzugefügt: {logo_path}")
+        log.debug("Logo-Pfad hinzugefügt: %s", logo_path)
     else:
-        print("PDF DEBUG: Kein Logo verfügbar, ohne Logo fortfahren")
-
-    # Banner und Sponsorenleiste Pfade ermitteln
-    banner_sponsor = _get_banner_sponsor_paths(username=username)
-    enhanced_starterlist.update(banner_sponsor)
+        log.debug("Kein Logo verfügbar, ohne Logo fortfahren")
     enhanced_starterlist["spacingTopCm"] = spacing_top_cm
     enhanced_starterlist["spacingBottomCm"] = spacing_bottom_cm
     if spacing_top_cm > 0 or spacing_bottom_cm > 0:
-        print(f"PDF DEBUG: Abstände: Oben={spacing_top_cm}cm, Unten={spacing_bottom_cm}cm")
-
-    # Druckoptionen in starterlist einfügen
-    if print_options:
-        enhanced_starterlist["printOptions"] = print_options
-        print(f"PDF DEBUG: Druckoptionen: {print_options}")
-    else:
-        enhanced_starterlist["printOptions"] = {
-            "sponsor_top": False,
-            "sponsor_bottom": False,
-            "single_sided": False,
-            "show_banner": True,
-            "show_sponsor_bar": True,
-            "show_title": True,
-            "show_header": True,
-        }
-
-    # Banner/Sponsor Pfade in printOptions eintragen (nach printOptions-Block!)
-    enhanced_starterlist["printOptions"]["bannerPath"]  = banner_sponsor.get("bannerPath",  "")
-    enhanced_starterlist["printOptions"]["sponsorPath"] = banner_sponsor.get("sponsorPath", "")
+        log.debug("Abstände: Oben=%scm, Unten=%scm", spacing_top_cm, spacing_bottom_cm)
+    log.debug("Druckoptionen: %s", enhanced_starterlist["printOptions"])
     
     try:
         template_file = _find_template_file(template_name)
@@ -245,45 +252,23 @@ def create_pdf(starterlist: dict, filename: str, template_name: str, spacing_top
 
     template_path = os.path.join(TEMPLATES_DIR, template_file)
 
-    # dynamisch importieren
-    spec = importlib.util.spec_from_file_location("pdf_template_module", template_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    # dynamisch importieren (Bytecode aus dem Bundle, wenn aktuell)
+    with export_metrics.span("template_load"):
+        module = template_bundle.exec_template("pdf_template_module", template_path)
 
     if not hasattr(module, "render"):
         raise AttributeError(f"Template {template_file} hat keine Funktion render(starterlist, filename)")
 
-    # Banner und Sponsorenleiste: User-Dateien temporär nach logos/ kopieren
-    import shutil
-    _temp_copies = {}  # {ziel_pfad: backup_pfad oder None}
-    for src_key, dest_name in [("bannerPath", "banner.png"), ("sponsorPath", "sponsorenleiste.png")]:
-        src = banner_sponsor.get(src_key, "")
-        dest = os.path.join("logos", dest_name)
-        if src and os.path.exists(src) and os.path.abspath(src) != os.path.abspath(dest):
-            # Backup falls bereits eine Datei da ist
-            if os.path.exists(dest):
-                backup = dest + ".bak"
-                shutil.copy2(dest, backup)
-                _temp_copies[dest] = backup
-            else:
-                _temp_copies[dest] = None
-            shutil.copy2(src, dest)
-            print(f"PDF DEBUG: Temporär kopiert: {src} → {dest}")
-
+    # Banner und Sponsorenleiste liest das Template aus printOptions (bannerPath/sponsorPath)
     try:
-        module.render(enhanced_starterlist, output_path, logo_max_width_cm=logo_max_width_cm)
-        print(f"PDF DEBUG: Template mit logo_max_width_cm={logo_max_width_cm}cm aufgerufen")
+        with export_metrics.span("render"):
+            module.render(enhanced_starterlist, output_path, logo_max_width_cm=logo_max_width_cm)
+        log.debug("Template mit logo_max_width_cm=%scm aufgerufen", logo_max_width_cm)
     except TypeError:
-        module.render(enhanced_starterlist, output_path)
-        print(f"PDF DEBUG: Template ohne logo_max_width_cm Parameter (alte Version)")
-    finally:
-        # Temporäre Kopien rückgängig machen
-        for dest, backup in _temp_copies.items():
-            try:
-                os.remove(dest)
-                if backup and os.path.exists(backup):
-                    shutil.move(backup, dest)
-            except:
-                pass
+        with export_metrics.span("render"):
+            module.render(enhanced_starterlist, output_path)
+        log.debug("Template ohne logo_max_width_cm Parameter (alte Version)")
 
+    if export_metrics.current() is not None:
+        export_metrics.tag(pages=export_metrics.count_pdf_pages(output_path), bytes=os.path.getsize(output_path))
     return output_path
\ No newline at end of file
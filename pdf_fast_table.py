@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+# pdf_fast_table.py
+#
+# Schneller Tabellen-Renderer für Layouts mit festem Raster
+# (Hinderniskarte, _kurz-Listen).
+#
+# Statt platypus-Table + Paragraph (volles Umbrechen, Splitten, repeatRows)
+# werden die Zeilenhöhen hier einmalig selbst berechnet und die Zellen direkt
+# auf den reportlab-Canvas gezeichnet. Seitenumbrüche ergeben sich aus den
+# vorberechneten Höhen, die Kopfzeile wird auf jeder Seite wiederholt.
+#
+# Zellinhalt: Liste von Zeilen, jede Zeile ist eine Liste von Runs
+# (text, fontName, fontSize). Lange Zeilen werden wortweise umgebrochen,
+# Wörter breiter als die Spalte zeichenweise (wie splitLongWords bei
+# Paragraph). Mit leading= bekommt eine Zelle denselben Zeilenabstand wie der
+# ParagraphStyle im platypus-Pfad, damit beide Wege gleich paginieren.
+# Eine Zeile, die höher als eine ganze Seite ist, wird abgeschnitten statt
+# einen LayoutError auszulösen.
+# FastCell.markup() versteht die in den Templates genutzte Paragraph-Teilmenge
+# (<b>, <i>, <br/>, <font size=..>), damit bestehende Zeilentexte ohne Umbau
+# übernommen werden können. Durchstreichen gilt zeilenweise (FastRow.strike).
+#
+import re
+from html import unescape
+
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+LEADING_FACTOR = 1.15
+
+_TAG_RE  = re.compile(r"(<[^>]+>)")
+_SIZE_RE = re.compile(r"""size\s*=\s*["']?([\d.]+)""")
+
+
+def run(text, font="Helvetica", size=8):
+    """Ein Text-Run: (text, fontName, fontSize)"""
+    return (str(text) if text is not None else "", font, size)
+
+
+def _font_name(family, bold, italic):
+    if bold and italic:
+        return f"{family}-BoldOblique"
+    if bold:
+        return f"{family}-Bold"
+    if italic:
+        return f"{family}-Oblique"
+    return family
+
+
+def markup_lines(html, font="Helvetica", size=8):
+    """
+    Wandelt Paragraph-Markup (<b>, <i>, <br/>, <font size=..>) in Zeilen aus Runs um.
+    Unbekannte Tags werden ignoriert.
+    """
+    family = font.split("-")[0]
+    bold = font.endswith("-Bold") or font.endswith("-BoldOblique")
+    italic = font.endswith("Oblique")
+    sizes = [size]
+    lines = [[]]
+    for token in _TAG_RE.split(str(html)):
+        if not token:
+            continue
+        if token.startswith("<"):
+            tag = token[1:-1].strip().lower()
+            if tag.startswith("br"):
+                lines.append([])
+            elif tag == "b":
+                bold = True
+            elif tag == "/b":
+                bold = font.endswith("-Bold")
+            elif tag == "i":
+                italic = True
+            elif tag == "/i":
+                italic = font.endswith("Oblique")
+            elif tag.startswith("font"):
+                m = _SIZE_RE.search(tag)
+                sizes.append(float(m.group(1)) if m else sizes[-1])
+            elif tag == "/font" and len(sizes) > 1:
+                sizes.pop()
+            continue
+        text = unescape(token.replace("&nbsp;", " "))
+        lines[-1].append((text, _font_name(family, bold, italic), sizes[-1]))
+    return [l for l in lines if l] if any(lines) else []
+
+
+class FastCell:
+    """
+    Zelle: Zeilen aus Runs, Ausrichtung und optionales Bild über dem Text.
+    leading: fester Zeilenabstand in pt (wie ParagraphStyle.leading);
+    None = größte Schrift der Zeile * LEADING_FACTOR.
+    """
+    __slots__ = ("lines", "align", "image", "leading")
+
+    def __init__(self, lines=None, align="LEFT", image=None, leading=None):
+        self.lines = lines or []
+        self.align = align
+        self.image = image  # (pfad, breite, höhe) oder None
+        self.leading = leading
+
+    @classmethod
+    def text(cls, text, font="Helvetica", size=8, align="LEFT", leading=None):
+        """Zelle mit einfachem Text; '\\n' erzeugt neue Zeilen"""
+        if text is None or text == "":
+            return cls(align=align, leading=leading)
+        return cls([[run(part, font, size)] for part in str(text).split("\n")], align=align, leading=leading)
+
+    @classmethod
+    def markup(cls, html, font="Helvetica", size=8, align="LEFT", leading=None):
+        """Zelle aus Paragraph-Markup, wie es die Templates für Paragraph() aufbauen"""
+        if html is None or html == "":
+            return cls(align=align, leading=leading)
+        return cls(markup_lines(html, font, size), align=align, leading=leading)
+
+
+class FastRow:
+    """Tabellenzeile mit Hintergrund, Textfarbe, Durchstreichen und optionalem SPAN"""
+    __slots__ = ("cells", "background", "text_color", "strike", "span")
+
+    def __init__(self, cells, background=None, text_color=colors.black, strike=False, span=False):
+        self.cells = cells
+        self.background = background
+        self.text_color = text_color
+        self.strike = strike
+        self.span = span
+
+
+def _split_word(word, font, size, first_width, max_width):
+    """
+    Zerlegt ein Wort zeichenweise in Stücke: das erste passt in first_width
+    (Rest der aktuellen Zeile), die weiteren in max_width. Wie _splitWord in
+    reportlab: passt schon das erste Zeichen nicht mehr, ist das erste Stück leer.
+    """
+    pieces = []
+    piece = ""
+    avail = first_width
+    for ch in word:
+        cw = stringWidth(ch, font, size)
+        width = stringWidth(piece, font, size)
+        if width + cw > avail and (piece or cw <= max_width):
+            pieces.append(piece)
+            piece, avail = "", max_width
+        piece += ch
+    pieces.append(piece)
+    return pieces
+
+
+def _wrap_runs(runs, max_width, leading=None):
+    """
+    Bricht eine Zeile aus Runs wortweise auf max_width um; Wörter, die allein
+    breiter als max_width sind, werden zeichenweise geteilt.
+    Gibt Liste von (segmente, breite, leading, schriftgröße) zurück;
+    segmente = [(text, font, size, x)].
+    """
+    words = []
+    for text, font, size in runs:
+        if not text:
+            continue
+        parts = text.split(" ")
+        for i, part in enumerate(parts):
+            # Leerzeichen zwischen Runs bleiben am Wortende erhalten
+            suffix = " " if i < len(parts) - 1 else ""
+            if part or suffix:
+                words.append((part + suffix, font, size))
+
+    lines = []
+    segs = []
+    x = 0.0
+    max_size = 0
+
+    def new_line():
+        nonlocal segs, x, max_size
+        lines.append((segs, x, leading or max_size * LEADING_FACTOR, max_size))
+        segs, x, max_size = [], 0.0, 0
+
+    def add(text, font, size):
+        nonlocal x, max_size
+        if segs and segs[-1][1] == font and segs[-1][2] == size:
+            prev, _, _, sx = segs[-1]
+            segs[-1] = (prev + text, font, size, sx)
+        else:
+            segs.append((text, font, size, x))
+        x += stringWidth(text, font, size)
+        max_size = max(max_size, size)
+
+    for word, font, size in words:
+        bare = word.rstrip(" ")
+        trimmed_w = stringWidth(bare, font, size)
+        if trimmed_w > max_width:
+            # Langes Wort: Rest der Zeile auffüllen, dann zeichenweise weiter
+            pieces = _split_word(bare, font, size, max_width - x, max_width)
+            for i, piece in enumerate(pieces):
+                if i:
+                    new_line()
+                if piece:
+                    add(piece, font, size)
+                max_size = max(max_size, size)
+            if word != bare:
+                add(" ", font, size)
+            continue
+        if segs and x + trimmed_w > max_width:
+            new_line()
+            word = word.lstrip(" ")
+        add(word, font, size)
+    if segs:
+        new_line()
+    elif runs:
+        size = max(r[2] for r in runs)
+        lines.append(([], 0.0, leading or size * LEADING_FACTOR, size))
+    return lines
+
+
+class FastTable(Flowable):
+    """
+    Tabelle, die direkt auf den Canvas zeichnet.
+
+    col_widths:  Spaltenbreiten in pt
+    rows:        Liste von FastRow, die ersten header_rows Zeilen sind Kopfzeilen
+    padding:     (oben, rechts, unten, links) in pt
+    grid:        "grid"  = volles Gitter (wie TableStyle GRID)
+                 "below" = nur Linie unter jeder Zeile (wie LINEBELOW)
+    """
+
+    def __init__(self, col_widths, rows, header_rows=1, padding=(3, 6, 3, 6),
+                 grid="grid", line_width=0.25, line_color=colors.black, _layout=None):
+        Flowable.__init__(self)
+        self.col_widths = list(col_widths)
+        self.header_rows = header_rows
+        self.padding = padding
+        self.grid = grid
+        self.line_width = line_width
+        self.line_color = line_color
+        self.width = sum(self.col_widths)
+        if _layout is None:
+            _layout = [(r, *self._layout_row(r)) for r in rows]
+        # _layout: Liste von (row, höhe, umgebrochene_zellen) - einmalig berechnet
+        self._layout = _layout
+        self.height = sum(h for _, h, _ in _layout)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _layout_row(self, row):
+        pad_top, pad_right, pad_bottom, pad_left = self.padding
+        if row.span:
+            widths = [self.width]
+        else:
+            widths = self.col_widths
+        laid = []
+        content_h = 0.0
+        for cell, col_w in zip(row.cells, widths):
+            avail = max(col_w - pad_left - pad_right, 1)
+            lines = []
+            for line_runs in cell.lines:
+                lines.extend(_wrap_runs(line_runs, avail, cell.leading))
+            h = sum(l[2] for l in lines)
+            if cell.image:
+                h += cell.image[2]
+            laid.append(lines)
+            content_h = max(content_h, h)
+        return content_h + pad_top + pad_bottom, laid
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        header = self._layout[:self.header_rows]
+        body = self._layout[self.header_rows:]
+        used = sum(h for _, h, _ in header)
+        k = 0
+        for _, h, _ in body:
+            if used + h > availHeight:
+                break
+            used += h
+            k += 1
+        if k == len(body):
+            return [self]
+        if k == 0:
+            frame = getattr(self, "_frame", None)
+            if not body or frame is None or not frame._atTop:
+                return []
+            # Zeile höher als eine ganze Seite: abschneiden statt LayoutError
+            row, h, laid = body[0]
+            clipped = max(availHeight - used, 0)
+            log.warning("Tabellenzeile %.0f pt hoch, Platz %.0f pt - wird abgeschnitten", h, clipped)
+            parts = [self._clone(header + [(row, clipped, laid)])]
+            if len(body) > 1:
+                parts.append(self._clone(header + body[1:]))
+            return parts
+        return [self._clone(header + body[:k]), self._clone(header + body[k:])]
+
+    def _clone(self, layout):
+        return FastTable(self.col_widths, None, header_rows=self.header_rows,
+                         padding=self.padding, grid=self.grid, line_width=self.line_width,
+                         line_color=self.line_color, _layout=layout)
+
+    # ------------------------------------------------------------------
+    # Zeichnen
+    # ------------------------------------------------------------------
+
+    def draw(self):
+        c = self.canv
+        pad_top, pad_right, pad_bottom, pad_left = self.padding
+        c.saveState()
+        # Auf die Zeilenhöhen beschränken (abgeschnittene Zeilen, s. split)
+        clip = c.beginPath()
+        lw = self.line_width
+        clip.rect(-lw, -lw, self.width + 2 * lw, self.height + 2 * lw)
+        c.clipPath(clip, stroke=0, fill=0)
+        c.setLineWidth(self.line_width)
+        c.setStrokeColor(self.line_color)
+
+        y_top = self.height
+        for row, row_h, laid in self._layout:
+            y_bottom = y_top - row_h
+            if row.background is not None:
+                c.setFillColor(row.background)
+                c.rect(0, y_bottom, self.width, row_h, stroke=0, fill=1)
+
+            widths = [self.width] if row.span else self.col_widths
+            x = 0.0
+            for cell, lines, col_w in zip(row.cells, laid, widths):
+                self._draw_cell(c, row, cell, lines, x, y_top, col_w)
+                x += col_w
+
+            # Linien
+            if self.grid == "grid":
+                c.line(0, y_bottom, self.width, y_bottom)
+                if not row.span:
+                    x = 0.0
+                    for col_w in self.col_widths[:-1]:
+                        x += col_w
+                        c.line(x, y_bottom, x, y_top)
+            else:
+                c.line(0, y_bottom, self.width, y_bottom)
+            y_top = y_bottom
+
+        if self.grid == "grid":
+            c.rect(0, 0, self.width, self.height, stroke=1, fill=0)
+        c.restoreState()
+
+    def _draw_cell(self, c, row, cell, lines, x, y_top, col_w):
+        pad_top, pad_right, pad_bottom, pad_left = self.padding
+        inner_w = col_w - pad_left - pad_right
+        y = y_top - pad_top
+
+        if cell.image:
+            path, img_w, img_h = cell.image
+            if cell.align == "CENTER":
+                img_x = x + pad_left + (inner_w - img_w) / 2
+            else:
+                img_x = x + pad_left
+            try:
+                c.drawImage(path, img_x, y - img_h, width=img_w, height=img_h, mask='auto')
+            except Exception:
+                pass
+            y -= img_h
+
+        c.setFillColor(row.text_color)
+        c.setStrokeColor(row.text_color)
+        for segs, line_w, leading, line_size in lines:
+            # Grundlinie wie bei Paragraph: Schriftgröße unter der Zeilenoberkante
+            baseline = y - line_size
+            if cell.align == "CENTER":
+                lx = x + pad_left + (inner_w - line_w) / 2
+            elif cell.align == "RIGHT":
+                lx = x + pad_left + inner_w - line_w
+            else:
+                lx = x + pad_left
+            for text, font, size, sx in segs:
+                c.setFont(font, size)
+                c.drawString(lx + sx, baseline, text)
+            if row.strike and segs:
+                strike_y = baseline + max(s[2] for s in segs) * 0.3
+                c.line(lx, strike_y, lx + line_w, strike_y)
+            y -= leading
+        c.setStrokeColor(self.line_color)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# pdf_table_chunks.py
+#
+# Seitenweiser Tabellenaufbau für lange Starterlisten.
+#
+# Eine einzige reportlab-Table über die ganze Liste wird vorab komplett
+# vermessen und bei jedem Seitenumbruch samt Restzeilen und allen
+# TableStyle-Befehlen kopiert und gefiltert - bei 250+ Startern wächst der
+# Aufwand mit jeder Seite.
+#
+# ChunkedTable verhält sich für die Templates wie Table (gleicher Konstruktor,
+# setStyle), baut aber pro Seite nur ein "Fenster" aus Kopfzeile(n) und den
+# nächsten Zeilen, die auf die Seite passen können. Die Fenstergröße wird aus
+# den gemessenen Zeilenhöhen der vorherigen Seite geschätzt. Jede Zeile wird
+# nur einmal vermessen (Höhen-Cache über alle Fenster), die TableStyle-Befehle
+# werden einmalig nach Zeilen indiziert und je Fenster umnummeriert.
+#
+from reportlab.platypus import Flowable, Table, TableStyle
+
+# Startgröße des ersten Fensters (Zeilen), bevor Zeilenhöhen bekannt sind
+INITIAL_WINDOW_ROWS = 40
+
+# Sicherheitszuschlag auf die geschätzte Zeilenzahl pro Seite
+WINDOW_MARGIN = 1.2
+
+
+class _StyleIndex:
+    """
+    TableStyle-Befehle, einmalig aufgelöst:
+    Einzelzeilen-Befehle nach Zeile gruppiert, Bereichs-Befehle als Liste.
+    """
+
+    def __init__(self, commands, n_rows):
+        self.by_row = {}
+        self.ranges = []
+        self.passthrough = []
+        for seq, cmd in enumerate(commands):
+            cmd = tuple(cmd)
+            (c0, r0), (c1, r1) = cmd[1], cmd[2]
+            if isinstance(r0, str) or isinstance(r1, str):
+                # splitfirst/splitlast o.ä. - unverändert durchreichen
+                self.passthrough.append((seq, cmd))
+                continue
+            if r0 < 0:
+                r0 += n_rows
+            if r1 < 0:
+                r1 += n_rows
+            if r0 > r1:
+                r0, r1 = r1, r0
+            if r0 == r1:
+                self.by_row.setdefault(r0, []).append((seq, cmd))
+            else:
+                self.ranges.append((seq, cmd, r0, r1))
+
+    def window_commands(self, repeat_rows, start, count):
+        """
+        Befehle für ein Fenster aus Kopfzeilen [0, repeat_rows) und
+        Datenzeilen [start, start+count), umnummeriert auf Fensterzeilen.
+        """
+        end = start + count - 1
+        out = list(self.passthrough)
+
+        def mapped(r):
+            return r if r < repeat_rows else r - start + repeat_rows
+
+        for seq, cmd, r0, r1 in self.ranges:
+            op, (c0, _), (c1, _) = cmd[0], cmd[1], cmd[2]
+            args = cmd[3:]
+            head = (r0, min(r1, repeat_rows - 1)) if r0 < repeat_rows else None
+            body = (max(r0, start), min(r1, end)) if r1 >= start and r0 <= end else None
+            if op == "ROWBACKGROUNDS":
+                # Farbzyklus bezieht sich auf den Bereichsanfang
+                for part in (head, body):
+                    if part and part[0] <= part[1]:
+                        cycle = list(args[0])
+                        shift = (part[0] - r0) % len(cycle) if cycle else 0
+                        out.append((seq, (op, (c0, mapped(part[0])), (c1, mapped(part[1])),
+                                          cycle[shift:] + cycle[:shift]) + tuple(args[1:])))
+                continue
+            if head and body and head[1] == repeat_rows - 1 and body[0] == start:
+                # Bereich läuft durch Kopf und Fensteranfang -> zusammenhängend lassen
+                out.append((seq, (op, (c0, head[0]), (c1, mapped(body[1]))) + args))
+                continue
+            for part in (head, body):
+                if part and part[0] <= part[1]:
+                    out.append((seq, (op, (c0, mapped(part[0])), (c1, mapped(part[1]))) + args))
+
+        rows = list(range(repeat_rows)) + list(range(start, end + 1))
+        for r in rows:
+            for seq, cmd in self.by_row.get(r, ()):
+                m = mapped(r)
+                out.append((seq, (cmd[0], (cmd[1][0], m), (cmd[2][0], m)) + tuple(cmd[3:])))
+
+        out.sort(key=lambda x: x[0])
+        return [cmd for _, cmd in out]
+
+
+class ChunkedTable(Flowable):
+    """
+    Ersatz für Table(table_rows, colWidths=..., repeatRows=...) bei langen Listen.
+
+    Baut je Seite nur eine Table aus Kopfzeile(n) + passenden Zeilen;
+    der Rest wird als neue ChunkedTable an die nächste Seite weitergegeben.
+    """
+
+    def __init__(self, data, colWidths=None, repeatRows=1, style=None,
+                 _start=None, _window_rows=INITIAL_WINDOW_ROWS, _index=None, _heights=None):
+        Flowable.__init__(self)
+        self.hAlign = "CENTER"  # wie Table
+        self._data = data
+        self._col_widths = colWidths
+        self._repeat = repeatRows
+        self._start = repeatRows if _start is None else _start
+        self._window_rows = max(int(_window_rows), 1)
+        self._commands = []
+        self._index = _index
+        self._heights = {} if _heights is None else _heights  # Zeile -> gemessene Höhe
+        self._table = None
+        self._avail = None
+        if style is not None:
+            self.setStyle(style)
+
+    def setStyle(self, tblstyle):
+        if isinstance(tblstyle, TableStyle):
+            self._commands.extend(tblstyle.getCommands())
+        else:
+            self._commands.extend(tblstyle)
+        self._index = None
+
+    def _style_index(self):
+        if self._index is None:
+            self._index = _StyleIndex(self._commands, len(self._data))
+        return self._index
+
+    def _window_rows_idx(self, count):
+        return list(range(self._repeat)) + list(range(self._start, self._start + count))
+
+    def _window(self, count):
+        idx = self._window_rows_idx(count)
+        rows = [self._data[r] for r in idx]
+        heights = [self._heights.get(r) for r in idx]
+        cmds = self._style_index().window_commands(self._repeat, self._start, count)
+        return Table(rows, colWidths=self._col_widths, rowHeights=heights,
+                     repeatRows=self._repeat, style=TableStyle(cmds))
+
+    def _remember_heights(self, t, count):
+        for r, h in zip(self._window_rows_idx(count), t._rowHeights):
+            self._heights[r] = h
+
+    def wrap(self, availWidth, availHeight):
+        remaining = len(self._data) - self._start
+        count = min(self._window_rows, remaining)
+        while True:
+            t = self._window(count)
+            w, h = t.wrap(availWidth, availHeight)
+            self._remember_heights(t, count)
+            if h > availHeight or count >= remaining:
+                break
+            # Fenster passt komplett -> aus gemessenen Zeilenhöhen hochrechnen
+            heights = t._rowHeights
+            head_h = sum(heights[:self._repeat])
+            body_h = sum(heights[self._repeat:]) or 1
+            avg = body_h / max(count, 1)
+            estimate = int((availHeight - head_h) / avg * WINDOW_MARGIN) + 2
+            count = min(max(estimate, count * 2), remaining)
+        # Mit festen Höhen neu aufbauen, damit split() nicht erneut vermisst
+        self._table = self._window(count)
+        self._table.wrap(availWidth, availHeight)
+        self._avail = (availWidth, availHeight)
+        self.width, self.height = w, h
+        return w, h
+
+    def split(self, availWidth, availHeight):
+        if self._table is None or self._avail != (availWidth, availHeight):
+            self.wrap(availWidth, availHeight)
+        parts = self._table.split(availWidth, availHeight)
+        if not parts:
+            return []
+        first = parts[0]
+        used = len(first._cellvalues) - self._repeat
+        if used <= 0:
+            return []
+        if self._start + used >= len(self._data):
+            return [first]
+        rest = ChunkedTable(self._data, colWidths=self._col_widths, repeatRows=self._repeat,
+                            _start=self._start + used,
+                            _window_rows=used * WINDOW_MARGIN + 2,
+                            _index=self._style_index(), _heights=self._heights)
+        return [first, rest]
+
+    def draw(self):
+        self._table.drawOn(self.canv, 0, 0)
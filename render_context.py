@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# render_context.py
+#
+# Alles, was ein einzelner Export zum Rendern braucht, in einem Objekt.
+#
+# Bisher lief die Übergabe an die Templates teils über gemeinsamen Zustand:
+#   - Banner/Sponsorenleiste lasen die Templates aus festen Pfaden
+#     (logos/banner.png, logos/sponsorenleiste.png); User-Dateien wurden für
+#     die Dauer des Exports dorthin kopiert - ein paralleler Export eines
+#     anderen Users ohne eigene Dateien druckte dann das fremde Banner
+#   - die Canvas-Klassen bekamen die Druckoptionen als Klassenattribut
+#     (BannerCanvas._print_options = ...)
+#   - die print_options der App wurden beim Export verändert (bannerPath ...)
+#
+# Jetzt bauen create_pdf/create_word pro Export einen RenderContext und
+# geben daraus eine eigene Kopie der Starterliste an das Template; die
+# Templates holen Pfade mit asset_path(print_options, "banner.png") und
+# reichen die Optionen per canvas_maker(BannerCanvas, print_options) an die
+# Canvas-Instanz weiter. Kein Export verändert Dateien oder Modulzustand,
+# parallele Exporte in einem Prozess sind damit unabhängig.
+#
+import os
+from functools import partial
+
+LOGOS_DIR = "logos"
+
+# Dateiname im logos/-Ordner -> Schlüssel in printOptions
+ASSET_KEYS = {
+    "banner.png": "bannerPath",
+    "sponsorenleiste.png": "sponsorPath",
+}
+
+# Druckoptionen, wenn der Aufrufer keine übergibt
+DEFAULT_PRINT_OPTIONS = {
+    "sponsor_top": False,
+    "sponsor_bottom": False,
+    "single_sided": False,
+    "show_banner": True,
+    "show_sponsor_bar": True,
+    "show_title": True,
+    "show_header": True,
+}
+
+
+def asset_path(print_options, name):
+    """
+    Pfad für banner.png / sponsorenleiste.png eines Exports: die Datei aus
+    printOptions (User-Ordner), sonst wie bisher logos/<name>.
+    """
+    key = ASSET_KEYS.get(name)
+    path = (print_options or {}).get(key) if key else None
+    if path and os.path.exists(path):
+        return path
+    return os.path.join(LOGOS_DIR, name)
+
+
+def canvas_maker(canvas_class, print_options):
+    """canvasmaker für doc.build, der die Druckoptionen an die Canvas-Instanz übergibt"""
+    return partial(canvas_class, print_options=print_options)
+
+
+class RenderContext:
+    """Druckoptionen, Asset-Pfade und Sprache eines Exports"""
+
+    def __init__(self, print_options=None, banner_path="", sponsor_path="", logo_path=None,
+                 locale="de", username=None):
+        self.print_options = dict(print_options) if print_options else dict(DEFAULT_PRINT_OPTIONS)
+        self.banner_path = banner_path or ""
+        self.sponsor_path = sponsor_path or ""
+        self.logo_path = logo_path
+        self.locale = locale
+        self.username = username
+
+    def template_options(self):
+        """printOptions für das Template (Kopie, inkl. bannerPath/sponsorPath)"""
+        options = dict(self.print_options)
+        options["bannerPath"] = self.banner_path
+        options["sponsorPath"] = self.sponsor_path
+        return options
+
+    def asset(self, name):
+        return asset_path(self.template_options(), name)
+
+    def apply(self, starterlist):
+        """Kopie der Starterliste mit allem, was das Template aus dem Kontext liest"""
+        data = dict(starterlist)
+        if self.banner_path:
+            data["bannerPath"] = self.banner_path
+        if self.sponsor_path:
+            data["sponsorPath"] = self.sponsor_path
+        data["printOptions"] = self.template_options()
+        data["locale"] = self.locale
+        return data
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# starterlist_model.py
+#
+# Kompaktes Datenmodell für die Starterliste in der Session.
+#
+# Die API liefert verschachtelte Dicts; pro Session lagen diese bisher komplett
+# in st.session_state.starterlist und wurden bei jedem Export tief kopiert.
+# Hier werden Starter, Pferde, Reiter, Richter und Pausen als Klassen mit
+# __slots__ gehalten, häufig wiederholte Texte (Verein, Nation, Zuchtgebiet ...)
+# werden interniert.
+#
+# Nicht gesetzte Felder bleiben als Slot leer - so bleibt "Schlüssel fehlt" und
+# "Schlüssel ist None" unterscheidbar und to_api() liefert wieder dasselbe JSON.
+# Unbekannte Schlüssel wandern unverändert in .extra.
+#
+# Für Templates und Exporter gibt es weiterhin Dicts: Starterlist.to_api().
+# Das Export-Dict wird pro Modell nur einmal aufgebaut (kleiner prozessweiter
+# Cache) und von allen Exporten geteilt; ein KNr-Mapping wird als Overlay
+# angewendet - nur betroffene Starter/Pferde werden flach kopiert.
+# Templates dürfen die übergebenen Dicts daher nur lesen.
+#
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+from starterlist_view import build_view, VIEW_KEY
+
+# Anzahl Modelle, deren Export-Dict prozessweit vorgehalten wird
+EXPORT_CACHE_SIZE = 8
+
+_export_cache = OrderedDict()  # id(modell) -> (weakref(modell), export_dict)
+_export_lock = threading.Lock()
+
+
+class _Record:
+    """
+    Basis: FIELDS = ((attribut, api_schluessel), ...)
+    NESTED = {attribut: (Klasse, ist_liste)}, INTERN = Attribute mit internierten Texten
+    """
+    __slots__ = ("extra",)
+    FIELDS = ()
+    NESTED = {}
+    INTERN = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._BY_KEY = {key: attr for attr, key in cls.FIELDS}
+
+    @classmethod
+    def from_api(cls, data):
+        obj = cls.__new__(cls)
+        obj.extra = None
+        if not isinstance(data, dict):
+            return obj
+        by_key = cls._BY_KEY
+        for key, value in data.items():
+            attr = by_key.get(key)
+            if attr is None:
+                if obj.extra is None:
+                    obj.extra = {}
+                obj.extra[key] = value
+                continue
+            nested = cls.NESTED.get(attr)
+            if nested and value is not None:
+                klass, is_list = nested
+                if is_list:
+                    value = [klass.from_api(v) for v in value]
+                else:
+                    value = klass.from_api(value)
+            elif attr in cls.INTERN and type(value) is str:
+                value = sys.intern(value)
+            setattr(obj, attr, value)
+        return obj
+
+    def to_api(self):
+        out = {}
+        for attr, key in self.FIELDS:
+            try:
+                value = getattr(self, attr)
+            except AttributeError:
+                continue  # Schlüssel war in der API-Antwort nicht vorhanden
+            if attr in self.NESTED and value is not None:
+                if self.NESTED[attr][1]:
+                    value = [v.to_api() for v in value]
+                else:
+                    value = value.to_api()
+            out[key] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def get(self, key, default=None):
+        """Lesezugriff über den API-Schlüssel (wie dict.get)"""
+        attr = self._BY_KEY.get(key)
+        if attr is not None:
+            return getattr(self, attr, default)
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        attr = self._BY_KEY.get(key)
+        if attr is not None:
+            return hasattr(self, attr)
+        return bool(self.extra) and key in self.extra
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        attr = self._BY_KEY.get(key)
+        if attr is not None:
+            setattr(self, attr, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+
+class Horse(_Record):
+    FIELDS = (
+        ("name", "name"), ("cno", "cno"), ("fei_number", "feiNumber"),
+        ("breed", "breed"), ("studbook", "studbook"), ("breeding_season", "breedingSeason"),
+        ("color", "color"), ("sex", "sex"), ("sire", "sire"), ("dam_sire", "damSire"),
+        ("owner", "owner"), ("breeder", "breeder"),
+    )
+    __slots__ = tuple(a for a, _ in FIELDS)
+    INTERN = frozenset({"breed", "studbook", "color", "sex", "sire", "dam_sire", "owner", "breeder"})
+
+
+class Athlete(_Record):
+    FIELDS = (("name", "name"), ("club", "club"), ("nation", "nation"))
+    __slots__ = tuple(a for a, _ in FIELDS)
+    INTERN = frozenset({"club", "nation"})
+
+
+class Judge(_Record):
+    FIELDS = (("name", "name"), ("position", "position"), ("task", "task"))
+    __slots__ = tuple(a for a, _ in FIELDS)
+    INTERN = frozenset({"name", "position", "task"})
+
+
+class Break(_Record):
+    FIELDS = (
+        ("after_number", "afterNumberInCompetition"),
+        ("total_seconds", "totalSeconds"),
+        ("information_text", "informationText"),
+    )
+    __slots__ = tuple(a for a, _ in FIELDS)
+
+
+class Starter(_Record):
+    FIELDS = (
+        ("start_number", "startNumber"), ("back_number", "backNumber"),
+        ("start_time", "startTime"), ("group_number", "groupNumber"),
+        ("withdrawn", "withdrawn"), ("hors_concours", "horsConcours"),
+        ("team", "team"), ("team_number", "teamNumber"), ("team_starting_order", "teamStartingOrder"),
+        ("athlete", "athlete"), ("horses", "horses"),
+    )
+    __slots__ = tuple(a for a, _ in FIELDS)
+    NESTED = {"athlete": (Athlete, False), "horses": (Horse, True)}
+    INTERN = frozenset({"team"})
+
+
+class Starterlist(_Record):
+    FIELDS = (
+        ("show_number", "showNumber"), ("show_title", "showTitle"),
+        ("competition_number", "competitionNumber"), ("competition_title", "competitionTitle"),
+        ("division_number", "divisionNumber"), ("round_number", "roundNumber"),
+        ("subtitle", "subtitle"), ("information_text", "informationText"),
+        ("location", "location"), ("start", "start"), ("judging_rule", "judgingRule"),
+        ("publishing_status", "publishingStatus"),
+        ("judges", "judges"), ("breaks", "breaks"), ("starters", "starters"),
+    )
+    # view: normalisierte Zeilen (starterlist_view), ohne Verweise auf die Roh-Dicts;
+    # breaks_map wird beim Export aus den breaks neu aufgebaut
+    __slots__ = tuple(a for a, _ in FIELDS) + ("view", "__weakref__")
+    NESTED = {"judges": (Judge, True), "breaks": (Break, True), "starters": (Starter, True)}
+
+    @classmethod
+    def from_api(cls, data):
+        obj = super().from_api({k: v for k, v in data.items() if k != VIEW_KEY})
+        obj.view = build_view(data).detached()
+        return obj
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._drop_export()
+
+    def _drop_export(self):
+        with _export_lock:
+            _export_cache.pop(id(self), None)
+
+    def _export_base(self):
+        """Geteiltes Export-Dict (einmal aufgebaut, danach aus dem Cache)"""
+        key = id(self)
+        with _export_lock:
+            entry = _export_cache.get(key)
+            if entry is not None and entry[0]() is self:
+                _export_cache.move_to_end(key)
+                return entry[1]
+        base = super().to_api()
+        if self.view is not None:
+            base[VIEW_KEY] = self.view.rebind(base.get("starters") or [], base.get("breaks") or [])
+        with _export_lock:
+            _export_cache[key] = (weakref.ref(self), base)
+            _export_cache.move_to_end(key)
+            while len(_export_cache) > EXPORT_CACHE_SIZE:
+                _export_cache.popitem(last=False)
+        return base
+
+    def to_api(self, cno_map=None):
+        """
+        Starterliste als API-Dict für die Templates (nur lesen - Teile sind geteilt).
+        cno_map: optionales KNr-Mapping alt -> neu für horses[].cno, als Overlay
+        """
+        base = self._export_base()
+        out = dict(base)
+        if cno_map:
+            starters = _remap_cno(base.get("starters") or [], cno_map)
+            out["starters"] = starters
+            view = base.get(VIEW_KEY)
+            if view is not None:
+                out[VIEW_KEY] = view.rebind(starters)
+        return out
+
+
+def _remap_cno(starters, cno_map):
+    """
+    Neue Starter-Liste mit ersetzten KNr. Nur Starter mit betroffenen Pferden
+    werden (flach) kopiert, alle anderen Dicts werden geteilt.
+    """
+    out = []
+    for starter in starters:
+        horses = starter.get("horses") or []
+        if not any(str(h.get("cno", "")) in cno_map for h in horses):
+            out.append(starter)
+            continue
+        new_horses = []
+        for horse in horses:
+            old_cno = str(horse.get("cno", ""))
+            if old_cno in cno_map:
+                horse = dict(horse)
+                horse["cno"] = cno_map[old_cno]
+            new_horses.append(horse)
+        starter = dict(starter)
+        starter["horses"] = new_horses
+        out.append(starter)
+    return out
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+# starterlist_view.py
+#
+# Normalisierung der Starterliste: einmal nach dem Laden ausführen,
+# danach greifen alle PDF- und Word-Templates auf die vorberechneten Felder zu.
+#
+# Bisher hat jedes Template pro Zeile selbst Startzeit formatiert, Pferdealter
+# mit datetime.now() berechnet, Nation → ISO → IOC umgesetzt, Ländernamen
+# nachgeschlagen, Verein/Land entschieden und die Pausen-Map aufgebaut.
+# Bei mehreren Exporten derselben Liste passiert das jetzt nur einmal.
+#
+# Verwendung im Template:
+#     view = get_view(starterlist)
+#     breaks_map = view.breaks_map
+#     for s in starters:
+#         row = view.row(s)
+#         row.time_str, row.age, row.nat_code, row.flag_path, ...
+#
+import os
+from datetime import datetime
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+VIEW_KEY = "_view"
+
+FLAG_DIRS = ["flags", "C:/Python/flags"]
+
+SEX_DE = {"STALLION": "Hengst", "GELDING": "Wallach", "MARE": "Stute"}
+
+# IOC-Code → Ländername (deutsch)
+COUNTRY_NAMES_DE = {
+    "AFG": "Afghanistan", "AIA": "Anguilla", "ALB": "Albanien", "ALG": "Algerien",
+    "AND": "Andorra", "ANG": "Angola", "ANT": "Antigua und Barbuda", "ARG": "Argentinien",
+    "ARM": "Armenien", "ARU": "Aruba", "ASA": "Amerikanisch-Samoa", "AUS": "Australien",
+    "AUT": "Österreich", "AZE": "Aserbaidschan", "BAH": "Bahamas", "BAN": "Bangladesch",
+    "BAR": "Barbados", "BDI": "Burundi", "BEL": "Belgien", "BEN": "Benin",
+    "BER": "Bermuda", "BHU": "Bhutan", "BIH": "Bosnien und Herzegowina", "BIZ": "Belize",
+    "BLR": "Belarus", "BOL": "Bolivien", "BOT": "Botswana", "BRA": "Brasilien",
+    "BRN": "Bahrain", "BRU": "Brunei", "BUL": "Bulgarien", "BUR": "Burkina Faso",
+    "CAF": "Zentralafrikanische Republik", "CAM": "Kambodscha", "CAN": "Kanada", "CAY": "Kaimaninseln",
+    "CGO": "Kongo", "CHA": "Tschad", "CHI": "Chile", "CHN": "China",
+    "CIV": "Elfenbeinküste", "CMR": "Kamerun", "COD": "DR Kongo", "COK": "Cookinseln",
+    "COL": "Kolumbien", "COM": "Komoren", "CPV": "Kap Verde", "CRC": "Costa Rica",
+    "CRO": "Kroatien", "CUB": "Kuba", "CYP": "Zypern", "CZE": "Tschechien",
+    "DEN": "Dänemark", "DJI": "Dschibuti", "DMA": "Dominica", "DOM": "Dominikanische Republik",
+    "ECU": "Ecuador", "EGY": "Ägypten", "ERI": "Eritrea", "ESA": "El Salvador",
+    "ESP": "Spanien", "EST": "Estland", "ETH": "Äthiopien", "FAR": "Färöer",
+    "FIJ": "Fidschi", "FIN": "Finnland", "FRA": "Frankreich", "FSM": "Mikronesien",
+    "GAB": "Gabun", "GAM": "Gambia", "GBR": "Großbritannien", "GBS": "Guinea-Bissau",
+    "GEO": "Georgien", "GEQ": "Äquatorialguinea", "GER": "Deutschland", "GHA": "Ghana",
+    "GRE": "Griechenland", "GRN": "Grenada", "GUA": "Guatemala", "GUI": "Guinea",
+    "GUM": "Guam", "GUY": "Guyana", "HAI": "Haiti", "HKG": "Hongkong",
+    "HON": "Honduras", "HUN": "Ungarn", "INA": "Indonesien", "IND": "Indien",
+    "IRI": "Iran", "IRL": "Irland", "IRQ": "Irak", "ISL": "Island",
+    "ISR": "Israel", "ISV": "Amerikanische Jungferninseln", "ITA": "Italien", "IVB": "Britische Jungferninseln",
+    "JAM": "Jamaika", "JOR": "Jordanien", "JPN": "Japan", "KAZ": "Kasachstan",
+    "KEN": "Kenia", "KGZ": "Kirgisistan", "KIR": "Kiribati", "KOR": "Südkorea",
+    "KOS": "Kosovo", "KSA": "Saudi-Arabien", "KUW": "Kuwait", "LAO": "Laos",
+    "LAT": "Lettland", "LBA": "Libyen", "LBN": "Libanon", "LBR": "Liberia",
+    "LCA": "St. Lucia", "LES": "Lesotho", "LIE": "Liechtenstein", "LTU": "Litauen",
+    "LUX": "Luxemburg", "MAC": "Macau", "MAD": "Madagaskar", "MAR": "Marokko",
+    "MAS": "Malaysia", "MAW": "Malawi", "MDA": "Moldau", "MDV": "Malediven",
+    "MEX": "Mexiko", "MGL": "Mongolei", "MHL": "Marshallinseln", "MKD": "Nordmazedonien",
+    "MLI": "Mali", "MLT": "Malta", "MNE": "Montenegro", "MON": "Monaco",
+    "MOZ": "Mosambik", "MRI": "Mauritius", "MTN": "Mauretanien", "MYA": "Myanmar",
+    "NAM": "Namibia", "NCA": "Nicaragua", "NED": "Niederlande", "NEP": "Nepal",
+    "NGR": "Nigeria", "NIG": "Niger", "NOR": "Norwegen", "NRU": "Nauru",
+    "NZL": "Neuseeland", "OMA": "Oman", "PAK": "Pakistan", "PAN": "Panama",
+    "PAR": "Paraguay", "PER": "Peru", "PHI": "Philippinen", "PLE": "Palästina",
+    "PLW": "Palau", "PNG": "Papua-Neuguinea", "POL": "Polen", "POR": "Portugal",
+    "PRK": "Nordkorea", "PUR": "Puerto Rico", "QAT": "Katar", "ROU": "Rumänien",
+    "RSA": "Südafrika", "RUS": "Russland", "RWA": "Ruanda", "SAM": "Samoa",
+    "SEN": "Senegal", "SEY": "Seychellen", "SGP": "Singapur", "SKN": "St. Kitts und Nevis",
+    "SLE": "Sierra Leone", "SLO": "Slowenien", "SMR": "San Marino", "SOL": "Salomonen",
+    "SOM": "Somalia", "SRB": "Serbien", "SRI": "Sri Lanka", "SSD": "Südsudan",
+    "STP": "São Tomé und Príncipe", "SUD": "Sudan", "SUI": "Schweiz", "SUR": "Suriname",
+    "SVK": "Slowakei", "SWE": "Schweden", "SWZ": "Eswatini", "SYR": "Syrien",
+    "TAN": "Tansania", "TCA": "Turks- und Caicosinseln", "TGA": "Tonga", "THA": "Thailand",
+    "TJK": "Tadschikistan", "TKM": "Turkmenistan", "TLS": "Timor-Leste", "TOG": "Togo",
+    "TPE": "Taiwan", "TTO": "Trinidad und Tobago", "TUN": "Tunesien", "TUR": "Türkei",
+    "TUV": "Tuvalu", "UAE": "Vereinigte Arabische Emirate", "UGA": "Uganda", "UKR": "Ukraine",
+    "URU": "Uruguay", "USA": "USA", "UZB": "Usbekistan", "VAN": "Vanuatu",
+    "VEN": "Venezuela", "VIE": "Vietnam", "VIN": "St. Vincent und die Grenadinen", "YEM": "Jemen",
+    "ZAM": "Sambia", "ZIM": "Simbabwe",
+}
+
+# IOC-Code → Ländername (englisch)
+COUNTRY_NAMES_EN = {
+    "AFG": "Afghanistan", "AIA": "Anguilla", "ALB": "Albania", "ALG": "Algeria",
+    "AND": "Andorra", "ANG": "Angola", "ANT": "Antigua and Barbuda", "ARG": "Argentina",
+    "ARM": "Armenia", "ARU": "Aruba", "ASA": "American Samoa", "AUS": "Australia",
+    "AUT": "Austria", "AZE": "Azerbaijan", "BAH": "Bahamas", "BAN": "Bangladesh",
+    "BAR": "Barbados", "BDI": "Burundi", "BEL": "Belgium", "BEN": "Benin",
+    "BER": "Bermuda", "BHU": "Bhutan", "BIH": "Bosnia and Herzegovina", "BIZ": "Belize",
+    "BLR": "Belarus", "BOL": "Bolivia", "BOT": "Botswana", "BRA": "Brazil",
+    "BRN": "Bahrain", "BRU": "Brunei", "BUL": "Bulgaria", "BUR": "Burkina Faso",
+    "CAF": "Central African Republic", "CAM": "Cambodia", "CAN": "Canada", "CAY": "Cayman Islands",
+    "CGO": "Congo", "CHA": "Chad", "CHI": "Chile", "CHN": "China",
+    "CIV": "Ivory Coast", "CMR": "Cameroon", "COD": "DR Congo", "COK": "Cook Islands",
+    "COL": "Colombia", "COM": "Comoros", "CPV": "Cape Verde", "CRC": "Costa Rica",
+    "CRO": "Croatia", "CUB": "Cuba", "CYP": "Cyprus", "CZE": "Czech Republic",
+    "DEN": "Denmark", "DJI": "Djibouti", "DMA": "Dominica", "DOM": "Dominican Republic",
+    "ECU": "Ecuador", "EGY": "Egypt", "ERI": "Eritrea", "ESA": "El Salvador",
+    "ESP": "Spain", "EST": "Estonia", "ETH": "Ethiopia", "FAR": "Faroe Islands",
+    "FIJ": "Fiji", "FIN": "Finland", "FRA": "France", "FSM": "Micronesia",
+    "GAB": "Gabon", "GAM": "Gambia", "GBR": "Great Britain", "GBS": "Guinea-Bissau",
+    "GEO": "Georgia", "GEQ": "Equatorial Guinea", "GER": "Germany", "GHA": "Ghana",
+    "GRE": "Greece", "GRN": "Grenada", "GUA": "Guatemala", "GUI": "Guinea",
+    "GUM": "Guam", "GUY": "Guyana", "HAI": "Haiti", "HKG": "Hong Kong",
+    "HON": "Honduras", "HUN": "Hungary", "INA": "Indonesia", "IND": "India",
+    "IRI": "Iran", "IRL": "Ireland", "IRQ": "Iraq", "ISL": "Iceland",
+    "ISR": "Israel", "ISV": "US Virgin Islands", "ITA": "Italy", "IVB": "British Virgin Islands",
+    "JAM": "Jamaica", "JOR": "Jordan", "JPN": "Japan", "KAZ": "Kazakhstan",
+    "KEN": "Kenya", "KGZ": "Kyrgyzstan", "KIR": "Kiribati", "KOR": "South Korea",
+    "KOS": "Kosovo", "KSA": "Saudi Arabia", "KUW": "Kuwait", "LAO": "Laos",
+    "LAT": "Latvia", "LBA": "Libya", "LBN": "Lebanon", "LBR": "Liberia",
+    "LCA": "Saint Lucia", "LES": "Lesotho", "LIE": "Liechtenstein", "LTU": "Lithuania",
+    "LUX": "Luxembourg", "MAC": "Macau", "MAD": "Madagascar", "MAR": "Morocco",
+    "MAS": "Malaysia", "MAW": "Malawi", "MDA": "Moldova", "MDV": "Maldives",
+    "MEX": "Mexico", "MGL": "Mongolia", "MHL": "Marshall Islands", "MKD": "North Macedonia",
+    "MLI": "Mali", "MLT": "Malta", "MNE": "Montenegro", "MON": "Monaco",
+    "MOZ": "Mozambique", "MRI": "Mauritius", "MTN": "Mauritania", "MYA": "Myanmar",
+    "NAM": "Namibia", "NCA": "Nicaragua", "NED": "Netherlands", "NEP": "Nepal",
+    "NGR": "Nigeria", "NIG": "Niger", "NOR": "Norway", "NRU": "Nauru",
+    "NZL": "New Zealand", "OMA": "Oman", "PAK": "Pakistan", "PAN": "Panama",
+    "PAR": "Paraguay", "PER": "Peru", "PHI": "Philippines", "PLE": "Palestine",
+    "PLW": "Palau", "PNG": "Papua New Guinea", "POL": "Poland", "POR": "Portugal",
+    "PRK": "North Korea", "PUR": "Puerto Rico", "QAT": "Qatar", "ROU": "Romania",
+    "RSA": "South Africa", "RUS": "Russia", "RWA": "Rwanda", "SAM": "Samoa",
+    "SEN": "Senegal", "SEY": "Seychelles", "SGP": "Singapore", "SKN": "Saint Kitts and Nevis",
+    "SLE": "Sierra Leone", "SLO": "Slovenia", "SMR": "San Marino", "SOL": "Solomon Islands",
+    "SOM": "Somalia", "SRB": "Serbia", "SRI": "Sri Lanka", "SSD": "South Sudan",
+    "STP": "São Tomé and Príncipe", "SUD": "Sudan", "SUI": "Switzerland", "SUR": "Suriname",
+    "SVK": "Slovakia", "SWE": "Sweden", "SWZ": "Eswatini", "SYR": "Syria",
+    "TAN": "Tanzania", "TCA": "Turks and Caicos Islands", "TGA": "Tonga", "THA": "Thailand",
+    "TJK": "Tajikistan", "TKM": "Turkmenistan", "TLS": "Timor-Leste", "TOG": "Togo",
+    "TPE": "Taiwan", "TTO": "Trinidad and Tobago", "TUN": "Tunisia", "TUR": "Turkey",
+    "TUV": "Tuvalu", "UAE": "United Arab Emirates", "UGA": "Uganda", "UKR": "Ukraine",
+    "URU": "Uruguay", "USA": "USA", "UZB": "Uzbekistan", "VAN": "Vanuatu",
+    "VEN": "Venezuela", "VIE": "Vietnam", "VIN": "Saint Vincent and the Grenadines", "YEM": "Yemen",
+    "ZAM": "Zambia", "ZIM": "Zimbabwe",
+}
+
+# ISO 3166-1 alpha-3 → IOC
+ISO_TO_IOC = {
+    "AFG": "AFG", "ALB": "ALB", "DZA": "ALG", "ASM": "ASA", "AND": "AND", "AGO": "ANG",
+    "AIA": "AIA", "ATG": "ANT", "ARG": "ARG", "ARM": "ARM", "ABW": "ARU", "AUS": "AUS",
+    "AUT": "AUT", "AZE": "AZE", "BHS": "BAH", "BHR": "BRN", "BGD": "BAN", "BRB": "BAR",
+    "BLR": "BLR", "BEL": "BEL", "BLZ": "BIZ", "BEN": "BEN", "BMU": "BER", "BTN": "BHU",
+    "BOL": "BOL", "BIH": "BIH", "BWA": "BOT", "BRA": "BRA", "VGB": "IVB", "BRN": "BRU",
+    "BGR": "BUL", "BFA": "BUR", "BDI": "BDI", "KHM": "CAM", "CMR": "CMR", "CAN": "CAN",
+    "CPV": "CPV", "CYM": "CAY", "CAF": "CAF", "TCD": "CHA", "CHL": "CHI", "CHN": "CHN",
+    "COL": "COL", "COM": "COM", "COG": "CGO", "COD": "COD", "COK": "COK", "CRI": "CRC",
+    "CIV": "CIV", "HRV": "CRO", "CUB": "CUB", "CYP": "CYP", "CZE": "CZE", "DNK": "DEN",
+    "DJI": "DJI", "DMA": "DMA", "DOM": "DOM", "ECU": "ECU", "EGY": "EGY", "SLV": "ESA",
+    "GNQ": "GEQ", "ERI": "ERI", "EST": "EST", "ETH": "ETH", "FRO": "FAR", "FJI": "FIJ",
+    "FIN": "FIN", "FRA": "FRA", "GAB": "GAB", "GMB": "GAM", "GEO": "GEO", "DEU": "GER",
+    "GHA": "GHA", "GBR": "GBR", "GRC": "GRE", "GRD": "GRN", "GUM": "GUM", "GTM": "GUA",
+    "GIN": "GUI", "GNB": "GBS", "GUY": "GUY", "HTI": "HAI", "HND": "HON", "HKG": "HKG",
+    "HUN": "HUN", "ISL": "ISL", "IND": "IND", "IDN": "INA", "IRN": "IRI", "IRQ": "IRQ",
+    "IRL": "IRL", "ISR": "ISR", "ITA": "ITA", "JAM": "JAM", "JPN": "JPN", "JOR": "JOR",
+    "KAZ": "KAZ", "KEN": "KEN", "KIR": "KIR", "PRK": "PRK", "KOR": "KOR", "KWT": "KUW",
+    "KGZ": "KGZ", "LAO": "LAO", "LVA": "LAT", "LBN": "LBN", "LSO": "LES", "LBR": "LBR",
+    "LBY": "LBA", "LIE": "LIE", "LTU": "LTU", "LUX": "LUX", "MAC": "MAC", "MDG": "MAD",
+    "MWI": "MAW", "MYS": "MAS", "MDV": "MDV", "MLI": "MLI", "MLT": "MLT", "MHL": "MHL",
+    "MRT": "MTN", "MUS": "MRI", "MEX": "MEX", "FSM": "FSM", "MDA": "MDA", "MCO": "MON",
+    "MNG": "MGL", "MNE": "MNE", "MAR": "MAR", "MOZ": "MOZ", "MMR": "MYA", "NAM": "NAM",
+    "NRU": "NRU", "NPL": "NEP", "NLD": "NED", "NZL": "NZL", "NIC": "NCA", "NER": "NIG",
+    "NGA": "NGR", "NOR": "NOR", "OMN": "OMA", "PAK": "PAK", "PLW": "PLW", "PSE": "PLE",
+    "PAN": "PAN", "PNG": "PNG", "PRY": "PAR", "PER": "PER", "PHL": "PHI", "POL": "POL",
+    "PRT": "POR", "PRI": "PUR", "QAT": "QAT", "MKD": "MKD", "ROU": "ROU", "RUS": "RUS",
+    "RWA": "RWA", "KNA": "SKN", "LCA": "LCA", "VCT": "VIN", "WSM": "SAM", "SMR": "SMR",
+    "STP": "STP", "SAU": "KSA", "SEN": "SEN", "SRB": "SRB", "SYC": "SEY", "SLE": "SLE",
+    "SGP": "SGP", "SVK": "SVK", "SVN": "SLO", "SLB": "SOL", "SOM": "SOM", "ZAF": "RSA",
+    "SSD": "SSD", "ESP": "ESP", "LKA": "SRI", "SDN": "SUD", "SUR": "SUR", "SWZ": "SWZ",
+    "SWE": "SWE", "CHE": "SUI", "SYR": "SYR", "TWN": "TPE", "TJK": "TJK", "TZA": "TAN",
+    "THA": "THA", "TLS": "TLS", "TGO": "TOG", "TON": "TGA", "TTO": "TTO", "TUN": "TUN",
+    "TUR": "TUR", "TKM": "TKM", "TCA": "TCA", "TUV": "TUV", "UGA": "UGA", "UKR": "UKR",
+    "ARE": "UAE", "USA": "USA", "URY": "URU", "UZB": "UZB", "VUT": "VAN", "VEN": "VEN",
+    "VNM": "VIE", "VIR": "ISV", "YEM": "YEM", "ZMB": "ZAM", "ZWE": "ZIM", "XKX": "KOS",
+}
+
+# ISO 3166-1 alpha-2 → alpha-3 (ältere Datensätze)
+ISO2_TO_ISO3 = {
+    "GB": "GBR", "DE": "DEU", "NL": "NLD", "CH": "CHE", "DK": "DNK", "AT": "AUT",
+    "BE": "BEL", "FR": "FRA", "IT": "ITA", "ES": "ESP", "SE": "SWE", "NO": "NOR",
+    "PL": "POL", "CZ": "CZE", "HU": "HUN", "RO": "ROU", "IE": "IRL", "PT": "PRT",
+}
+
+
+def format_time(iso):
+    """ISO-Zeit → HH:MM:SS"""
+    if not iso:
+        return ""
+    try:
+        dt = datetime.fromisoformat(str(iso).replace("Z", ""))
+        return dt.strftime("%H:%M:%S")
+    except:
+        return str(iso).split("T")[-1][:8] if "T" in str(iso) else str(iso)
+
+
+def to_ioc(nation):
+    """Nation (IOC, ISO alpha-3 oder alpha-2) → IOC-Code für Anzeige und Flagge"""
+    if not nation:
+        return ""
+    code = str(nation).strip().upper()
+    if code in COUNTRY_NAMES_DE:
+        return code
+    if len(code) == 2:
+        code = ISO2_TO_ISO3.get(code, code)
+    return ISO_TO_IOC.get(code, code)
+
+
+def find_flag(ioc_code):
+    """Pfad zur Flaggen-Datei oder None"""
+    if not ioc_code:
+        return None
+    for folder in FLAG_DIRS:
+        path = f"{folder}/{ioc_code}.png"
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def club_or_country(club, nation, country_name):
+    """
+    Zweite Reiterzeile: Deutsche → Verein.
+    Ausländer → Land ausgeschrieben, wenn kein Verein oder "Gastlizenz GER", sonst Verein.
+    """
+    club = club or ""
+    if nation and nation != "GER":
+        if not club.strip() or club.strip().upper() == "GASTLIZENZ GER":
+            return country_name
+        return club
+    return club
+
+
+class StarterRow:
+    """Vorberechnete Felder eines Starters (Rohdaten weiter über .raw / .horse / .athlete)"""
+    __slots__ = (
+        "raw", "start_number", "start_number_int", "time_str", "group",
+        "withdrawn", "hors_concours",
+        "horse", "horse_name", "age", "sex_de",
+        "athlete", "athlete_name", "club", "nation", "nat_code", "flag_path",
+        "country_de", "country_en", "club_or_country_de", "club_or_country_en",
+    )
+
+    def __init__(self, s, current_year, flag_cache):
+        self.raw = s
+        self.start_number = str(s.get("startNumber", ""))
+        try:
+            self.start_number_int = int(s.get("startNumber"))
+        except (TypeError, ValueError):
+            self.start_number_int = None
+        self.time_str = format_time(s.get("startTime", ""))
+        self.group = s.get("groupNumber")
+        self.withdrawn = bool(s.get("withdrawn", False))
+        self.hors_concours = bool(s.get("horsConcours", False))
+
+        horses = s.get("horses") or []
+        horse = horses[0] if horses else {}
+        self.horse = horse
+        self.horse_name = horse.get("name", "") or ""
+        self.age = None
+        breeding_season = horse.get("breedingSeason")
+        if breeding_season:
+            try:
+                self.age = current_year - int(breeding_season)
+            except (TypeError, ValueError):
+                pass
+        sex = horse.get("sex", "")
+        self.sex_de = SEX_DE.get(str(sex).upper() if sex else "", sex or "")
+
+        athlete = s.get("athlete") or {}
+        self.athlete = athlete
+        self.athlete_name = str(athlete.get("name", "") or "")
+        self.club = athlete.get("club", "") or ""
+        self.nation = str(athlete.get("nation", "") or "").strip().upper()
+        self.nat_code = to_ioc(self.nation)
+        if self.nat_code not in flag_cache:
+            flag_cache[self.nat_code] = find_flag(self.nat_code)
+        self.flag_path = flag_cache[self.nat_code]
+        self.country_de = COUNTRY_NAMES_DE.get(self.nat_code, self.nation)
+        self.country_en = COUNTRY_NAMES_EN.get(self.nat_code, self.nation)
+        self.club_or_country_de = club_or_country(self.club, self.nation, self.country_de)
+        self.club_or_country_en = club_or_country(self.club, self.nation, self.country_en)
+
+
+class StarterlistView:
+    """Normalisierte Starterliste: Zeilen in API-Reihenfolge + Pausen nach Startnummer"""
+    __slots__ = ("rows", "breaks_map", "_by_id")
+
+    def __init__(self, rows, breaks_map):
+        self.rows = rows
+        self.breaks_map = breaks_map
+        self._by_id = {id(r.raw): r for r in rows}
+
+    def row(self, s):
+        """Zeile zu einem Starter-Dict (auch für nachträglich hinzugefügte Starter)"""
+        r = self._by_id.get(id(s))
+        if r is None or r.raw is not s:
+            r = StarterRow(s, datetime.now().year, {})
+            self._by_id[id(s)] = r
+        return r
+
+    def rebind(self, starters, breaks=None):
+        """
+        Gleiche Zeilen für eine (teilweise) kopierte Starterliste in gleicher
+        Reihenfolge, z.B. nach KNr-Mapping. Rohdaten-Verweise zeigen auf die Kopie.
+        breaks: Pausen-Dicts der Kopie; nötig nach detached(), sonst bleibt breaks_map.
+        """
+        rows = []
+        for r, s in zip(self.rows, starters):
+            if r.raw is s:
+                rows.append(r)  # unveränderter Starter - Zeile teilen
+                continue
+            clone = StarterRow.__new__(StarterRow)
+            for name in StarterRow.__slots__:
+                setattr(clone, name, getattr(r, name))
+            horses = s.get("horses") or []
+            clone.raw = s
+            clone.horse = horses[0] if horses else {}
+            clone.athlete = s.get("athlete") or {}
+            rows.append(clone)
+        breaks_map = build_breaks_map(breaks) if breaks is not None else self.breaks_map
+        return StarterlistView(rows, breaks_map)
+
+    def detached(self):
+        """
+        Kopie ohne Verweise auf die Roh-Dicts (für das Session-Modell), auch
+        ohne breaks_map; vor dem Rendern mit rebind(starters, breaks) an die
+        frisch erzeugten Dicts hängen.
+        """
+        rows = []
+        for r in self.rows:
+            clone = StarterRow.__new__(StarterRow)
+            for name in StarterRow.__slots__:
+                setattr(clone, name, getattr(r, name))
+            clone.raw = clone.horse = clone.athlete = None
+            rows.append(clone)
+        view = StarterlistView.__new__(StarterlistView)
+        view.rows = rows
+        view.breaks_map = None
+        view._by_id = {}
+        return view
+
+
+def build_breaks_map(breaks):
+    """Pausen nach Startnummer, hinter der sie liegen: {nummer: [pause, ...]}"""
+    breaks_map = {}
+    for b in breaks or []:
+        try:
+            k = int(b.get("afterNumberInCompetition", -1))
+        except (TypeError, ValueError):
+            log.debug("Pause ohne gültige Position übersprungen: %r", b)
+            continue
+        breaks_map.setdefault(k, []).append(b)
+    return breaks_map
+
+
+def build_view(starterlist):
+    """Normalisiert die Starterliste (einmal pro geladener Liste)"""
+    current_year = datetime.now().year
+    flag_cache = {}
+    rows = [StarterRow(s, current_year, flag_cache) for s in starterlist.get("starters", []) or []]
+    breaks_map = build_breaks_map(starterlist.get("breaks"))
+
+    log.debug("Starterliste normalisiert (%s Starter, %s Pausen-Positionen)", len(rows), len(breaks_map))
+    return StarterlistView(rows, breaks_map)
+
+
+def attach_view(starterlist):
+    """Normalisiert und legt die View in der Starterliste ab (Schlüssel _view)"""
+    view = build_view(starterlist)
+    starterlist[VIEW_KEY] = view
+    return view
+
+
+def get_view(starterlist):
+    """View der Starterliste - vorhandene wiederverwenden, sonst einmalig aufbauen"""
+    view = starterlist.get(VIEW_KEY)
+    if isinstance(view, StarterlistView) and len(view.rows) == len(starterlist.get("starters", []) or []):
+        return view
+    return attach_view(starterlist)
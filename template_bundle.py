@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+# template_bundle.py
+#
+# Vorkompilierter Bytecode aller Templates in einer Datei.
+#
+# Die Templates (templates/pdf, templates/word) haben 900-2000 Zeilen; ohne
+# __pycache__ (Neustart auf dem Cloud-Host, frischer Checkout) kostet das
+# Kompilieren rund 10 ms pro Template und Export. Das Bundle enthält die
+# Code-Objekte aller Templates (marshal) plus ein Manifest mit SHA1 der
+# Quelle, Größe und Kompilierzeit:
+#
+#     templates/bytecode.bundle          marshal-Dict {pfad: code}
+#     templates/bytecode_manifest.json   {"tag": ..., "templates": {pfad: info}}
+#
+# Der Loader (exec_template) nimmt den Code aus dem Bundle, solange die Quelle
+# denselben Hash hat, sonst wie bisher spec.loader.exec_module. Das Bundle
+# gilt nur für die Python-Version, mit der es gebaut wurde (tag).
+#
+# Bundle und Manifest sind Build-Ausgaben und werden nicht eingecheckt
+# (.gitignore): startup_check schreibt sie bei jedem App-Start neu, und ein
+# Bundle eines anderen Interpreters wäre ohnehin wertlos. Wer den ersten
+# Start ohne Kompilieren will, baut sie beim Deployment auf dem Host
+# (python -m template_bundle).
+#
+# Bauen und prüfen aus dem Projektordner:
+#     python -m template_bundle            # bauen, Bericht mit Compile-/Ladezeiten
+#     python -m template_bundle --check    # nur prüfen, Exit-Code 1 wenn veraltet/fehlerhaft
+#
+# Nach dem Start gleicht export_warmup das Bundle im Hintergrund ab
+# (startup_check: veraltete/fehlende Templates neu kompilieren, Bericht ins Log).
+#
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+TEMPLATES_ROOT = "templates"
+KINDS = ("pdf", "word")
+BUNDLE_FILE = os.path.join(TEMPLATES_ROOT, "bytecode.bundle")
+MANIFEST_FILE = os.path.join(TEMPLATES_ROOT, "bytecode_manifest.json")
+TAG = f"{sys.implementation.cache_tag}-{importlib.util.MAGIC_NUMBER.hex()}"
+
+_lock = threading.Lock()
+_bundle = None        # (manifest["templates"], {pfad: code}) nach dem ersten Zugriff
+_verified = {}        # pfad -> ((mtime_ns, size), code oder None)
+_load_ms = {}         # pfad -> (ms, "bundle"/"quelle") des letzten exec_template
+
+
+def _rel(path):
+    return os.path.normpath(os.path.relpath(path))
+
+
+def template_files():
+    """Alle Template-Quellen (relative Pfade), sortiert"""
+    paths = []
+    for kind in KINDS:
+        for path in sorted(glob.glob(os.path.join(TEMPLATES_ROOT, kind, "*.py"))):
+            if not os.path.basename(path).startswith("__"):
+                paths.append(_rel(path))
+    return paths
+
+
+def _sha1_file(path):
+    with open(path, "rb") as f:
+        source = f.read()
+    return source, hashlib.sha1(source).hexdigest()
+
+
+def compile_template(path):
+    """Quelle kompilieren und prüfen; liefert (code oder None, info)"""
+    source, digest = _sha1_file(path)
+    info = {"sha1": digest, "size": len(source)}
+    t0 = time.perf_counter()
+    try:
+        code = compile(source, path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        info["error"] = f"SyntaxError Zeile {e.lineno}: {e.msg}"
+        return None, info
+    info["compile_ms"] = round((time.perf_counter() - t0) * 1000.0, 2)
+    if "render" not in code.co_names:
+        info["error"] = "keine Funktion render()"
+    return code, info
+
+
+def _read_bundle():
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("tag") != TAG:
+            log.info("Bytecode-Bundle für %s, aktuell %s - wird ignoriert", manifest.get("tag"), TAG)
+            return {}, {}
+        with open(BUNDLE_FILE, "rb") as f:
+            codes = marshal.load(f)
+        return manifest.get("templates", {}), codes
+    except (OSError, ValueError, EOFError, TypeError):
+        return {}, {}
+
+
+def _get_bundle():
+    global _bundle
+    if _bundle is None:
+        with _lock:
+            if _bundle is None:
+                _bundle = _read_bundle()
+    return _bundle
+
+
+def _write_bundle(infos, codes):
+    """Bundle + Manifest atomar schreiben (erst .tmp, dann umbenennen)"""
+    manifest = {"tag": TAG, "built": datetime.now().isoformat(timespec="seconds"), "templates": infos}
+    for target, write in (
+        (BUNDLE_FILE, lambda f: marshal.dump(codes, f)),
+        (MANIFEST_FILE, lambda f: f.write(json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))),
+    ):
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+
+
+def build(paths=None, reuse=True):
+    """
+    Templates kompilieren und Bundle schreiben. reuse=True übernimmt
+    unveränderte Einträge aus dem vorhandenen Bundle. Liefert {pfad: info}.
+    """
+    global _bundle
+    old_infos, old_codes = _get_bundle() if reuse else ({}, {})
+    infos, codes = {}, {}
+    for path in paths or template_files():
+        _, digest = _sha1_file(path)
+        old = old_infos.get(path)
+        if old and old.get("sha1") == digest and path in old_codes:
+            infos[path], codes[path] = old, old_codes[path]
+            continue
+        code, info = compile_template(path)
+        infos[path] = info
+        if code is not None and "error" not in info:
+            codes[path] = code
+        else:
+            log.warning("Template %s nicht im Bundle: %s", path, info.get("error"))
+    try:
+        _write_bundle(infos, codes)
+    except OSError as e:
+        log.warning("Bytecode-Bundle konnte nicht geschrieben werden: %s", e)
+    with _lock:
+        _bundle = (infos, codes)
+        _verified.clear()
+    return infos
+
+
+def get_code(path):
+    """Code-Objekt aus dem Bundle, wenn die Quelle unverändert ist, sonst None"""
+    rel = _rel(path)
+    infos, codes = _get_bundle()
+    info = infos.get(rel)
+    if info is None or rel not in codes:
+        return None
+    st = os.stat(path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _verified.get(rel)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    _, digest = _sha1_file(path)
+    code = codes[rel] if digest == info.get("sha1") else None
+    _verified[rel] = (stat_key, code)
+    return code
+
+
+def exec_template(module_name, path):
+    """
+    Wie spec_from_file_location + exec_module, aber mit Bytecode aus dem
+    Bundle, falls vorhanden und aktuell.
+    """
+    t0 = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    code = get_code(path)
+    if code is None:
+        spec.loader.exec_module(module)
+    else:
+        exec(code, module.__dict__)
+    _load_ms[_rel(path)] = (round((time.perf_counter() - t0) * 1000.0, 1), "quelle" if code is None else "bundle")
+    return module
+
+
+def report():
+    """Zeilen je Template: Status, Kompilierzeit (Bundle), letzte Ladezeit"""
+    infos, codes = _get_bundle()
+    rows = []
+    for path in template_files():
+        info = infos.get(path)
+        if info is None:
+            status = "fehlt"
+        elif "error" in info:
+            status = "fehlerhaft"
+        elif get_code(path) is None:
+            status = "veraltet"
+        else:
+            status = "aktuell"
+        load = _load_ms.get(path)
+        rows.append({
+            "template": path,
+            "status": status,
+            "compile_ms": (info or {}).get("compile_ms"),
+            "load_ms": load[0] if load else None,
+            "geladen_aus": load[1] if load else "",
+            "fehler": (info or {}).get("error", ""),
+        })
+    return rows
+
+
+def startup_check():
+    """Beim Start (Warm-up): veraltete/fehlende Einträge nachbauen, Bericht ins Log"""
+    rows = report()
+    stale = [r["template"] for r in rows if r["status"] in ("fehlt", "veraltet")]
+    if stale:
+        build()
+        rows = report()
+    for r in rows:
+        log.debug("%-45s %-10s compile %s ms", r["template"], r["status"], r["compile_ms"])
+    counts = {}
+    for r in rows:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    log.info("Bytecode-Bundle: %s (%d neu kompiliert)",
+             ", ".join(f"{n} {s}" for s, n in sorted(counts.items())), len(stale))
+    return rows
+
+
+def _print_report(rows, load_times):
+    print(f"{'Template':45s} {'Status':10s} {'compile ms':>10s} {'load ms':>8s}")
+    for r in rows:
+        compile_ms = f"{r['compile_ms']:10.1f}" if r["compile_ms"] is not None else f"{'-':>10s}"
+        load = load_times.get(r["template"])
+        load_ms = f"{load:8.1f}" if load is not None else f"{'-':>8s}"
+        print(f"{r['template']:45s} {r['status']:10s} {compile_ms} {load_ms}  {r['fehler']}")
+    total = sum(r["compile_ms"] or 0 for r in rows)
+    print(f"\n{len(rows)} Templates, Kompilieren gesamt {total:.0f} ms (entfällt mit Bundle)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Template-Bytecode-Bundle bauen/prüfen")
+    parser.add_argument("--check", action="store_true",
+                        help="nicht bauen, nur prüfen (Exit-Code 1 bei veralteten/fehlerhaften Templates)")
+    parser.add_argument("--no-load", action="store_true", help="Ladezeiten nicht messen")
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        build(reuse=False)
+    rows = report()
+    load_times = {}
+    if not args.no_load:
+        # Laden = Modul aus dem Bundle ausführen (Importe, Schriften ...)
+        for r in rows:
+            if r["status"] == "aktuell":
+                t0 = time.perf_counter()
+                try:
+                    exec_template("template_bundle_check", r["template"])
+                except Exception as e:
+                    r["fehler"] = f"Laden: {type(e).__name__}: {e}"
+                load_times[r["template"]] = (time.perf_counter() - t0) * 1000.0
+    _print_report(rows, load_times)
+    bad = [r for r in rows if r["status"] != "aktuell" or r["fehler"]]
+    return 1 if args.check and bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# template_manifest.py
+#
+# Metadaten der Templates, ohne sie zu importieren.
+#
+# Jedes Template deklariert am Modulanfang ein literales Dict:
+#
+#     TEMPLATE_INFO = {
+#         "discipline": "dressur",          # dressur / springen / vielseitigkeit / allgemein
+#         "language": "de",                 # de / en
+#         "inputs": ["derby_times"],        # zusätzliche Eingaben, siehe INPUTS
+#         "print_options": ["show_header", ...],
+#         "cost": "light",                  # light / normal / heavy (Renderzeit 150 Starter)
+#     }
+#
+# Gelesen wird nur der Quelltext (ast.literal_eval des Dicts), nicht das
+# Modul ausgeführt - die Sidebar, der Benchmark und die Export-Jobs können so
+# template-spezifische Eingaben und Kosten bestimmen, ohne reportlab bzw. das
+# Template zu laden. Ergebnis je Datei gecacht nach (mtime, Größe).
+#
+# Hochgeladene Templates ohne TEMPLATE_INFO bekommen Werte aus dem Namen
+# (bisherige Konvention: "_dre_", "spr", "_int", "derby", "meisterschaft" ...).
+#
+import ast
+import os
+import re
+import threading
+
+from app_logging import get_logger
+
+log = get_logger(__name__)
+
+TEMPLATES_ROOT = "templates"
+
+# Zusätzliche Eingaben, die ein Template auswertet
+INPUTS = {
+    "derby_times": "Derby: Prüfungsbeginn und Finale",
+    "pw_config": "Pferdewechsel: Konfiguration",
+    "knr_column": "KNr. statt R-Nr. in der ersten Spalte",
+    "meisterschaft": "Meisterschaftsdatei",
+}
+COSTS = ("light", "normal", "heavy")
+
+DEFAULTS = {
+    "discipline": "allgemein",
+    "language": "de",
+    "inputs": [],
+    "print_options": [],
+    "cost": "normal",
+}
+
+_MARKER = "TEMPLATE_INFO = {"
+_INT_RE = re.compile(r"(^|_)int(_|$)")
+
+_lock = threading.Lock()
+_cache = {}  # pfad -> ((mtime_ns, size), info)
+
+
+def template_path(kind, name):
+    return os.path.join(TEMPLATES_ROOT, kind, f"{name}.py")
+
+
+def _from_name(name):
+    """Metadaten nach Namenskonvention (für Templates ohne TEMPLATE_INFO)"""
+    lower = name.lower()
+    if "_dre_" in lower:
+        discipline = "dressur"
+    elif lower.startswith("pdf_vs_"):
+        discipline = "vielseitigkeit"
+    elif "spr" in lower:
+        discipline = "springen"
+    else:
+        discipline = "allgemein"
+    inputs = []
+    if "derby" in lower:
+        inputs.append("derby_times")
+    if "pferdewechsel" in lower:
+        inputs.append("pw_config")
+    if lower.startswith("pdf_vs_"):
+        inputs.append("knr_column")
+    if "meisterschaft" in lower:
+        inputs.append("meisterschaft")
+    return {
+        "discipline": discipline,
+        "language": "en" if _INT_RE.search(lower) else "de",
+        "inputs": inputs,
+    }
+
+
+def _literal(source):
+    """TEMPLATE_INFO-Dict aus dem Quelltext; None, wenn nicht vorhanden"""
+    start = source.find(_MARKER)
+    if start < 0:
+        return None
+    end = source.find("\n}\n", start)
+    if end >= 0:
+        try:
+            return ast.literal_eval(source[start + len("TEMPLATE_INFO = "):end + 2])
+        except (ValueError, SyntaxError):
+            pass
+    # Abweichende Formatierung: ganzes Modul parsen (langsamer, aber ohne Ausführen)
+    for node in ast.parse(source).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and getattr(node.targets[0], "id", None) == "TEMPLATE_INFO"):
+            return ast.literal_eval(node.value)
+    return None
+
+
+def _read(path, name):
+    info = dict(DEFAULTS)
+    info.update(_from_name(name))
+    info["declared"] = False
+    try:
+        with open(path, encoding="utf-8") as f:
+            declared = _literal(f.read())
+    except OSError:
+        declared = None
+    except (ValueError, SyntaxError) as e:
+        log.warning("TEMPLATE_INFO in %s nicht lesbar: %s", path, e)
+        declared = None
+    if isinstance(declared, dict):
+        info.update(declared)
+        info["declared"] = True
+    info["inputs"] = list(info["inputs"])
+    info["print_options"] = list(info["print_options"])
+    if info["cost"] not in COSTS:
+        info["cost"] = DEFAULTS["cost"]
+    return info
+
+
+def info(kind, name):
+    """Metadaten eines Templates als Dict (Kopie); "declared" = aus TEMPLATE_INFO"""
+    path = template_path(kind, name)
+    try:
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stat_key = None
+    with _lock:
+        cached = _cache.get(path)
+    if cached is None or cached[0] != stat_key:
+        cached = (stat_key, _read(path, name))
+        with _lock:
+            _cache[path] = cached
+    result = dict(cached[1])
+    result["inputs"] = list(result["inputs"])
+    result["print_options"] = list(result["print_options"])
+    return result
+
+
+def needs(kind, name, input_name):
+    """True, wenn das Template die Eingabe (siehe INPUTS) auswertet"""
+    if not name:
+        return False
+    return input_name in info(kind, name)["inputs"]
+
+
+def supports(kind, name, option):
+    """True, wenn das Template die Druckoption auswertet"""
+    if not name:
+        return False
+    return option in info(kind, name)["print_options"]
+
+
+def cost(kind, name):
+    return info(kind, name)["cost"] if name else DEFAULTS["cost"]
+
+
+def all_templates(kind):
+    """{name: info} für alle Templates einer Art"""
+    import file_index
+    names = file_index.index.stems(os.path.join(TEMPLATES_ROOT, kind), (".py",))
+    return {name: info(kind, name) for name in names}
+
@@ -7,10 +7,26 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
+from starterlist_view import get_view
 from datetime import datetime
+import logging
 import os
 from PIL import Image as PILImage
 
+from app_logging import get_logger
+from render_context import asset_path, canvas_maker
+
+log = get_logger("templates.pdf.pdf_abstammung_logo")
+
+TEMPLATE_INFO = {
+    "discipline": "allgemein",
+    "language": "de",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided"],
+    "cost": "normal",
+}
+
 WEEKDAY_MAP = {
     "Monday": "Montag", "Tuesday": "Dienstag", "Wednesday": "Mittwoch",
     "Thursday": "Donnerstag", "Friday": "Freitag", "Saturday": "Samstag",
@@ -132,9 +148,9 @@ def _get_ordered_judges_all(judges):
     
     return result
 
-def get_sponsor_bar_height():
+def get_sponsor_bar_height(print_options=None):
     """Ermittelt die tatsächliche Höhe der Sponsorenleiste"""
-    sponsor_path = "logos/sponsorenleiste.png"
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if os.path.exists(sponsor_path):
         try:
             from reportlab.lib.utils import ImageReader
@@ -155,16 +171,17 @@ def get_sponsor_bar_height():
 
 class FooterCanvas(canvas.Canvas):
     """Canvas mit optionalem Banner und Sponsorenleiste, gesteuert über print_options"""
-    _print_options = {}  # Klassenattribut, wird vor doc.build gesetzt
+    _print_options = {}  # Standard; pro Export über canvas_maker()
     
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num = 0
         self.banner_path = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -201,7 +218,7 @@ class FooterCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 img_width = 190*mm
@@ -214,7 +231,7 @@ class FooterCanvas(canvas.Canvas):
                 pass
 
 def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
-    print(f"DEBUG: Starting PDF render for {filename}")
+    log.debug("Starting PDF render for %s", filename)
     
     # Druckoptionen auslesen
     print_options = starterlist.get("printOptions", {})
@@ -227,7 +244,6 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     show_header = print_options.get("show_header", True)
     
     # printOptions an FooterCanvas übergeben
-    FooterCanvas._print_options = print_options
     
     has_sponsor_paper = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
@@ -239,7 +255,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         
         # Mindest-Unterrand wenn Sponsorenleiste aktiv ist
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm = (4*mm + sponsor_height + 1*mm) / mm  # 4mm Abstand + Höhe + 1mm Puffer, in mm
         else:
             min_bottom_mm = 10  # 1cm Minimum
@@ -257,7 +273,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         # also muss auch die Rueckseite denselben Mindestabstand haben!
         bottom_margin_back = min_bottom_mm
         
-        print(f"PDF DEBUG: Custom Margins - Front: oben={top_margin_front}mm unten={bottom_margin_front}mm, Back: oben={top_margin_back}mm unten={bottom_margin_back}mm, Einseitig={single_sided}")
+        log.debug("Custom Margins - Front: oben=%smm unten=%smm, Back: oben=%smm unten=%smm, Einseitig=%s", top_margin_front, bottom_margin_front, top_margin_back, bottom_margin_back, single_sided)
         
         if single_sided:
             # Einseitig: Alle Seiten gleiche Ränder
@@ -321,7 +337,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         page_width = A4[0] - 16*mm  # 8mm links + 8mm rechts (Frame-Ränder)
     else:
         # Standard: Sponsor-basierte Margins wie bisher
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         footer_space = 4*mm
         margin_above_sponsor = 1*mm
         bottom_margin = footer_space + sponsor_height + margin_above_sponsor if show_sponsor_bar else 8*mm
@@ -351,7 +367,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     # Banner-Spacer nur wenn Banner angezeigt wird
     has_banner = False
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -423,10 +439,10 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     division_num = starterlist.get('divisionNumber')
     divisions = starterlist.get('divisions', [])
     
-    print(f"DEBUG: divisionNumber: {division_num}")
-    print(f"DEBUG: Found divisions: {len(divisions)}")
-    if divisions:
-        print(f"DEBUG: Division details: {[(d.get('number'), d.get('start')) for d in divisions]}")
+    log.debug("divisionNumber: %s", division_num)
+    log.debug("Found divisions: %s", len(divisions))
+    if divisions and log.isEnabledFor(logging.DEBUG):
+        log.debug("Division details: %s", [(d.get('number'), d.get('start')) for d in divisions])
     
     if divisions and division_num is not None:
         try:
@@ -436,20 +452,20 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                     division_start = div.get("start")
                     if division_start:
                         start_raw = division_start
-                        print(f"DEBUG: Using division {div_num} start: {division_start}")
+                        log.debug("Using division %s start: %s", div_num, division_start)
                         break
         except (ValueError, TypeError):
-            print(f"DEBUG: Could not parse division number: {division_num}")
+            log.debug("Could not parse division number: %s", division_num)
     elif divisions and len(divisions) > 0:
         first_division = divisions[0]
         division_start = first_division.get("start")
         if division_start:
             start_raw = division_start
-            print(f"DEBUG: Using first division start: {division_start}")
+            log.debug("Using first division start: %s", division_start)
     
     if not start_raw:
         start_raw = starterlist.get('start')
-        print(f"DEBUG: Using starterlist fallback start: {start_raw}")
+        log.debug("Using starterlist fallback start: %s", start_raw)
     
     date_line_text = None
     if start_raw:
@@ -481,9 +497,9 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 ('RIGHTPADDING', (1,0), (1,0), 0),
             ]))
             elements.append(header_table)
-            print(f"PDF LOGO DEBUG: Logo in Header-Tabelle: {logo_path} (Größe: {logo.drawWidth:.1f}x{logo.drawHeight:.1f}pt)")
+            log.debug("Logo in Header-Tabelle: %s (Größe: %.1fx%.1fpt)", logo_path, logo.drawWidth, logo.drawHeight)
         except Exception as e:
-            print(f"PDF LOGO DEBUG: Logo error, Fallback ohne Logo: {e}")
+            log.warning("Logo error, Fallback ohne Logo: %s", e)
             for p in header_parts:
                 elements.append(p)
     else:
@@ -492,7 +508,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
             elements.append(p)
 
     elements.append(Spacer(1, 6))
-    print("DEBUG: Finished datetime section, starting starterlist processing...")
+    log.debug("Finished datetime section, starting starterlist processing...")
 
     # --- STARTERLISTE MIT GRUPPIERUNGSLOGIK ---
     # Starterliste + Datum in einer Zeile
@@ -515,6 +531,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     elements.append(Spacer(1, 2*mm))
 
     starters = starterlist.get("starters") or []
+    view = get_view(starterlist)
     breaks = starterlist.get("breaks") or []
     breaks_by_after = {}
     for b in breaks:
@@ -541,13 +558,14 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
             data_texts.append([pause_text, "", "", "", ""])  # 5 Spalten
             meta.append({"type":"pause"})
 
-    print(f"DEBUG: Processing {len(starters)} starters...")
+    log.debug("Processing %s starters...", len(starters))
 
     # GRUPPIERUNGSLOGIK VOM STANDARD TEMPLATE ÜBERNOMMEN - ABER VEREINFACHT
     current_group = None
     group_start_time_shown = False
 
     for s in starters:
+        row = view.row(s)
         # Prüfe auf Gruppenwechsel BEVOR der Starter hinzugefügt wird
         starter_group = s.get("groupNumber")
         
@@ -563,7 +581,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
         nr = s.get("startNumber") or ""
         hors_concours = bool(s.get("horsConcours", False))  # Außer Konkurrenz
-        tstr = _fmt_time(s.get("startTime"))
+        tstr = row.time_str
         
         # Zeit nur beim ersten Starter pro Gruppe zeigen, oder wenn keine Gruppierung
         if starter_group is None or starter_group == 0 or not group_start_time_shown:
@@ -638,7 +656,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 data_texts.append([pause_text, "", "", "", ""])
                 meta.append({"type":"pause"})
 
-    print(f"DEBUG: Created data_texts with {len(data_texts)} rows")
+    log.debug("Created data_texts with %s rows", len(data_texts))
 
     # --- ZURÜCK ZUR EINFACHEN TABELLENLÖSUNG (ohne komplexe Gruppierung) ---
     
@@ -689,10 +707,10 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 maybe_strike(row[4], style_pos),
             ])
 
-    print(f"DEBUG: About to create table with {len(table_rows)} rows")
+    log.debug("About to create table with %s rows", len(table_rows))
 
     try:
-        t = Table(table_rows, colWidths=col_widths, repeatRows=1)
+        t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
         ts = TableStyle([
             ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
             ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
@@ -732,16 +750,16 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
         t.setStyle(ts)
         elements.append(t)
-        print("DEBUG: Table created and added successfully")
+        log.debug("Table created and added successfully")
     except Exception as e:
-        print(f"DEBUG: Table creation error: {e}")
+        log.warning("Table creation error: %s", e)
         raise
 
     # --- Richter ---
     judges = comp.get("judges") or starterlist.get("judges") or []
     judging_rule = comp.get("judgingRule") or starterlist.get("judgingRule")
     if judges:
-        print(f"DEBUG: Adding {len(judges)} judges...")
+        log.debug("Adding %s judges...", len(judges))
         title = "Richter" + (f" ({judging_rule})" if judging_rule else "")
         elements.append(Spacer(1, 10))
         elements.append(Paragraph(f"<b>{title}</b>", style_sub))
@@ -761,16 +779,16 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
             ("ALIGN",(0,0),(0,-1),"CENTER"),
         ]))
         elements.append(jt)
-        print("DEBUG: Judges table added successfully")
+        log.debug("Judges table added successfully")
 
-    print("DEBUG: About to build PDF document...")
+    log.debug("About to build PDF document...")
     try:
         # FooterCanvas nur wenn Banner oder Sponsorenleiste aktiv
         if show_banner or show_sponsor_bar:
-            doc.build(elements, canvasmaker=FooterCanvas)
+            doc.build(elements, canvasmaker=canvas_maker(FooterCanvas, print_options))
         else:
             doc.build(elements)
-        print("DEBUG: PDF build completed successfully!")
+        log.debug("PDF build completed successfully!")
     except Exception as e:
-        print(f"DEBUG: PDF build error: {e}")
+        log.warning("PDF build error: %s", e)
         raise
\ No newline at end of file
@@ -7,10 +7,21 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
+from starterlist_view import get_view
 from datetime import datetime
 import os
 from PIL import Image as PILImage
 from io import BytesIO
+from render_context import asset_path, canvas_maker
+
+TEMPLATE_INFO = {
+    "discipline": "dressur",
+    "language": "en",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided"],
+    "cost": "heavy",
+}
 
 WEEKDAY_MAP = {
     "Monday": "Monday", "Tuesday": "Tuesday", "Wednesday": "Wednesday",
@@ -327,9 +338,9 @@ def find_flag_image(nat_code):
     return None
 
 
-def get_sponsor_bar_height():
+def get_sponsor_bar_height(print_options=None):
     """Ermittelt die tatsächliche Höhe der Sponsorenleiste"""
-    sponsor_path = "logos/sponsorenleiste.png"
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if os.path.exists(sponsor_path):
         try:
             from reportlab.lib.utils import ImageReader
@@ -353,13 +364,14 @@ class FooterCanvas(canvas.Canvas):
     _print_options = {}
     
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num = 0
         self.banner_path = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -396,7 +408,7 @@ class FooterCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 img_width = 190*mm
@@ -419,8 +431,6 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     show_title = print_options.get("show_title", True)
     show_header = print_options.get("show_header", True)
     
-    FooterCanvas._print_options = print_options
-    
     has_sponsor_paper = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
     
@@ -430,7 +440,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         
         # Mindest-Unterrand wenn Sponsorenleiste aktiv ist
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm = (4*mm + sponsor_height + 1*mm) / mm
         else:
             min_bottom_mm = 10  # 1cm Minimum
@@ -478,7 +488,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         
         page_width = A4[0] - 16*mm
     else:
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         footer_space = 4*mm
         margin_above_sponsor = 1*mm
         bottom_margin = footer_space + sponsor_height + margin_above_sponsor if show_sponsor_bar else 8*mm
@@ -502,7 +512,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     # Banner-Spacer nur wenn Banner angezeigt wird
     has_banner = False
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -652,6 +662,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     elements.append(Spacer(1, 2*mm))
 
     starters = starterlist.get("starters") or []
+    view = get_view(starterlist)
     breaks = starterlist.get("breaks") or []
     breaks_by_after = {}
     for b in breaks:
@@ -686,6 +697,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     group_start_time_shown = False
 
     for s in starters:
+        row = view.row(s)
         # Prüfe auf Gruppenwechsel BEVOR der Starter hinzugefügt wird
         starter_group = s.get("groupNumber")
         
@@ -701,7 +713,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
         nr = s.get("startNumber") or ""
         hors_concours = bool(s.get("horsConcours", False))  # Außer Konkurrenz
-        tstr = _fmt_time(s.get("startTime"))
+        tstr = row.time_str
         
         # Zeit nur beim ersten Starter pro Gruppe zeigen, oder wenn keine Gruppierung
         if starter_group is None or starter_group == 0 or not group_start_time_shown:
@@ -795,7 +807,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 # Ausländer
                 if not club or club.strip() == "" or club.strip().upper() == "GASTLIZENZ GER":
                     # Kein Verein oder Gastlizenz → Land ausgeschrieben anzeigen
-                    country_full = get_country_name(nationality)
+                    country_full = row.country_en
                     if country_full:
                         rider_line += f" - <font size=7>{country_full}</font>"
                 else:
@@ -826,15 +838,9 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
             details_parts = []
             
             # DYNAMISCHES ALTER statt Jahr - ZUERST
-            breeding_season = _safe_get(horse, "breedingSeason", "")
-            if breeding_season:
-                try:
-                    from datetime import datetime
-                    current_year = datetime.now().year
-                    age = current_year - int(breeding_season)
-                    details_parts.append(f"{age}y.")
-                except:
-                    pass
+            age = row.age
+            if age is not None:
+                details_parts.append(f"{age}y.")
             
             # FARBE - ZWEITE
             color = _safe_get(horse, "color", "")
@@ -876,19 +882,9 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         combined_content = "<br/>".join(content_parts)
 
         # Nationalität mit Flagge + Kürzel (nationality wurde bereits oben definiert)
-        nat_code_iso = get_nationality_code(nationality) if nationality else ""
-        
-        # Display-Code: Rück-Konvertierung ISO → IOC für Anzeige
-        iso_to_display = {
-            "DEU": "GER", "NLD": "NED", "CHE": "SUI", "DNK": "DEN", "HRV": "CRO", "GRC": "GRE",
-            "BGR": "BUL", "ZAF": "RSA", "PRT": "POR", "LVA": "LAT", "ARE": "UAE", "CHL": "CHI",
-            "URY": "URU", "SVN": "SLO", "MYS": "MAS", "GBR": "GBR", "AUT": "AUT", "BEL": "BEL",
-            "FRA": "FRA", "ITA": "ITA", "ESP": "ESP", "SWE": "SWE", "NOR": "NOR", "POL": "POL",
-            "CZE": "CZE", "HUN": "HUN", "ROU": "ROU", "IRL": "IRL", "USA": "USA", "CAN": "CAN",
-        }
-        nat_code_display = iso_to_display.get(nat_code_iso, nat_code_iso)
+        nat_code_display = row.nat_code
         
-        flag_path = find_flag_image(nat_code_iso)
+        flag_path = row.flag_path
         
         # Flagge + Kürzel in Mini-Tabelle
         nat_cell = ""  # Default fallback
@@ -993,7 +989,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 maybe_strike(row[5], style_pos), maybe_strike(row[6], style_pos)  # 7 Spalten
             ])
 
-    t = Table(table_rows, colWidths=col_widths, repeatRows=1)
+    t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
     ts = TableStyle([
         ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
         ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
@@ -1063,6 +1059,6 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         elements.append(jt)
 
     if show_banner or show_sponsor_bar:
-        doc.build(elements, canvasmaker=FooterCanvas)
+        doc.build(elements, canvasmaker=canvas_maker(FooterCanvas, print_options))
     else:
         doc.build(elements)
\ No newline at end of file
@@ -7,10 +7,21 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
+from starterlist_view import get_view
 from datetime import datetime
 import os
 from PIL import Image as PILImage
 from io import BytesIO
+from render_context import asset_path, canvas_maker
+
+TEMPLATE_INFO = {
+    "discipline": "dressur",
+    "language": "de",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided"],
+    "cost": "normal",
+}
 
 WEEKDAY_MAP = {
     "Monday": "Montag", "Tuesday": "Dienstag", "Wednesday": "Mittwoch",
@@ -167,9 +178,9 @@ def _get_ordered_judges_all(judges):
     return ordered_dressage + other_judges
 
 
-def get_sponsor_bar_height():
+def get_sponsor_bar_height(print_options=None):
     """Ermittelt die tatsächliche Höhe der Sponsorenleiste"""
-    sponsor_path = "logos/sponsorenleiste.png"
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if os.path.exists(sponsor_path):
         try:
             from reportlab.lib.utils import ImageReader
@@ -193,13 +204,14 @@ class FooterCanvas(canvas.Canvas):
     _print_options = {}
     
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num = 0
         self.banner_path = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -236,7 +248,7 @@ class FooterCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 img_width = 190*mm
@@ -259,8 +271,6 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     show_title = print_options.get("show_title", True)
     show_header = print_options.get("show_header", True)
     
-    FooterCanvas._print_options = print_options
-    
     has_sponsor_paper = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
     
@@ -270,7 +280,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         
         # Mindest-Unterrand wenn Sponsorenleiste aktiv ist
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm = (4*mm + sponsor_height + 1*mm) / mm
         else:
             min_bottom_mm = 10  # 1cm Minimum
@@ -318,7 +328,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         
         page_width = A4[0] - 16*mm
     else:
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         footer_space = 4*mm
         margin_above_sponsor = 1*mm
         bottom_margin = footer_space + sponsor_height + margin_above_sponsor if show_sponsor_bar else 8*mm
@@ -342,7 +352,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     # Banner-Spacer nur wenn Banner angezeigt wird
     has_banner = False
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -491,6 +501,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     elements.append(Spacer(1, 2*mm))
 
     starters = starterlist.get("starters") or []
+    view = get_view(starterlist)
     breaks = starterlist.get("breaks") or []
     breaks_by_after = {}
     for b in breaks:
@@ -525,6 +536,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     group_start_time_shown = False
 
     for s in starters:
+        row = view.row(s)
         # Prüfe auf Gruppenwechsel BEVOR der Starter hinzugefügt wird
         starter_group = s.get("groupNumber")
         
@@ -540,7 +552,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
         nr = s.get("startNumber") or ""
         hors_concours = bool(s.get("horsConcours", False))  # Außer Konkurrenz
-        tstr = _fmt_time(s.get("startTime"))
+        tstr = row.time_str
         
         # Zeit nur beim ersten Starter pro Gruppe zeigen, oder wenn keine Gruppierung
         if starter_group is None or starter_group == 0 or not group_start_time_shown:
@@ -690,7 +702,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
                 maybe_strike(row[6], style_pos),
             ])
 
-    t = Table(table_rows, colWidths=col_widths, repeatRows=1)
+    t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
     ts = TableStyle([
         ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
         ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
@@ -761,6 +773,6 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         elements.append(jt)
 
     if show_banner or show_sponsor_bar:
-        doc.build(elements, canvasmaker=FooterCanvas)
+        doc.build(elements, canvasmaker=canvas_maker(FooterCanvas, print_options))
     else:
         doc.build(elements)
\ No newline at end of file
@@ -20,10 +20,24 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
 from datetime import datetime
 import os
 from PIL import Image as PILImage
 
+from app_logging import get_logger
+from render_context import asset_path, canvas_maker
+
+log = get_logger("templates.pdf.pdf_dre_derby_cloud")
+
+TEMPLATE_INFO = {
+    "discipline": "dressur",
+    "language": "de",
+    "inputs": ["derby_times"],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title"],
+    "cost": "light",
+}
+
 # ---------------------------------------------------------------------------
 # Übersetzungs-Maps
 # ---------------------------------------------------------------------------
@@ -271,8 +285,8 @@ def _ask_times():
 # ---------------------------------------------------------------------------
 # Sponsoren-Höhe
 # ---------------------------------------------------------------------------
-def get_sponsor_bar_height():
-    path = "logos/sponsorenleiste.png"
+def get_sponsor_bar_height(print_options=None):
+    path = asset_path(print_options, "sponsorenleiste.png")
     if not os.path.exists(path):
         return 25 * mm
     try:
@@ -290,13 +304,14 @@ class BannerCanvas(canvas.Canvas):
     _print_options = {}
 
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num  = 0
         self.banner_path   = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil = PILImage.open(bp)
@@ -329,7 +344,7 @@ class BannerCanvas(canvas.Canvas):
     def _draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sp = "logos/sponsorenleiste.png"
+        sp = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sp):
             try:
                 self.drawImage(sp, (A4[0] - 190 * mm) / 2, 4 * mm,
@@ -456,15 +471,13 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     show_title     = print_options.get("show_title",    True)
     show_header    = print_options.get("show_header",   True)
 
-    BannerCanvas._print_options = print_options
-
     # Cloud-Version: Zeiten aus derby_config im starterlist-Dict lesen
     derby_cfg = starterlist.get("derby_config", {})
     begin_time = derby_cfg.get("begin_time", "")
     final_time = derby_cfg.get("final_time", "")
 
     # --- Dokument-Setup (wie pdf_nat) ---
-    sponsor_height  = get_sponsor_bar_height() if show_sponsor else 0
+    sponsor_height  = get_sponsor_bar_height(print_options) if show_sponsor else 0
     bottom_margin   = 4 * mm + sponsor_height + 1 * mm if show_sponsor else 8 * mm
 
     doc = SimpleDocTemplate(
@@ -477,7 +490,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
 
     # --- Banner-Platzhalter ---
     if show_banner:
-        bp = os.path.join("logos", "banner.png")
+        bp = asset_path(print_options, "banner.png")
         if os.path.exists(bp):
             try:
                 pil = PILImage.open(bp)
@@ -850,7 +863,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                 maybe_strike(row[7], style_pos), maybe_strike(row[8], style_pos),
             ])
 
-    t = Table(table_rows, colWidths=col_widths, repeatRows=1)
+    t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
     ts = TableStyle([
         ("GRID",       (0,0), (-1,-1), 0.25, colors.grey),
         ("BACKGROUND", (0,0), (-1,0),  colors.HexColor("#404040")),
@@ -898,8 +911,8 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
 
     # --- PDF bauen ---
     if show_banner or show_sponsor:
-        doc.build(elements, canvasmaker=BannerCanvas)
+        doc.build(elements, canvasmaker=canvas_maker(BannerCanvas, print_options))
     else:
         doc.build(elements)
 
-    print(f"PDF Derby Cloud: {filename}")
+    log.debug("PDF Derby Cloud: %s", filename)
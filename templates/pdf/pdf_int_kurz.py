@@ -7,9 +7,25 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
+from starterlist_view import get_view
 from datetime import datetime
 import os
 from PIL import Image as PILImage
+from pdf_fast_table import FastTable, FastRow, FastCell, run
+
+from app_logging import get_logger
+from render_context import asset_path, canvas_maker
+
+log = get_logger("templates.pdf.pdf_int_kurz")
+
+TEMPLATE_INFO = {
+    "discipline": "allgemein",
+    "language": "en",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided", "fast_render"],
+    "cost": "heavy",
+}
 
 # No translation needed - English is default
 
@@ -241,8 +257,8 @@ def format_pause_text(total_seconds, info):
     else:
         return f"Break ({secs} Sek.){' - ' + info if info else ''}"
 
-def get_sponsor_bar_height():
-    sponsor_path = "logos/sponsorenleiste.png"
+def get_sponsor_bar_height(print_options=None):
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if not os.path.exists(sponsor_path):
         return 25*mm
     try:
@@ -257,13 +273,14 @@ class BannerCanvas(canvas.Canvas):
     _print_options = {}
     
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num = 0
         self.banner_path = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -300,7 +317,7 @@ class BannerCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 self.drawImage(sponsor_path, (A4[0] - 190*mm) / 2, 4*mm, width=190*mm, height=self.sponsor_height, preserveAspectRatio=True, mask='auto')
@@ -308,6 +325,46 @@ class BannerCanvas(canvas.Canvas):
                 pass
 
 
+def _build_fast_table(data_texts, meta, col_widths):
+    """Starterliste als FastTable aus den bereits aufbereiteten Zeilentexten (print option fast_render)."""
+    dark   = colors.HexColor('#404040')
+    gray   = colors.HexColor('#E8E8E8')
+    aligns = ["CENTER", "CENTER", "CENTER", "LEFT", "LEFT", "CENTER"]
+    rows = []
+    starter_row_count = 0
+    for row, m in zip(data_texts, meta):
+        if m["type"] == "header":
+            rows.append(FastRow([FastCell.markup(txt, "Helvetica-Bold", 9, align=a, leading=11) for txt, a in zip(row, aligns)],
+                                background=dark, text_color=colors.white))
+        elif m["type"] == "group":
+            rows.append(FastRow([FastCell.markup(row[0], "Helvetica-Bold", 10, leading=12)],
+                                background=dark, text_color=colors.white, span=True))
+            starter_row_count = 0
+        elif m["type"] == "pause":
+            prev_was_gray = (starter_row_count - 1) % 2 == 1
+            rows.append(FastRow([FastCell.markup(row[0], "Helvetica-Bold", 9, align="CENTER", leading=11)],
+                                background=None if prev_was_gray else gray, span=True))
+            starter_row_count -= 1
+        else:
+            if m.get("flag"):
+                # Wie die Mini-Tabelle im platypus-Pfad: Code-Zeile 10 pt + je 1 pt unter Flagge und Code
+                nat_cell = FastCell([[run(m.get("nat", ""), "Helvetica", 6)]], align="CENTER",
+                                    image=(m["flag"], 5*mm, 3.5*mm), leading=12)
+            else:
+                nat_cell = FastCell.markup(str(row[5]), "Helvetica", 8, align="CENTER", leading=10)
+            # leading wie style_pos / style_horse / style_rider
+            rows.append(FastRow([
+                FastCell.markup(row[0], "Helvetica", 8, align="CENTER", leading=10),
+                FastCell.markup(row[1], "Helvetica", 8, align="CENTER", leading=10),
+                FastCell.markup(row[2], "Helvetica", 8, align="CENTER", leading=10),
+                FastCell.markup(row[3], "Helvetica", 9, leading=10),
+                FastCell.markup(row[4], "Helvetica", 9, leading=10),
+                nat_cell,
+            ], background=gray if starter_row_count % 2 == 1 else None, strike=m.get("withdrawn", False)))
+            starter_row_count += 1
+    return FastTable(col_widths, rows, header_rows=1, padding=(2, 6, 2, 6), grid="below", line_width=0.5)
+
+
 def render(starterlist, filename, logo_max_width_cm=5.0):
     # Druckoptionen auslesen
     print_options = starterlist.get("printOptions", {})
@@ -318,8 +375,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     show_sponsor_bar = print_options.get("show_sponsor_bar", True)
     show_title = print_options.get("show_title", True)
     show_header = print_options.get("show_header", True)
-    
-    BannerCanvas._print_options = print_options
+    fast_render = print_options.get("fast_render", False)
     
     has_sponsor_paper = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
@@ -329,7 +385,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         spacing_bottom_cm = starterlist.get("spacingBottomCm", 2.0)
         
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm = (4*mm + sponsor_height + 1*mm) / mm
         else:
             min_bottom_mm = 10
@@ -376,7 +432,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         
         page_width = A4[0] - 20*mm
     else:
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         footer_space = 4*mm
         margin_above_sponsor = 1*mm
         bottom_margin = footer_space + sponsor_height + margin_above_sponsor if show_sponsor_bar else 8*mm
@@ -388,7 +444,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     # Banner-Spacer nur wenn Banner angezeigt wird
     has_banner = False
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -569,14 +625,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     
     # Tabelle - wie pdf_abstammung_logo
     starters = starterlist.get("starters", [])
+    view = get_view(starterlist)
     breaks = starterlist.get("breaks", [])
-    breaks_map = {}
-    for b in breaks:
-        try:
-            k = int(b.get("afterNumberInCompetition", -1))
-            breaks_map.setdefault(k, []).append(b)
-        except:
-            pass
+    breaks_map = view.breaks_map
     
     data_texts = []
     meta = []
@@ -598,6 +649,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     group_start_time_shown = False
     
     for s in starters:
+        row = view.row(s)
         # Prüfe auf Gruppenwechsel (Abteilung) BEVOR der Starter hinzugefügt wird
         starter_group = s.get("groupNumber")
         
@@ -616,7 +668,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         
         # Zeit nur beim ersten Starter pro Gruppe zeigen, oder wenn keine Gruppierung
         if starter_group is None or starter_group == 0 or not group_start_time_shown:
-            time_str = format_time(s.get("startTime", ""))
+            time_str = row.time_str
             if starter_group is not None and starter_group > 0:
                 group_start_time_shown = True  # Markiere Zeit als gezeigt
         else:
@@ -636,14 +688,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                 horse_html += f" - <font size=7>{studbook}</font>"
             
             details = []
-            breeding_season = horse.get("breedingSeason")
-            if breeding_season:
-                try:
-                    current_year = datetime.now().year
-                    age = current_year - int(breeding_season)
-                    details.append(f"{age}Y")
-                except:
-                    pass
+            age = row.age
+            if age is not None:
+                details.append(f"{age}Y")
             
             color = horse.get("color", "")
             if color:
@@ -678,17 +725,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
             athlete_html += f"<br/><font size=7>{owner}</font>"
         
         # Nationalität mit Flagge UND Kürzel
-        nat_code_iso = get_nationality_code(nationality) if nationality else ""  # ISO für Mapping
-        
-        # Display-Code: Rück-Konvertierung ISO → IOC für Anzeige
-        iso_to_display = {
-            "DEU": "GER", "NLD": "NED", "CHE": "SUI", "DNK": "DEN", "HRV": "CRO", "GRC": "GRE",
-            "BGR": "BUL", "ZAF": "RSA", "PRT": "POR", "LVA": "LAT", "ARE": "UAE", "CHL": "CHI",
-            "URY": "URU", "SVN": "SLO", "MYS": "MAS", "GBR": "GBR",
-        }
-        nat_code_display = iso_to_display.get(nat_code_iso, nat_code_iso)  # Anzeige-Code (GER, GBR, etc.)
+        nat_code_display = row.nat_code  # Anzeige-Code (GER, GBR, etc.)
         
-        flag_path = find_flag_image(nat_code_iso)
+        flag_path = row.flag_path
         
         # Flagge + Kürzel in Mini-Tabelle
         if flag_path and os.path.exists(flag_path):
@@ -705,12 +744,12 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                     ('TOPPADDING', (0,0), (-1,-1), 0),
                     ('BOTTOMPADDING', (0,0), (-1,-1), 1),
                 ]))
-                print(f"DEBUG: Flagge+Code für {nat_code_display}: {flag_path}")
+                log.debug("Flagge+Code für %s: %s", nat_code_display, flag_path)
             except Exception as e:
-                print(f"DEBUG: Flagge FEHLER für {nat_code_display}: {e}")
+                log.warning("Flagge FEHLER für %s: %s", nat_code_display, e)
                 nat_cell = nat_code_display
         else:
-            print(f"DEBUG: Keine Flagge für {nat_code_display}")
+            log.debug("Keine Flagge für %s", nat_code_display)
             nat_cell = nat_code_display
         
         # Startnummer mit optionalem AK-Zusatz
@@ -720,7 +759,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         
         data_texts.append([nr_display, time_str, cno, horse_html, athlete_html, nat_cell])
         withdrawn_flag = bool(s.get("withdrawn", False))
-        meta.append({"type": "starter", "withdrawn": withdrawn_flag, "horsConcours": hors_concours})
+        meta.append({"type": "starter", "withdrawn": withdrawn_flag, "horsConcours": hors_concours,
+                     "flag": flag_path if flag_path and os.path.exists(flag_path) else None,
+                     "nat": nat_code_display})
         
         # Break
         try:
@@ -737,100 +778,104 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     # Spaltenbreiten (page_width wurde oben berechnet)
     col_widths = [10*mm, 16*mm, 12*mm, page_width - 10*mm - 16*mm - 12*mm - 54*mm - 13*mm, 54*mm, 13*mm]
     
-    table_rows = []
-    for i, row in enumerate(data_texts):
-        if i >= len(meta):
-            continue
-        
-        m = meta[i]
-        if m["type"] == "header":
-            table_rows.append([
-                Paragraph(row[0], style_hdr), Paragraph(row[1], style_hdr),
-                Paragraph(row[2], style_hdr), Paragraph(row[3], style_hdr_left),
-                Paragraph(row[4], style_hdr_left), Paragraph(row[5], style_hdr)
-            ])
-        elif m["type"] == "group":
-            # Abteilungs-Header (fett, grau)
-            table_rows.append([
-                Paragraph(f"<b>{row[0]}</b>", style_group), Paragraph("", style_sub),
-                Paragraph("", style_sub), Paragraph("", style_sub),
-                Paragraph("", style_sub), Paragraph("", style_sub)
-            ])
-        elif m["type"] == "pause":
-            table_rows.append([
-                Paragraph(row[0], style_pause), Paragraph("", style_sub),
-                Paragraph("", style_sub), Paragraph("", style_sub),
-                Paragraph("", style_sub), Paragraph("", style_sub)
-            ])
-        else:
-            withdrawn = m.get("withdrawn", False)
-            def maybe_strike(text, s):
-                if not text:
-                    return Paragraph("", s)
-                return Paragraph(f"<strike>{text}</strike>" if withdrawn else text, s)
-            
-            # Nat-Spalte: Wenn Table-Objekt (Flagge+Code) direkt nutzen, sonst Paragraph
-            nat_value = row[5]
-            if isinstance(nat_value, Table):
-                nat_cell_final = nat_value
-            elif isinstance(nat_value, Image):
-                nat_cell_final = nat_value
+    if fast_render:
+        elements.append(_build_fast_table(data_texts, meta, col_widths))
+    else:
+        table_rows = []
+        for i, row in enumerate(data_texts):
+            if i >= len(meta):
+                continue
+        
+            m = meta[i]
+            if m["type"] == "header":
+                table_rows.append([
+                    Paragraph(row[0], style_hdr), Paragraph(row[1], style_hdr),
+                    Paragraph(row[2], style_hdr), Paragraph(row[3], style_hdr_left),
+                    Paragraph(row[4], style_hdr_left), Paragraph(row[5], style_hdr)
+                ])
+            elif m["type"] == "group":
+                # Abteilungs-Header (fett, grau)
+                table_rows.append([
+                    Paragraph(f"<b>{row[0]}</b>", style_group), Paragraph("", style_sub),
+                    Paragraph("", style_sub), Paragraph("", style_sub),
+                    Paragraph("", style_sub), Paragraph("", style_sub)
+                ])
+            elif m["type"] == "pause":
+                table_rows.append([
+                    Paragraph(row[0], style_pause), Paragraph("", style_sub),
+                    Paragraph("", style_sub), Paragraph("", style_sub),
+                    Paragraph("", style_sub), Paragraph("", style_sub)
+                ])
             else:
-                nat_cell_final = Paragraph(str(nat_value), style_pos)
+                withdrawn = m.get("withdrawn", False)
+                def maybe_strike(text, s):
+                    if not text:
+                        return Paragraph("", s)
+                    return Paragraph(f"<strike>{text}</strike>" if withdrawn else text, s)
             
-            table_rows.append([
-                maybe_strike(row[0], style_pos),
-                maybe_strike(row[1], style_pos),
-                maybe_strike(row[2], style_pos),
-                maybe_strike(row[3], style_horse),
-                maybe_strike(row[4], style_rider),
-                nat_cell_final
-            ])
+                # Nat-Spalte: Wenn Table-Objekt (Flagge+Code) direkt nutzen, sonst Paragraph
+                nat_value = row[5]
+                if isinstance(nat_value, Table):
+                    nat_cell_final = nat_value
+                elif isinstance(nat_value, Image):
+                    nat_cell_final = nat_value
+                else:
+                    nat_cell_final = Paragraph(str(nat_value), style_pos)
+            
+                table_rows.append([
+                    maybe_strike(row[0], style_pos),
+                    maybe_strike(row[1], style_pos),
+                    maybe_strike(row[2], style_pos),
+                    maybe_strike(row[3], style_horse),
+                    maybe_strike(row[4], style_rider),
+                    nat_cell_final
+                ])
     
-    t = Table(table_rows, colWidths=col_widths, repeatRows=1)
-    ts = TableStyle([
-        ("LINEBELOW", (0,0), (-1,-1), 0.5, colors.black),  # Nur horizontale Linien!
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor('#404040')),
-        ("TEXTCOLOR", (0,0), (-1,0), colors.white),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-        ("ALIGN", (0,0), (2,-1), "CENTER"),
-        ("ALIGN", (3,0), (4,-1), "LEFT"),
-        ("ALIGN", (5,0), (5,-1), "CENTER"),
-        # Kompaktere Zeilen: Reduzierte Paddings
-        ("TOPPADDING", (0,0), (-1,-1), 2),      # Standard war 6
-        ("BOTTOMPADDING", (0,0), (-1,-1), 2),   # Standard war 6,
-    ])
+        t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
+        ts = TableStyle([
+            ("LINEBELOW", (0,0), (-1,-1), 0.5, colors.black),  # Nur horizontale Linien!
+            ("BACKGROUND", (0,0), (-1,0), colors.HexColor('#404040')),
+            ("TEXTCOLOR", (0,0), (-1,0), colors.white),
+            ("VALIGN", (0,0), (-1,-1), "TOP"),
+            ("ALIGN", (0,0), (2,-1), "CENTER"),
+            ("ALIGN", (3,0), (4,-1), "LEFT"),
+            ("ALIGN", (5,0), (5,-1), "CENTER"),
+            # Kompaktere Zeilen: Reduzierte Paddings
+            ("TOPPADDING", (0,0), (-1,-1), 2),      # Standard war 6
+            ("BOTTOMPADDING", (0,0), (-1,-1), 2),   # Standard war 6,
+        ])
     
-    # SPAN + Zebra - mit Gruppen-Logik!
-    starter_row_count = 0
-    for ri in range(1, len(table_rows)):
-        if ri < len(meta):
-            m = meta[ri]
-            if m.get("type") == "group":
-                # Abteilungs-Header: SPAN über alle Spalten, grauer Hintergrund
-                ts.add("SPAN", (0,ri), (5,ri))
-                ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#404040'))
-                # Counter zurücksetzen für neue Abteilung
-                starter_row_count = 0
-            elif m.get("type") == "starter":
-                # Zebra: ungerade Starter sind grau (1, 3, 5, ...)
-                if starter_row_count % 2 == 1:
-                    ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#E8E8E8'))
-                starter_row_count += 1
-            elif m.get("type") == "pause":
-                ts.add("SPAN", (0,ri), (5,ri))
-                prev_was_gray = (starter_row_count - 1) % 2 == 1
-                if not prev_was_gray:  # Vorherige war weiß → Pause grau
-                    ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#E8E8E8'))
-                # WICHTIG: Counter um 1 zurücksetzen, damit nächste Zeile gleiche Farbe hat!
-                starter_row_count -= 1
+        # SPAN + Zebra - mit Gruppen-Logik!
+        starter_row_count = 0
+        for ri in range(1, len(table_rows)):
+            if ri < len(meta):
+                m = meta[ri]
+                if m.get("type") == "group":
+                    # Abteilungs-Header: SPAN über alle Spalten, grauer Hintergrund
+                    ts.add("SPAN", (0,ri), (5,ri))
+                    ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#404040'))
+                    # Counter zurücksetzen für neue Abteilung
+                    starter_row_count = 0
+                elif m.get("type") == "starter":
+                    # Zebra: ungerade Starter sind grau (1, 3, 5, ...)
+                    if starter_row_count % 2 == 1:
+                        ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#E8E8E8'))
+                    starter_row_count += 1
+                elif m.get("type") == "pause":
+                    ts.add("SPAN", (0,ri), (5,ri))
+                    prev_was_gray = (starter_row_count - 1) % 2 == 1
+                    if not prev_was_gray:  # Vorherige war weiß → Pause grau
+                        ts.add("BACKGROUND", (0,ri), (5,ri), colors.HexColor('#E8E8E8'))
+                    # WICHTIG: Counter um 1 zurücksetzen, damit nächste Zeile gleiche Farbe hat!
+                    starter_row_count -= 1
+    
+        t.setStyle(ts)
+        elements.append(t)
     
-    t.setStyle(ts)
-    elements.append(t)
     
     # Build mit Footer-Canvas
     if show_banner or show_sponsor_bar:
-        doc.build(elements, canvasmaker=BannerCanvas)
+        doc.build(elements, canvasmaker=canvas_maker(BannerCanvas, print_options))
     else:
         doc.build(elements)
-    print(f"PDF INT: {filename}")
+    log.debug("PDF INT: %s", filename)
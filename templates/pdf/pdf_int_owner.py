@@ -7,10 +7,25 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
+from pdf_table_chunks import ChunkedTable
+from starterlist_view import get_view
 from datetime import datetime
 import os
 from PIL import Image as PILImage
 
+from app_logging import get_logger
+from render_context import asset_path, canvas_maker
+
+log = get_logger("templates.pdf.pdf_int_owner")
+
+TEMPLATE_INFO = {
+    "discipline": "allgemein",
+    "language": "en",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided"],
+    "cost": "heavy",
+}
+
 # No translation needed - English is default
 
 def get_nationality_code(nationality_str):
@@ -241,8 +256,8 @@ def format_pause_text(total_seconds, info):
     else:
         return f"Break ({secs} Sek.){' - ' + info if info else ''}"
 
-def get_sponsor_bar_height():
-    sponsor_path = "logos/sponsorenleiste.png"
+def get_sponsor_bar_height(print_options=None):
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if not os.path.exists(sponsor_path):
         return 25*mm
     try:
@@ -257,13 +272,14 @@ class BannerCanvas(canvas.Canvas):
     _print_options = {}
     
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num = 0
         self.banner_path = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -300,7 +316,7 @@ class BannerCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 self.drawImage(sponsor_path, (A4[0] - 190*mm) / 2, 4*mm, width=190*mm, height=self.sponsor_height, preserveAspectRatio=True, mask='auto')
@@ -319,8 +335,6 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     show_title = print_options.get("show_title", True)
     show_header = print_options.get("show_header", True)
     
-    BannerCanvas._print_options = print_options
-    
     has_sponsor_paper = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
     
@@ -329,7 +343,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         spacing_bottom_cm = starterlist.get("spacingBottomCm", 2.0)
         
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm = (4*mm + sponsor_height + 1*mm) / mm
         else:
             min_bottom_mm = 10
@@ -376,7 +390,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         
         page_width = A4[0] - 20*mm
     else:
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         footer_space = 4*mm
         margin_above_sponsor = 1*mm
         bottom_margin = footer_space + sponsor_height + margin_above_sponsor if show_sponsor_bar else 8*mm
@@ -388,7 +402,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     # Banner-Spacer nur wenn Banner angezeigt wird
     has_banner = False
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -569,14 +583,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     
     # Tabelle - wie pdf_abstammung_logo
     starters = starterlist.get("starters", [])
+    view = get_view(starterlist)
     breaks = starterlist.get("breaks", [])
-    breaks_map = {}
-    for b in breaks:
-        try:
-            k = int(b.get("afterNumberInCompetition", -1))
-            breaks_map.setdefault(k, []).append(b)
-        except:
-            pass
+    breaks_map = view.breaks_map
     
     data_texts = []
     meta = []
@@ -598,6 +607,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     group_start_time_shown = False
     
     for s in starters:
+        row = view.row(s)
         # Prüfe auf Gruppenwechsel (Abteilung) BEVOR der Starter hinzugefügt wird
         starter_group = s.get("groupNumber")
         
@@ -616,7 +626,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
         
         # Zeit nur beim ersten Starter pro Gruppe zeigen, oder wenn keine Gruppierung
         if starter_group is None or starter_group == 0 or not group_start_time_shown:
-            time_str = format_time(s.get("startTime", ""))
+            time_str = row.time_str
             if starter_group is not None and starter_group > 0:
                 group_start_time_shown = True  # Markiere Zeit als gezeigt
         else:
@@ -636,14 +646,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                 horse_html += f" - <font size=7>{studbook}</font>"
             
             details = []
-            breeding_season = horse.get("breedingSeason")
-            if breeding_season:
-                try:
-                    current_year = datetime.now().year
-                    age = current_year - int(breeding_season)
-                    details.append(f"{age}Y")
-                except:
-                    pass
+            age = row.age
+            if age is not None:
+                details.append(f"{age}Y")
             
             color = horse.get("color", "")
             if color:
@@ -682,7 +687,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
             # Foreigner
             if not club or club.strip() == "" or club.strip().upper() == "GASTLIZENZ GER":
                 # No club or guest license → Show country name
-                country_full = get_country_name_english(nationality)
+                country_full = row.country_en
                 if country_full:
                     athlete_html += f"<br/><font size=7>{country_full}</font>"
             else:
@@ -693,17 +698,9 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
             athlete_html += f"<br/><font size=7>{club}</font>"
         
         # Nationalität mit Flagge UND Kürzel
-        nat_code_iso = get_nationality_code(nationality) if nationality else ""  # ISO für Mapping
-        
-        # Display-Code: Rück-Konvertierung ISO → IOC für Anzeige
-        iso_to_display = {
-            "DEU": "GER", "NLD": "NED", "CHE": "SUI", "DNK": "DEN", "HRV": "CRO", "GRC": "GRE",
-            "BGR": "BUL", "ZAF": "RSA", "PRT": "POR", "LVA": "LAT", "ARE": "UAE", "CHL": "CHI",
-            "URY": "URU", "SVN": "SLO", "MYS": "MAS", "GBR": "GBR",
-        }
-        nat_code_display = iso_to_display.get(nat_code_iso, nat_code_iso)  # Anzeige-Code (GER, GBR, etc.)
+        nat_code_display = row.nat_code  # Anzeige-Code (GER, GBR, etc.)
         
-        flag_path = find_flag_image(nat_code_iso)
+        flag_path = row.flag_path
         
         # Flagge + Kürzel in Mini-Tabelle
         if flag_path and os.path.exists(flag_path):
@@ -720,12 +717,12 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                     ('TOPPADDING', (0,0), (-1,-1), 0),
                     ('BOTTOMPADDING', (0,0), (-1,-1), 1),
                 ]))
-                print(f"DEBUG: Flagge+Code für {nat_code_display}: {flag_path}")
+                log.debug("Flagge+Code für %s: %s", nat_code_display, flag_path)
             except Exception as e:
-                print(f"DEBUG: Flagge FEHLER für {nat_code_display}: {e}")
+                log.warning("Flagge FEHLER für %s: %s", nat_code_display, e)
                 nat_cell = nat_code_display
         else:
-            print(f"DEBUG: Keine Flagge für {nat_code_display}")
+            log.debug("Keine Flagge für %s", nat_code_display)
             nat_cell = nat_code_display
         
         # Startnummer mit optionalem AK-Zusatz
@@ -802,7 +799,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
                 nat_cell_final
             ])
     
-    t = Table(table_rows, colWidths=col_widths, repeatRows=1)
+    t = ChunkedTable(table_rows, colWidths=col_widths, repeatRows=1)
     ts = TableStyle([
         ("LINEBELOW", (0,0), (-1,-1), 0.5, colors.black),  # Nur horizontale Linien!
         ("BACKGROUND", (0,0), (-1,0), colors.HexColor('#404040')),
@@ -845,7 +842,7 @@ def render(starterlist, filename, logo_max_width_cm=5.0):
     
     # Build mit Footer-Canvas
     if show_banner or show_sponsor_bar:
-        doc.build(elements, canvasmaker=BannerCanvas)
+        doc.build(elements, canvasmaker=canvas_maker(BannerCanvas, print_options))
     else:
         doc.build(elements)
-    print(f"PDF INT: {filename}")
+    log.debug("PDF INT: %s", filename)
@@ -11,6 +11,20 @@ from reportlab.pdfgen import canvas
 from datetime import datetime
 import os
 from PIL import Image as PILImage
+from pdf_fast_table import FastTable, FastRow, FastCell, run
+
+from app_logging import get_logger
+from render_context import asset_path, canvas_maker
+
+log = get_logger("templates.pdf.pdf_vs_Hinderniskarte")
+
+TEMPLATE_INFO = {
+    "discipline": "vielseitigkeit",
+    "language": "de",
+    "inputs": ["knr_column"],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided", "fast_render"],
+    "cost": "light",
+}
 
 WEEKDAY_MAP = {
     "Monday": "Montag", "Tuesday": "Dienstag", "Wednesday": "Mittwoch",
@@ -59,8 +73,8 @@ def _process_information_text(text):
     text = text.replace('\n', '<br/>')
     return text
 
-def get_sponsor_bar_height():
-    sponsor_path = "logos/sponsorenleiste.png"
+def get_sponsor_bar_height(print_options=None):
+    sponsor_path = asset_path(print_options, "sponsorenleiste.png")
     if os.path.exists(sponsor_path):
         try:
             from reportlab.lib.utils import ImageReader
@@ -76,13 +90,14 @@ class FooterCanvas(canvas.Canvas):
     _print_options = {}
 
     def __init__(self, *args, **kwargs):
+        self._print_options = kwargs.pop("print_options", self._print_options)
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self.sponsor_height = get_sponsor_bar_height() if self._print_options.get("show_sponsor_bar", True) else 0
+        self.sponsor_height = get_sponsor_bar_height(self._print_options) if self._print_options.get("show_sponsor_bar", True) else 0
         self.page_num   = 0
         self.banner_path   = None
         self.banner_height = 0
         if self._print_options.get("show_banner", True):
-            bp = os.path.join("logos", "banner.png")
+            bp = asset_path(self._print_options, "banner.png")
             if os.path.exists(bp):
                 try:
                     pil_img = PILImage.open(bp)
@@ -120,7 +135,7 @@ class FooterCanvas(canvas.Canvas):
     def draw_footer(self):
         if not self._print_options.get("show_sponsor_bar", True):
             return
-        sponsor_path = "logos/sponsorenleiste.png"
+        sponsor_path = asset_path(self._print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_path):
             try:
                 img_width  = 190 * mm
@@ -132,8 +147,73 @@ class FooterCanvas(canvas.Canvas):
                 pass
 
 
+def _build_fast_table(starters, col_widths, use_knr_column):
+    """Hinderniskarte als FastTable: gleiches Raster, direkt auf den Canvas gezeichnet."""
+    empty = [FastCell() for _ in range(7)]
+
+    def hdr(*lines):
+        return FastCell([[run(l, "Helvetica-Bold", 7)] for l in lines], align="CENTER", leading=8)
+
+    header = FastRow([
+        hdr("KNr." if use_knr_column else "R-Nr."),
+        FastCell([[run("Reiter / Rider", "Helvetica-Bold", 9)],
+                  [run("Pferd / Horse", "Helvetica", 6)]], leading=12),
+        hdr("fehler-", "frei"),
+        hdr("1.", "Verwei-", "gerung"),
+        hdr("2.", "Verwei-", "gerung"),
+        hdr("außerhalb", "der", "Flagge"),
+        hdr("Hindernis", "ausge-", "lassen"),
+        hdr("Sturz", "Reiter"),
+        hdr("Sturz", "Pferd"),
+        hdr("aufge-", "geben"),
+    ], background=colors.lightgrey)
+    rows = [header]
+
+    current_group = None
+    starter_count = 0
+    for s in starters:
+        starter_group = s.get("groupNumber")
+        if starter_group is not None and starter_group > 0 and starter_group != current_group:
+            rows.append(FastRow([FastCell([[run(f"Abteilung {starter_group}", "Helvetica-Bold", 9)]], leading=12)],
+                                background=colors.Color(0.88, 0.88, 0.88), span=True))
+            current_group = starter_group
+            starter_count = 0
+
+        athlete    = s.get("athlete") or {}
+        horses     = s.get("horses") or []
+        horse      = horses[0] if horses else {}
+        horse_name = horse.get("name", "")
+        withdrawn  = bool(s.get("withdrawn", False))
+
+        back_nr  = s.get("backNumber")
+        start_nr = s.get("startNumber") or ""
+        cno      = horse.get("cno") if horse else None
+        if use_knr_column:
+            rnr_display = str(cno) if cno is not None else str(back_nr) if back_nr is not None else str(start_nr)
+        else:
+            rnr_display = str(back_nr) if back_nr is not None else str(start_nr)
+
+        rider_lines = [[run(athlete.get("name", ""), "Helvetica-Bold", 8)]]
+        if horse_name:
+            rider_lines.append([run(horse_name, "Helvetica", 7)])
+
+        rows.append(FastRow(
+            # leading wie style_pos (12, von Normal) / style_rider (10)
+            [FastCell.text(rnr_display, "Helvetica", 9, align="CENTER", leading=12),
+             FastCell(rider_lines, leading=10),
+             FastCell.text("AK" if s.get("horsConcours", False) else "", "Helvetica", 9, align="CENTER", leading=12)]
+            + empty,
+            background=colors.HexColor("#f0f0f0") if starter_count % 2 == 1 else None,
+            text_color=colors.darkgrey if withdrawn else colors.black,
+            strike=withdrawn,
+        ))
+        starter_count += 1
+
+    return FastTable(col_widths, rows, header_rows=1, padding=(3, 6, 3, 6), grid="grid")
+
+
 def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
-    print(f"DEBUG: Starting PDF render (Hinderniskarte) for {filename}")
+    log.debug("Starting PDF render (Hinderniskarte) for %s", filename)
 
     # --- Druckoptionen ---
     print_options    = starterlist.get("printOptions", {})
@@ -145,8 +225,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     show_title       = print_options.get("show_title",       True)
     show_header      = print_options.get("show_header",      True)
     use_knr_column   = print_options.get("use_knr_column",   False)
-
-    FooterCanvas._print_options = print_options
+    fast_render      = print_options.get("fast_render",      False)
 
     has_sponsor_paper    = sponsor_top or sponsor_bottom
     needs_custom_margins = has_sponsor_paper or not show_header
@@ -157,7 +236,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         spacing_bottom_cm = starterlist.get("spacingBottomCm", 2.0)
 
         if show_sponsor_bar:
-            sponsor_height = get_sponsor_bar_height()
+            sponsor_height = get_sponsor_bar_height(print_options)
             min_bottom_mm  = (4 * mm + sponsor_height + 1 * mm) / mm
         else:
             min_bottom_mm = 10
@@ -213,7 +292,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
         page_width = A4[0] - 16 * mm
     else:
-        sponsor_height = get_sponsor_bar_height() if show_sponsor_bar else 0
+        sponsor_height = get_sponsor_bar_height(print_options) if show_sponsor_bar else 0
         bottom_margin  = 4 * mm + sponsor_height + 1 * mm if show_sponsor_bar else 8 * mm
         doc = SimpleDocTemplate(
             filename, pagesize=A4,
@@ -240,7 +319,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
 
     # --- Banner-Spacer ---
     if show_banner:
-        banner_path = os.path.join("logos", "banner.png")
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 pil_img = PILImage.open(banner_path)
@@ -345,7 +424,7 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
             ]))
             elements.append(ht)
         except Exception as e:
-            print(f"PDF LOGO DEBUG: {e}")
+            log.debug("%s", e)
             for p in header_parts:
                 elements.append(p)
     else:
@@ -416,111 +495,114 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
         col_sturz, col_sturz, col_aufg
     ]
 
-    # Kopfzeile
-    def hdr_p(txt):
-        return Paragraph(txt, style_hdr)
-
-    header_row = [
-        hdr_p("<b>KNr.</b>" if use_knr_column else "<b>R-Nr.</b>"),
-        Paragraph("<b>Reiter / Rider</b><br/><font size=6>Pferd / Horse</font>", style_hdr_l),
-        hdr_p("<b>fehler-\nfrei</b>"),
-        hdr_p("<b>1.\nVerwei-\ngerung</b>"),
-        hdr_p("<b>2.\nVerwei-\ngerung</b>"),
-        hdr_p("<b>außerhalb<br/>der<br/>Flagge</b>"),
-        hdr_p("<b>Hindernis\nausge-\nlassen</b>"),
-        hdr_p("<b>Sturz\nReiter</b>"),
-        hdr_p("<b>Sturz\nPferd</b>"),
-        hdr_p("<b>aufge-\ngeben</b>"),
-    ]
-
-    data_rows = [header_row]
-    meta      = [{"type": "header"}]
-
-    current_group = None
-
-    for s in starters:
-        # Abteilungs-Header
-        starter_group = s.get("groupNumber")
-        if starter_group is not None and starter_group > 0 and starter_group != current_group:
-            data_rows.append(
-                [Paragraph(f"<b>Abteilung {starter_group}</b>", style_hdr_l)]
-                + [Paragraph("", style_pos)] * 9
+    if fast_render:
+        elements.append(_build_fast_table(starters, col_widths, use_knr_column))
+    else:
+        # Kopfzeile
+        def hdr_p(txt):
+            return Paragraph(txt, style_hdr)
+
+        header_row = [
+            hdr_p("<b>KNr.</b>" if use_knr_column else "<b>R-Nr.</b>"),
+            Paragraph("<b>Reiter / Rider</b><br/><font size=6>Pferd / Horse</font>", style_hdr_l),
+            hdr_p("<b>fehler-\nfrei</b>"),
+            hdr_p("<b>1.\nVerwei-\ngerung</b>"),
+            hdr_p("<b>2.\nVerwei-\ngerung</b>"),
+            hdr_p("<b>außerhalb<br/>der<br/>Flagge</b>"),
+            hdr_p("<b>Hindernis\nausge-\nlassen</b>"),
+            hdr_p("<b>Sturz\nReiter</b>"),
+            hdr_p("<b>Sturz\nPferd</b>"),
+            hdr_p("<b>aufge-\ngeben</b>"),
+        ]
+
+        data_rows = [header_row]
+        meta      = [{"type": "header"}]
+
+        current_group = None
+
+        for s in starters:
+            # Abteilungs-Header
+            starter_group = s.get("groupNumber")
+            if starter_group is not None and starter_group > 0 and starter_group != current_group:
+                data_rows.append(
+                    [Paragraph(f"<b>Abteilung {starter_group}</b>", style_hdr_l)]
+                    + [Paragraph("", style_pos)] * 9
+                )
+                meta.append({"type": "group"})
+                current_group = starter_group
+
+            # Reiter + Pferd (nur Name, kein Verein/Zucht)
+            athlete    = s.get("athlete") or {}
+            rider_name = athlete.get("name", "")
+
+            horses     = s.get("horses") or []
+            horse      = horses[0] if horses else {}
+            horse_name = horse.get("name", "")
+
+            withdrawn     = bool(s.get("withdrawn",    False))
+            hors_concours = bool(s.get("horsConcours", False))
+
+            # KNr. oder R-Nr. je nach Druckoption
+            back_nr  = s.get("backNumber")
+            start_nr = s.get("startNumber") or ""
+            cno      = horse.get("cno") if horse else None
+            if use_knr_column:
+                rnr_display = str(cno) if cno is not None else str(back_nr) if back_nr is not None else str(start_nr)
+            else:
+                rnr_display = str(back_nr) if back_nr is not None else str(start_nr)
+
+            reiter_line = f"<b>{rider_name}</b>"
+            if horse_name:
+                reiter_line += f"<br/><font size=7>{horse_name}</font>"
+
+            if withdrawn:
+                reiter_line = f"<strike>{reiter_line}</strike>"
+                rnr_display = f"<strike>{rnr_display}</strike>"
+
+            # AK in fehlerfrei-Spalte
+            ff_cell = Paragraph("AK", style_pos) if hors_concours else Paragraph("", style_pos)
+
+            row = (
+                [Paragraph(rnr_display, style_pos),
+                 Paragraph(reiter_line, style_rider),
+                 ff_cell]
+                + [Paragraph("", style_pos)] * 7
             )
-            meta.append({"type": "group"})
-            current_group = starter_group
-
-        # Reiter + Pferd (nur Name, kein Verein/Zucht)
-        athlete    = s.get("athlete") or {}
-        rider_name = athlete.get("name", "")
-
-        horses     = s.get("horses") or []
-        horse      = horses[0] if horses else {}
-        horse_name = horse.get("name", "")
-
-        withdrawn     = bool(s.get("withdrawn",    False))
-        hors_concours = bool(s.get("horsConcours", False))
-
-        # KNr. oder R-Nr. je nach Druckoption
-        back_nr  = s.get("backNumber")
-        start_nr = s.get("startNumber") or ""
-        cno      = horse.get("cno") if horse else None
-        if use_knr_column:
-            rnr_display = str(cno) if cno is not None else str(back_nr) if back_nr is not None else str(start_nr)
-        else:
-            rnr_display = str(back_nr) if back_nr is not None else str(start_nr)
-
-        reiter_line = f"<b>{rider_name}</b>"
-        if horse_name:
-            reiter_line += f"<br/><font size=7>{horse_name}</font>"
-
-        if withdrawn:
-            reiter_line = f"<strike>{reiter_line}</strike>"
-            rnr_display = f"<strike>{rnr_display}</strike>"
-
-        # AK in fehlerfrei-Spalte
-        ff_cell = Paragraph("AK", style_pos) if hors_concours else Paragraph("", style_pos)
-
-        row = (
-            [Paragraph(rnr_display, style_pos),
-             Paragraph(reiter_line, style_rider),
-             ff_cell]
-            + [Paragraph("", style_pos)] * 7
-        )
-        data_rows.append(row)
-        meta.append({"type": "starter", "withdrawn": withdrawn})
-
-    # --- Tabelle ---
-    t = Table(data_rows, colWidths=col_widths, repeatRows=1)
-    ts = TableStyle([
-        ("GRID",          (0, 0), (-1, -1), 0.25, colors.black),
-        ("BACKGROUND",    (0, 0), (-1,  0), colors.lightgrey),
-        ("VALIGN",        (0, 0), (-1, -1), "TOP"),
-        ("ALIGN",         (0, 0), (0,  -1), "CENTER"),
-        ("ALIGN",         (2, 0), (-1, -1), "CENTER"),
-        ("TOPPADDING",    (0, 0), (-1, -1), 3),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-    ])
-
-    starter_count = 0
-    for ri in range(1, len(data_rows)):
-        m = meta[ri]
-        if m["type"] == "group":
-            ts.add("SPAN",       (0, ri), (-1, ri))
-            ts.add("BACKGROUND", (0, ri), (-1, ri), colors.Color(0.88, 0.88, 0.88))
-            ts.add("ALIGN",      (0, ri), (-1, ri), "LEFT")
-            starter_count = 0
-        elif m["type"] == "pause":
-            ts.add("SPAN",  (0, ri), (-1, ri))
-            ts.add("ALIGN", (0, ri), (-1, ri), "CENTER")
-        elif m["type"] == "starter":
-            if starter_count % 2 == 1:
-                ts.add("BACKGROUND", (0, ri), (-1, ri), colors.HexColor("#f0f0f0"))
-            if m.get("withdrawn"):
-                ts.add("TEXTCOLOR", (0, ri), (-1, ri), colors.darkgrey)
-            starter_count += 1
-
-    t.setStyle(ts)
-    elements.append(t)
+            data_rows.append(row)
+            meta.append({"type": "starter", "withdrawn": withdrawn})
+
+        # --- Tabelle ---
+        t = Table(data_rows, colWidths=col_widths, repeatRows=1)
+        ts = TableStyle([
+            ("GRID",          (0, 0), (-1, -1), 0.25, colors.black),
+            ("BACKGROUND",    (0, 0), (-1,  0), colors.lightgrey),
+            ("VALIGN",        (0, 0), (-1, -1), "TOP"),
+            ("ALIGN",         (0, 0), (0,  -1), "CENTER"),
+            ("ALIGN",         (2, 0), (-1, -1), "CENTER"),
+            ("TOPPADDING",    (0, 0), (-1, -1), 3),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+        ])
+
+        starter_count = 0
+        for ri in range(1, len(data_rows)):
+            m = meta[ri]
+            if m["type"] == "group":
+                ts.add("SPAN",       (0, ri), (-1, ri))
+                ts.add("BACKGROUND", (0, ri), (-1, ri), colors.Color(0.88, 0.88, 0.88))
+                ts.add("ALIGN",      (0, ri), (-1, ri), "LEFT")
+                starter_count = 0
+            elif m["type"] == "pause":
+                ts.add("SPAN",  (0, ri), (-1, ri))
+                ts.add("ALIGN", (0, ri), (-1, ri), "CENTER")
+            elif m["type"] == "starter":
+                if starter_count % 2 == 1:
+                    ts.add("BACKGROUND", (0, ri), (-1, ri), colors.HexColor("#f0f0f0"))
+                if m.get("withdrawn"):
+                    ts.add("TEXTCOLOR", (0, ri), (-1, ri), colors.darkgrey)
+                starter_count += 1
+
+        t.setStyle(ts)
+        elements.append(t)
 
     # --- Richterbox ---
     elements.append(Spacer(1, 6 * mm))
@@ -546,13 +628,13 @@ def render(starterlist: dict, filename: str, logo_max_width_cm: float = 5.0):
     elements.append(richter_box)
 
     # --- PDF bauen ---
-    print("DEBUG: Building PDF (Hinderniskarte)...")
+    log.debug("Building PDF (Hinderniskarte)...")
     try:
         if show_banner or show_sponsor_bar:
-            doc.build(elements, canvasmaker=FooterCanvas)
+            doc.build(elements, canvasmaker=canvas_maker(FooterCanvas, print_options))
         else:
             doc.build(elements)
-        print("DEBUG: PDF Hinderniskarte completed successfully!")
+        log.debug("PDF Hinderniskarte completed successfully!")
     except Exception as e:
-        print(f"DEBUG: PDF build error: {e}")
+        log.warning("PDF build error: %s", e)
         raise
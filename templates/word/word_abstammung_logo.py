@@ -9,6 +9,19 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_TAB_ALIGNMENT
 from docx.oxml.shared import OxmlElement, qn
 from docx.enum.table import WD_TABLE_ALIGNMENT
 
+from app_logging import get_logger
+from render_context import asset_path
+
+log = get_logger("templates.word.word_abstammung_logo")
+
+TEMPLATE_INFO = {
+    "discipline": "allgemein",
+    "language": "de",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom"],
+    "cost": "normal",
+}
+
 # mapping English -> German for sex
 SEX_MAP = {
     "MARE": "Stute",
@@ -113,26 +126,31 @@ def _set_header_gray_background(row):
         tcPr.append(shd)
 
 def _set_table_borders(table):
-    """Add borders to all table cells"""
+    """Add borders to all table cells - einmalig auf Table-Level (tblBorders)
+    statt nachträglich jede einzelne Zelle mit tcBorders zu versehen"""
     tbl = table._tbl
-    for row in tbl.tr_lst:
-        for cell in row.tc_lst:
-            tcPr = cell.tcPr
-            if tcPr is None:
-                tcPr = OxmlElement("w:tcPr")
-                cell.append(tcPr)
-            
-            tcBorders = OxmlElement('w:tcBorders')
-            
-            for border_name in ['w:top', 'w:left', 'w:bottom', 'w:right']:
-                border = OxmlElement(border_name)
-                border.set(qn('w:val'), 'single')
-                border.set(qn('w:sz'), '4')
-                border.set(qn('w:space'), '0')
-                border.set(qn('w:color'), '000000')
-                tcBorders.append(border)
-            
-            tcPr.append(tcBorders)
+    tblPr = tbl.tblPr
+    if tblPr is None:
+        tblPr = OxmlElement('w:tblPr')
+        tbl.insert(0, tblPr)
+    
+    tblBorders = tblPr.find(qn('w:tblBorders'))
+    if tblBorders is not None:
+        tblPr.remove(tblBorders)
+    
+    # Außenrand + innere Linien = Rahmen um jede Zelle
+    tblBorders = OxmlElement('w:tblBorders')
+    for border_name in ['w:top', 'w:left', 'w:bottom', 'w:right', 'w:insideH', 'w:insideV']:
+        border = OxmlElement(border_name)
+        border.set(qn('w:val'), 'single')
+        border.set(qn('w:sz'), '4')
+        border.set(qn('w:space'), '0')
+        border.set(qn('w:color'), '000000')
+        tblBorders.append(border)
+    
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblBorders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
 
 def _set_row_keep_together(row):
     """Prevent table row from breaking across pages"""
@@ -207,7 +225,8 @@ def _set_cell_margins_tight(table):
     right.set(qn('w:type'), 'dxa')
     tblCellMar.append(right)
     
-    tblPr.append(tblCellMar)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblCellMar, 'w:tblLook', 'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
 
 def _optimize_paragraph_spacing(paragraph):
     """Optimize paragraph spacing for compact display - AUS DRE_3 ÜBERNOMMEN"""
@@ -249,7 +268,7 @@ def _set_header_row_repeat(table):
         else:
             tblHeader.set(qn('w:val'), 'true')
         
-        print("WORD DEBUG: Header row repeat enabled")
+        log.debug("Header row repeat enabled")
 
 def _set_judges_table_widths(table):
     """Set fixed column widths for judges table"""
@@ -270,7 +289,10 @@ def _set_judges_table_widths(table):
     tblW = OxmlElement('w:tblW')
     tblW.set(qn('w:w'), '0')
     tblW.set(qn('w:type'), 'auto')
-    tblPr.append(tblW)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblW, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                  'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
     
     tblGrid = tbl.find(qn('w:tblGrid'))
     if tblGrid is not None:
@@ -325,7 +347,10 @@ def _set_abstammung_column_widths(table):
     tblW = OxmlElement('w:tblW')
     tblW.set(qn('w:w'), '0')
     tblW.set(qn('w:type'), 'auto')
-    tblPr.append(tblW)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblW, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                  'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
     
     tblGrid = tbl.find(qn('w:tblGrid'))
     if tblGrid is not None:
@@ -412,7 +437,7 @@ def render(starterlist: dict, filename: str):
     """
     Creates a Word document with 5-column abstammung layout (Start|KoNr|Reiter|Pferd|Ergeb) with prominent logo
     """
-    print("WORD ABSTAMMUNG LOGO DEBUG: Starting render function")
+    log.debug("Starting render function")
     
     if starterlist is None:
         raise ValueError("starterlist is None")
@@ -447,7 +472,7 @@ def render(starterlist: dict, filename: str):
     shutil.copy2(template_path, output_path)
     
     # Open the copied template document
-    print("WORD ABSTAMMUNG LOGO DEBUG: Loading document from template")
+    log.debug("Loading document from template")
     doc = Document(output_path)
 
     # Seitenformat + Banner
@@ -478,7 +503,7 @@ def render(starterlist: dict, filename: str):
         _section.footer_distance = Inches(0.24)
         _section.bottom_margin   = _MIN_BOTTOM
     if show_banner:
-        _bp = "logos/banner.png"
+        _bp = asset_path(print_options, "banner.png")
         if os.path.exists(_bp):
             try:
                 from PIL import Image as _BPIL
@@ -505,24 +530,24 @@ def render(starterlist: dict, filename: str):
                 _nh = _section.header; _nh.is_linked_to_previous = False
                 for _p in _nh.paragraphs: _p.clear()
             except Exception as _be:
-                print(f"Banner Fehler: {_be}")
+                log.warning("Banner Fehler: %s", _be)
     
     # Seitenränder bereits oben gesetzt
     
     # Find and replace STARTER_TABLE placeholder
-    print("WORD DEBUG: Looking for STARTER_TABLE placeholder")
+    log.debug("Looking for STARTER_TABLE placeholder")
     starter_table_found = False
     placeholder_paragraph = None
     
     for paragraph in doc.paragraphs:
         if "STARTER_TABLE" in paragraph.text:
-            print("WORD DEBUG: Found STARTER_TABLE placeholder")
+            log.debug("Found STARTER_TABLE placeholder")
             placeholder_paragraph = paragraph
             starter_table_found = True
             break
     
     if not starter_table_found:
-        print("WORD DEBUG: STARTER_TABLE placeholder not found, creating at end of document")
+        log.debug("STARTER_TABLE placeholder not found, creating at end of document")
         placeholder_paragraph = doc.add_paragraph("STARTER_TABLE")
 
     # Extract data from starterlist for header generation
@@ -582,9 +607,15 @@ def render(starterlist: dict, filename: str):
             h_borders = OxmlElement("w:tblBorders")
             for bn in ["top","left","bottom","right","insideH","insideV"]:
                 b = OxmlElement(f"w:{bn}"); b.set(qn("w:val"), "none"); h_borders.append(b)
-            h_tbl_pr.append(h_borders)
+            # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+            h_tbl_pr.insert_element_before(h_borders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             h_tbl_w = OxmlElement("w:tblW")
-            h_tbl_w.set(qn("w:w"), str(page_twips)); h_tbl_w.set(qn("w:type"), "dxa"); h_tbl_pr.append(h_tbl_w)
+            h_tbl_w.set(qn("w:w"), str(page_twips)); h_tbl_w.set(qn("w:type"), "dxa")
+            h_tbl_pr.remove_all('w:tblW')
+            h_tbl_pr.insert_element_before(h_tbl_w, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                            'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             tbl_grid = OxmlElement("w:tblGrid")
             for tw in [text_twips, logo_twips]:
                 gc = OxmlElement("w:gridCol"); gc.set(qn("w:w"), str(tw)); tbl_grid.append(gc)
@@ -656,7 +687,7 @@ def render(starterlist: dict, filename: str):
                     drawing = inline.getparent()
                     if drawing is not None: drawing.replace(inline, anchor)
             except Exception as _be:
-                print(f"behindDoc Fehler: {_be}")
+                log.warning("behindDoc Fehler: %s", _be)
         else:
             def _add_d(text, sz, bold, sa=4):
                 p = doc.add_paragraph()
@@ -710,15 +741,15 @@ def render(starterlist: dict, filename: str):
         run_sl_date.font.size = Pt(10)
 
     # Create table DIREKT nach kompaktem Header - 5 COLUMNS for abstammung layout (Start|KoNr|Reiter|Pferd|Ergeb)
-    print("WORD DEBUG: Creating table after compact header - 5 columns for abstammung")
+    log.debug("Creating table after compact header - 5 columns for abstammung")
     table = doc.add_table(rows=0, cols=5)  # 5 columns: Start, KoNr, Reiter, Pferd/Abstammung, Ergeb.
     
     # Try to set table style, but continue without if not available
     try:
         table.style = 'Table Grid'
-        print("WORD DEBUG: Applied Table Grid style")
+        log.debug("Applied Table Grid style")
     except Exception as e:
-        print(f"WORD DEBUG: Table Grid style not available: {e}, continuing without style")
+        log.debug("Table Grid style not available: %s, continuing without style", e)
     
     table.alignment = WD_TABLE_ALIGNMENT.LEFT
     
@@ -774,8 +805,8 @@ def render(starterlist: dict, filename: str):
     starters = starterlist.get("starters", [])
     breaks = starterlist.get("breaks", [])
     
-    print(f"WORD DEBUG: Found {len(starters)} starters in starterlist")
-    print(f"WORD DEBUG: Found {len(breaks)} breaks in starterlist")
+    log.debug("Found %s starters in starterlist", len(starters))
+    log.debug("Found %s breaks in starterlist", len(breaks))
     
     breaks_map = {}
     for br in breaks:
@@ -1171,9 +1202,9 @@ def render(starterlist: dict, filename: str):
             # Try to set table style, but continue without if not available
             try:
                 judges_table.style = 'Table Grid'
-                print("WORD DEBUG: Applied Table Grid style to judges table")
+                log.debug("Applied Table Grid style to judges table")
             except Exception as e:
-                print(f"WORD DEBUG: Table Grid style not available for judges table: {e}, continuing without style")
+                log.debug("Table Grid style not available for judges table: %s, continuing without style", e)
             
             judges_table.alignment = WD_TABLE_ALIGNMENT.LEFT
             
@@ -1219,7 +1250,7 @@ def render(starterlist: dict, filename: str):
 
     # SPONSORENLEISTE IM FUß JEDER SEITE
     if show_sponsor_bar:
-        sponsor_logo_path = os.path.join("logos", "sponsorenleiste.png")
+        sponsor_logo_path = asset_path(print_options, "sponsorenleiste.png")
         if os.path.exists(sponsor_logo_path):
             try:
                 for section in doc.sections:
@@ -1241,23 +1272,23 @@ def render(starterlist: dict, filename: str):
                             _fpfp.paragraph_format.space_after = Pt(0)
                             _fpfp.paragraph_format.space_before = Pt(0)
                         except: pass
-                print(f"WORD ABSTAMMUNG LOGO DEBUG: Sponsorenleiste im Footer hinzugefügt")
+                log.debug("Sponsorenleiste im Footer hinzugefügt")
             except Exception as e:
-                print(f"WORD ABSTAMMUNG LOGO DEBUG: Sponsorenleiste Footer-Fehler: {e}")
+                log.warning("Sponsorenleiste Footer-Fehler: %s", e)
 
     # Save document
-    print("WORD DEBUG: Starting document save")
+    log.debug("Starting document save")
     try:
         doc.save(output_path)
-        print(f"WORD ABSTAMMUNG LOGO DEBUG: Document saved to {output_path}")
+        log.debug("Document saved to %s", output_path)
         return output_path
     except Exception as e:
-        print(f"WORD DEBUG: Error saving document: {e}")
+        log.warning("Error saving document: %s", e)
         alt_output_path = filename
         try:
             doc.save(alt_output_path)
-            print(f"WORD ABSTAMMUNG LOGO DEBUG: Document saved to alternative location: {alt_output_path}")
+            log.debug("Document saved to alternative location: %s", alt_output_path)
             return alt_output_path
         except Exception as e2:
-            print(f"WORD DEBUG: Failed to save to alternative location: {e2}")
+            log.warning("Failed to save to alternative location: %s", e2)
             raise
\ No newline at end of file
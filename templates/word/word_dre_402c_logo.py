@@ -9,6 +9,19 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_TAB_ALIGNMENT
 from docx.oxml.shared import OxmlElement, qn
 from docx.enum.table import WD_TABLE_ALIGNMENT
 
+from app_logging import get_logger
+from render_context import asset_path
+
+log = get_logger("templates.word.word_dre_402c_logo")
+
+TEMPLATE_INFO = {
+    "discipline": "dressur",
+    "language": "de",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom"],
+    "cost": "normal",
+}
+
 # mapping English -> German for sex
 SEX_MAP = {
     "MARE": "Stute",
@@ -150,7 +163,8 @@ def _set_cell_margins_tight(table):
     right.set(qn('w:type'), 'dxa')
     tblCellMar.append(right)
     
-    tblPr.append(tblCellMar)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblCellMar, 'w:tblLook', 'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
 
 def _optimize_paragraph_spacing(paragraph):
     """Optimize paragraph spacing for compact display"""
@@ -176,32 +190,37 @@ def _set_header_gray_background(row):
         tcPr.append(shd)
 
 def _set_table_borders(table):
-    """Add borders to all table cells"""
+    """Add borders to all table cells - einmalig auf Table-Level (tblBorders)
+    statt nachträglich jede einzelne Zelle mit tcBorders zu versehen"""
     tbl = table._tbl
-    for row in tbl.tr_lst:
-        for cell in row.tc_lst:
-            tcPr = cell.tcPr
-            if tcPr is None:
-                tcPr = OxmlElement("w:tcPr")
-                cell.append(tcPr)
-            
-            tcBorders = OxmlElement('w:tcBorders')
-            
-            for border_name in ['w:top', 'w:left', 'w:bottom', 'w:right']:
-                border = OxmlElement(border_name)
-                border.set(qn('w:val'), 'single')
-                border.set(qn('w:sz'), '4')
-                border.set(qn('w:space'), '0')
-                border.set(qn('w:color'), '000000')
-                tcBorders.append(border)
-            
-            tcPr.append(tcBorders)
+    tblPr = tbl.tblPr
+    if tblPr is None:
+        tblPr = OxmlElement('w:tblPr')
+        tbl.insert(0, tblPr)
+    
+    tblBorders = tblPr.find(qn('w:tblBorders'))
+    if tblBorders is not None:
+        tblPr.remove(tblBorders)
+    
+    # Außenrand + innere Linien = Rahmen um jede Zelle
+    tblBorders = OxmlElement('w:tblBorders')
+    for border_name in ['w:top', 'w:left', 'w:bottom', 'w:right', 'w:insideH', 'w:insideV']:
+        border = OxmlElement(border_name)
+        border.set(qn('w:val'), 'single')
+        border.set(qn('w:sz'), '4')
+        border.set(qn('w:space'), '0')
+        border.set(qn('w:color'), '000000')
+        tblBorders.append(border)
+    
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblBorders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
 
-def _add_sponsorship_footer(doc, show_sponsor_bar=True, show_banner=False):
+def _add_sponsorship_footer(doc, show_sponsor_bar=True, show_banner=False, print_options=None):
     """Fügt Sponsorenleiste im Footer jeder Seite hinzu"""
     if not show_sponsor_bar:
         return
-    sponsor_logo_path = os.path.join("logos", "sponsorenleiste.png")
+    sponsor_logo_path = asset_path(print_options, "sponsorenleiste.png")
     if os.path.exists(sponsor_logo_path):
         try:
             for section in doc.sections:
@@ -226,11 +245,11 @@ def _add_sponsorship_footer(doc, show_sponsor_bar=True, show_banner=False):
                         _fpfp.paragraph_format.space_before = Pt(0)
                     except: pass
             
-            print(f"WORD DRE 402C LOGO DEBUG: Sponsorenleiste im Footer hinzugefügt: {sponsor_logo_path}")
+            log.debug("Sponsorenleiste im Footer hinzugefügt: %s", sponsor_logo_path)
         except Exception as e:
-            print(f"WORD DRE 402C LOGO DEBUG: Sponsorenleiste Footer-Fehler: {e}")
+            log.warning("Sponsorenleiste Footer-Fehler: %s", e)
     else:
-        print(f"WORD DRE 402C LOGO DEBUG: Sponsorenleiste nicht gefunden: {sponsor_logo_path}")
+        log.debug("Sponsorenleiste nicht gefunden: %s", sponsor_logo_path)
 
 def _set_row_keep_together(row):
     """Prevent table row from breaking across pages"""
@@ -287,7 +306,10 @@ def _set_dre402c_column_widths(table):
     tblW = OxmlElement('w:tblW')
     tblW.set(qn('w:w'), '0')
     tblW.set(qn('w:type'), 'auto')
-    tblPr.append(tblW)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblW, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                  'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
     
     tblGrid = tbl.find(qn('w:tblGrid'))
     if tblGrid is not None:
@@ -343,7 +365,10 @@ def _set_judges_402c_table_widths(table):
     tblW = OxmlElement('w:tblW')
     tblW.set(qn('w:w'), '0')
     tblW.set(qn('w:type'), 'auto')
-    tblPr.append(tblW)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblW, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                  'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
     
     tblGrid = tbl.find(qn('w:tblGrid'))
     if tblGrid is not None:
@@ -452,7 +477,7 @@ def render(starterlist: dict, filename: str):
     Creates a Word document with 6-column 402.C layout (Aufgabe + Qualität)
     Speziell für Richtverfahren 402.C mit 1 Richter bei C (Aufgabe) und 2 Richtern gemeinsam (Qualität)
     """
-    print("WORD DRE 402C LOGO DEBUG: Starting render function for 402.C judging system")
+    log.debug("Starting render function for 402.C judging system")
     
     if starterlist is None:
         raise ValueError("starterlist is None")
@@ -483,7 +508,7 @@ def render(starterlist: dict, filename: str):
     output_path = os.path.join(OUTPUT_DIR, filename)
     shutil.copy2(template_path, output_path)
     
-    print("WORD DRE 402C LOGO DEBUG: Loading document from template")
+    log.debug("Loading document from template")
     doc = Document(output_path)
 
     # Seitenformat + Banner
@@ -514,7 +539,7 @@ def render(starterlist: dict, filename: str):
         _section.footer_distance = Inches(0.24)
         _section.bottom_margin   = _MIN_BOTTOM
     if show_banner:
-        _bp = "logos/banner.png"
+        _bp = asset_path(print_options, "banner.png")
         if os.path.exists(_bp):
             try:
                 from PIL import Image as _BPIL
@@ -541,22 +566,22 @@ def render(starterlist: dict, filename: str):
                 _nh = _section.header; _nh.is_linked_to_previous = False
                 for _p in _nh.paragraphs: _p.clear()
             except Exception as _be:
-                print(f"Banner Fehler: {_be}")
+                log.warning("Banner Fehler: %s", _be)
     
     # Find and replace STARTER_TABLE placeholder
-    print("WORD DEBUG: Looking for STARTER_TABLE placeholder")
+    log.debug("Looking for STARTER_TABLE placeholder")
     starter_table_found = False
     placeholder_paragraph = None
     
     for paragraph in doc.paragraphs:
         if "STARTER_TABLE" in paragraph.text:
-            print("WORD DEBUG: Found STARTER_TABLE placeholder")
+            log.debug("Found STARTER_TABLE placeholder")
             placeholder_paragraph = paragraph
             starter_table_found = True
             break
     
     if not starter_table_found:
-        print("WORD DEBUG: STARTER_TABLE placeholder not found, creating at end of document")
+        log.debug("STARTER_TABLE placeholder not found, creating at end of document")
         placeholder_paragraph = doc.add_paragraph("STARTER_TABLE")
 
     # Extract data from starterlist
@@ -616,9 +641,15 @@ def render(starterlist: dict, filename: str):
             h_borders = OxmlElement("w:tblBorders")
             for bn in ["top","left","bottom","right","insideH","insideV"]:
                 b = OxmlElement(f"w:{bn}"); b.set(qn("w:val"), "none"); h_borders.append(b)
-            h_tbl_pr.append(h_borders)
+            # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+            h_tbl_pr.insert_element_before(h_borders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             h_tbl_w = OxmlElement("w:tblW")
-            h_tbl_w.set(qn("w:w"), str(page_twips)); h_tbl_w.set(qn("w:type"), "dxa"); h_tbl_pr.append(h_tbl_w)
+            h_tbl_w.set(qn("w:w"), str(page_twips)); h_tbl_w.set(qn("w:type"), "dxa")
+            h_tbl_pr.remove_all('w:tblW')
+            h_tbl_pr.insert_element_before(h_tbl_w, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                            'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             tbl_grid = OxmlElement("w:tblGrid")
             for tw in [text_twips, logo_twips]:
                 gc = OxmlElement("w:gridCol"); gc.set(qn("w:w"), str(tw)); tbl_grid.append(gc)
@@ -690,7 +721,7 @@ def render(starterlist: dict, filename: str):
                     drawing = inline.getparent()
                     if drawing is not None: drawing.replace(inline, anchor)
             except Exception as _be:
-                print(f"behindDoc Fehler: {_be}")
+                log.warning("behindDoc Fehler: %s", _be)
         else:
             def _add_d(text, sz, bold, sa=4):
                 p = doc.add_paragraph()
@@ -745,17 +776,17 @@ def render(starterlist: dict, filename: str):
 
     # Get judges
     judges = starterlist.get("judges", [])
-    print(f"WORD DEBUG: Found {len(judges)} judges in starterlist")
+    log.debug("Found %s judges in starterlist", len(judges))
     
     # Create table - 6 COLUMNS for 402.C layout
-    print("WORD DEBUG: Creating table - 6 columns for 402.C (Aufgabe + Qualität)")
+    log.debug("Creating table - 6 columns for 402.C (Aufgabe + Qualität)")
     table = doc.add_table(rows=0, cols=6)
     
     try:
         table.style = 'Table Grid'
-        print("WORD DEBUG: Applied Table Grid style")
+        log.debug("Applied Table Grid style")
     except Exception as e:
-        print(f"WORD DEBUG: Table Grid style not available: {e}, continuing without style")
+        log.debug("Table Grid style not available: %s, continuing without style", e)
     
     table.alignment = WD_TABLE_ALIGNMENT.LEFT
     
@@ -1181,7 +1212,7 @@ def render(starterlist: dict, filename: str):
                 pass
 
     _set_table_borders(table)
-    _add_sponsorship_footer(doc, show_sponsor_bar=show_sponsor_bar, show_banner=show_banner)
+    _add_sponsorship_footer(doc, show_sponsor_bar=show_sponsor_bar, show_banner=show_banner, print_options=print_options)
 
     # Add judges section - ZEIGT ALLE 3 RICHTER EINZELN MIT AUFGABEN
     if judges:
@@ -1200,9 +1231,9 @@ def render(starterlist: dict, filename: str):
             
             try:
                 judges_table.style = 'Table Grid'
-                print("WORD DEBUG: Applied Table Grid style to judges table")
+                log.debug("Applied Table Grid style to judges table")
             except Exception as e:
-                print(f"WORD DEBUG: Table Grid style not available for judges table: {e}, continuing without style")
+                log.debug("Table Grid style not available for judges table: %s, continuing without style", e)
             
             judges_table.alignment = WD_TABLE_ALIGNMENT.LEFT
             
@@ -1262,18 +1293,18 @@ def render(starterlist: dict, filename: str):
             _set_table_borders(judges_table)
 
     # Save document
-    print("WORD DEBUG: Starting document save")
+    log.debug("Starting document save")
     try:
         doc.save(output_path)
-        print(f"WORD DRE 402C LOGO DEBUG: Document saved to {output_path}")
+        log.debug("Document saved to %s", output_path)
         return output_path
     except Exception as e:
-        print(f"WORD DEBUG: Error saving document: {e}")
+        log.warning("Error saving document: %s", e)
         alt_output_path = filename
         try:
             doc.save(alt_output_path)
-            print(f"WORD DRE 402C LOGO DEBUG: Document saved to alternative location: {alt_output_path}")
+            log.debug("Document saved to alternative location: %s", alt_output_path)
             return alt_output_path
         except Exception as e2:
-            print(f"WORD DEBUG: Failed to save to alternative location: {e2}")
+            log.warning("Failed to save to alternative location: %s", e2)
             raise
\ No newline at end of file
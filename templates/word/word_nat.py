@@ -4,6 +4,10 @@ import os
 import json
 import shutil
 from datetime import datetime
+from starterlist_view import get_view
+from word_rows import RowPrototypes, RunStyle, add_run, add_line_break
+from word_images import PictureCache
+from word_stream import RowSpool, save as save_streamed
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
@@ -12,6 +16,19 @@ from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
 from docx.enum.table import WD_TABLE_ALIGNMENT
 
+from app_logging import get_logger
+from render_context import asset_path
+
+log = get_logger("templates.word.word_nat")
+
+TEMPLATE_INFO = {
+    "discipline": "allgemein",
+    "language": "de",
+    "inputs": [],
+    "print_options": ["show_header", "show_banner", "show_sponsor_bar", "show_title", "sponsor_top", "sponsor_bottom", "single_sided", "word_streaming"],
+    "cost": "light",
+}
+
 def _set_odd_even_headers(doc):
     """Setzt 'Gerade & ungerade Seiten unterschiedlich' in Word-Einstellungen"""
     settings = doc.settings.element
@@ -923,8 +940,8 @@ def get_country_name_english(code):
 
 
 def set_horizontal_borders_only(table):
-    """NUR horizontale Borders - KEINE vertikalen!
-    Entfernt AGGRESSIV alle Zell-Borders"""
+    """NUR horizontale Borders - KEINE vertikalen! (Table-Level, einmalig)
+    Die Zell-Borders werden je Zeilenart in set_cell_format() entfernt"""
     
     # 1. Table-Level: Nur horizontale Borders
     tbl = table._tbl
@@ -969,33 +986,18 @@ def set_horizontal_borders_only(table):
         elem.set(qn('w:sz'), '0')
         tblBorders.append(elem)
     
-    tblPr.append(tblBorders)
-    
-    # 2. Cell-Level: ENTFERNE ALLE CELL-BORDERS
-    for row in table.rows:
-        for cell in row.cells:
-            tc = cell._tc
-            tcPr = tc.get_or_add_tcPr()
-            
-            # Entferne bestehende Cell-Borders
-            existing_borders = tcPr.xpath('.//w:tcBorders')
-            for border in existing_borders:
-                tcPr.remove(border)
-            
-            # Setze explizit KEINE Borders auf Cell-Level
-            tcBorders = OxmlElement('w:tcBorders')
-            for side in ['top', 'left', 'bottom', 'right']:
-                border = OxmlElement(f'w:{side}')
-                border.set(qn('w:val'), 'none')
-                border.set(qn('w:sz'), '0')
-                tcBorders.append(border)
-            tcPr.append(tcBorders)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblBorders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
+
+# # | Time | CNO (20% schmaler) | Horse (10% schmaler) | Athlete (breiter) | Nat. (SCHMAL!)
+# Horse: 6500 - 10% = 5850
+# Athlete: 3680 + 650 = 4330
+COLUMN_WIDTHS = [600, 1100, 720, 5850, 4330, 500]
 
 def set_column_widths(table):
-    """Spaltenbreiten für PDF-Layout"""
-    if not table.rows:
-        return
-    
+    """Spaltenbreiten für PDF-Layout (Table-Level: tblW + tblGrid, einmalig)
+    Die Zellbreiten (tcW) setzt set_cell_format() je Zeilenart"""
     tbl = table._tbl
     tblPr = tbl.tblPr
     if tblPr is None:
@@ -1008,19 +1010,17 @@ def set_column_widths(table):
     tblW = OxmlElement('w:tblW')
     tblW.set(qn('w:w'), '5000')
     tblW.set(qn('w:type'), 'pct')
-    tblPr.append(tblW)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblW, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                  'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                  'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
     
     tblGrid = tbl.find(qn('w:tblGrid'))
     if tblGrid is not None:
         tbl.remove(tblGrid)
     
     tblGrid = OxmlElement('w:tblGrid')
-    # # | Time | CNO (20% schmaler) | Horse (10% schmaler) | Athlete (breiter) | Nat. (SCHMAL!)
-    # Horse: 6500 - 10% = 5850
-    # Athlete: 3680 + 650 = 4330
-    widths = [600, 1100, 720, 5850, 4330, 500]
-    
-    for width in widths:
+    for width in COLUMN_WIDTHS:
         gridCol = OxmlElement('w:gridCol')
         gridCol.set(qn('w:w'), str(width))
         tblGrid.append(gridCol)
@@ -1029,19 +1029,39 @@ def set_column_widths(table):
         tblPr.getparent().insert(tblPr.getparent().index(tblPr) + 1, tblGrid)
     else:
         tbl.insert(0, tblGrid)
+
+def set_cell_format(row):
+    """Zell-Eigenschaften einer Zeile: Breite (tcW) und KEINE Cell-Borders.
+    Wird einmal pro Zeilenart (Header, Prototypen) aufgerufen statt
+    nach dem Aufbau über alle Zellen der Tabelle zu laufen."""
+    cells = row.cells
+    for i, cell in enumerate(cells):
+        if i < len(COLUMN_WIDTHS):
+            tcPr = cell._tc.get_or_add_tcPr()
+            tcW = tcPr.find(qn('w:tcW'))
+            if tcW is not None:
+                tcPr.remove(tcW)
+            
+            tcW = OxmlElement('w:tcW')
+            tcW.set(qn('w:w'), str(COLUMN_WIDTHS[i]))
+            tcW.set(qn('w:type'), 'dxa')
+            tcPr.append(tcW)
     
-    for row in table.rows:
-        for i, cell in enumerate(row.cells):
-            if i < len(widths):
-                tcPr = cell._tc.get_or_add_tcPr()
-                tcW = tcPr.find(qn('w:tcW'))
-                if tcW is not None:
-                    tcPr.remove(tcW)
-                
-                tcW = OxmlElement('w:tcW')
-                tcW.set(qn('w:w'), str(widths[i]))
-                tcW.set(qn('w:type'), 'dxa')
-                tcPr.append(tcW)
+    for cell in cells:
+        tcPr = cell._tc.get_or_add_tcPr()
+        
+        # Entferne bestehende Cell-Borders
+        for border in tcPr.findall(qn('w:tcBorders')):
+            tcPr.remove(border)
+        
+        # Setze explizit KEINE Borders auf Cell-Level
+        tcBorders = OxmlElement('w:tcBorders')
+        for side in ['top', 'left', 'bottom', 'right']:
+            border = OxmlElement(f'w:{side}')
+            border.set(qn('w:val'), 'none')
+            border.set(qn('w:sz'), '0')
+            tcBorders.append(border)
+        tcPr.append(tcBorders)
 
 def set_row_height_auto(row, cant_split=False):
     """Set row height to auto, optionally prevent row from splitting across pages"""
@@ -1099,7 +1119,8 @@ def set_cell_margins_tight(table):
     right.set(qn('w:type'), 'dxa')
     tblCellMar.append(right)
     
-    tblPr.append(tblCellMar)
+    # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+    tblPr.insert_element_before(tblCellMar, 'w:tblLook', 'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
 
 def optimize_paragraph_spacing(paragraph):
     """Optimize paragraph spacing"""
@@ -1132,9 +1153,40 @@ def set_light_gray_background(row):
         shd.set(qn('w:fill'), 'E8E8E8')  # Hellgrau
         tcPr.append(shd)
 
+# Run-Prototypen für die Tabellenzeilen (siehe word_rows.py)
+RUN_NUMBER = RunStyle(8, bold=False)    # Startnummer, Zeit, KNR
+RUN_AK     = RunStyle(7, bold=True)     # "AK" unter der Startnummer
+RUN_NAME   = RunStyle(9, bold=True)     # Pferd, Reiter
+RUN_BREED  = RunStyle(9, bold=False)    # Rasse hinter dem Pferdenamen
+RUN_DETAIL = RunStyle(7)                # Alter / Farbe / Geschlecht / Abstammung
+RUN_INFO   = RunStyle(7, italic=True)   # Besitzer, Züchter
+RUN_SMALL  = RunStyle(7, bold=False)    # Verein/Land, Nationen-Code
+RUN_BREAK  = RunStyle(10, bold=True)    # Pausenzeile
+
+def format_break_text(break_info):
+    """Pausentext: 'Pause (x min) - Info' bzw. nur Info"""
+    total_seconds = int(break_info.get("totalSeconds", 0) or 0)
+    info_text = break_info.get("informationText", "")
+    
+    if total_seconds > 0:
+        if total_seconds >= 3600:
+            hours = total_seconds // 3600
+            mins = (total_seconds % 3600) // 60
+            break_text = f"Pause ({hours} h {mins:02d} min)"
+        else:
+            mins = total_seconds // 60
+            break_text = f"Pause ({mins} min)"
+        
+        if info_text:
+            break_text = f"{break_text} - {info_text}"
+    else:
+        break_text = info_text or "Pause"
+    return break_text
+
+
 def render(starterlist, filename):
     """Hauptfunktion - International Style MIT Logo und Header"""
-    print("WORD_NAT DEBUG: Starting render function")
+    log.debug("Starting render function")
     
     if starterlist is None:
         raise ValueError("starterlist is None")
@@ -1149,7 +1201,7 @@ def render(starterlist, filename):
     
     # Output path - IMMER ins Ausgabe-Verzeichnis!
     output_path = os.path.join(OUTPUT_DIR, filename)
-    print(f"WORD_NAT DEBUG: Output path: {output_path}")
+    log.debug("Output path: %s", output_path)
 
     # Druckoptionen auslesen
     print_options = starterlist.get("printOptions", {})
@@ -1160,9 +1212,10 @@ def render(starterlist, filename):
     sponsor_top     = print_options.get("sponsor_top",      False)
     sponsor_bottom  = print_options.get("sponsor_bottom",   False)
     single_sided    = print_options.get("single_sided",     False)
+    word_streaming  = print_options.get("word_streaming",   False)
     spacing_top_cm    = starterlist.get("spacingTopCm",    3.0)
     spacing_bottom_cm = starterlist.get("spacingBottomCm", 2.0)
-    print(f"WORD_NAT DEBUG: printOptions: show_header={show_header}, show_banner={show_banner}, show_sponsor_bar={show_sponsor_bar}, show_title={show_title_opt}, sponsor_top={sponsor_top}, sponsor_bottom={sponsor_bottom}")
+    log.debug("printOptions: show_header=%s, show_banner=%s, show_sponsor_bar=%s, show_title=%s, sponsor_top=%s, sponsor_bottom=%s", show_header, show_banner, show_sponsor_bar, show_title_opt, sponsor_top, sponsor_bottom)
 
     # Neues Dokument erstellen
     doc = Document()
@@ -1199,7 +1252,7 @@ def render(starterlist, filename):
 
     # BANNER: nur Seite 1, randlos via first_page_header
     if show_banner:
-        banner_path = "logos/banner.png"
+        banner_path = asset_path(print_options, "banner.png")
         if os.path.exists(banner_path):
             try:
                 from PIL import Image as PILImage
@@ -1247,9 +1300,9 @@ def render(starterlist, filename):
                 for p in nh.paragraphs:
                     p.clear()
 
-                print(f"WORD_NAT DEBUG: Banner OK, h={banner_h_inches:.2f}in")
+                log.debug("Banner OK, h=%.2fin", banner_h_inches)
             except Exception as e:
-                print(f"WORD_NAT DEBUG: Banner Fehler: {e}")
+                log.warning("Banner Fehler: %s", e)
 
 # LOGO + HEADER - nur wenn show_header aktiv (analog zu PDF-Templates)
     logo_path = starterlist.get("logoPath")
@@ -1294,14 +1347,14 @@ def render(starterlist, filename):
             start_time = start_raw
         
         # DEBUG: Zeige alle Header-Felder
-        print(f"WORD_NAT DEBUG: show_title = '{show_title}'")
-        print(f"WORD_NAT DEBUG: comp_info = '{comp_info}'")
-        print(f"WORD_NAT DEBUG: comp_number = '{comp_number}'")
-        print(f"WORD_NAT DEBUG: comp_title = '{comp_title}'")
-        print(f"WORD_NAT DEBUG: comp_subtitle = '{comp_subtitle}'")
-        print(f"WORD_NAT DEBUG: division_number = '{division_number}'")
-        print(f"WORD_NAT DEBUG: location = '{location}'")
-        print(f"WORD_NAT DEBUG: start_time = '{start_time}'")
+        log.debug("show_title = '%s'", show_title)
+        log.debug("comp_info = '%s'", comp_info)
+        log.debug("comp_number = '%s'", comp_number)
+        log.debug("comp_title = '%s'", comp_title)
+        log.debug("comp_subtitle = '%s'", comp_subtitle)
+        log.debug("division_number = '%s'", division_number)
+        log.debug("location = '%s'", location)
+        log.debug("start_time = '%s'", start_time)
         
         # Logo-Größe mit DPI-Korrektur berechnen
         logo_inches = None
@@ -1313,9 +1366,9 @@ def render(starterlist, filename):
                 dpi = pil_img.info.get('dpi', (72, 72))
                 # logo_max_width_cm ist immer die Zielbreite (upscalen erlaubt)
                 logo_inches = logo_max_width_cm / 2.54
-                print(f"WORD_NAT DEBUG: Logo px={img_w}, Zielbreite={logo_max_width_cm}cm = {logo_inches:.3f}in")
+                log.debug("Logo px=%s, Zielbreite=%scm = %.3fin", img_w, logo_max_width_cm, logo_inches)
             except Exception as e:
-                print(f"WORD_NAT DEBUG: Logo DPI-Berechnung Fehler: {e}")
+                log.warning("Logo DPI-Berechnung Fehler: %s", e)
                 logo_inches = logo_max_width_cm / 2.54
 
         # Header-Tabelle: Text links | Logo rechts (oder nur Text wenn kein Logo)
@@ -1337,11 +1390,16 @@ def render(starterlist, filename):
                 b = OxmlElement(f'w:{bn}')
                 b.set(qn('w:val'), 'none')
                 h_borders.append(b)
-            h_tbl_pr.append(h_borders)
+            # CT_TblPr ist eine feste Sequenz - an der Schema-Position einfügen
+            h_tbl_pr.insert_element_before(h_borders, 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             h_tbl_w = OxmlElement('w:tblW')
             h_tbl_w.set(qn('w:w'), str(page_twips))
             h_tbl_w.set(qn('w:type'), 'dxa')
-            h_tbl_pr.append(h_tbl_w)
+            h_tbl_pr.remove_all('w:tblW')
+            h_tbl_pr.insert_element_before(h_tbl_w, 'w:jc', 'w:tblCellSpacing', 'w:tblInd', 'w:tblBorders',
+                                            'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook',
+                                            'w:tblCaption', 'w:tblDescription', 'w:tblPrChange')
             # tblGrid
             tbl_grid = OxmlElement('w:tblGrid')
             for twips in [text_twips, logo_twips]:
@@ -1539,6 +1597,11 @@ def render(starterlist, filename):
     table.style = 'Table Grid'
     table.alignment = WD_TABLE_ALIGNMENT.LEFT
     
+    # Tabelle formatieren (Table-Level, einmalig - Zellen über set_cell_format)
+    set_column_widths(table)
+    set_horizontal_borders_only(table)  # NUR horizontale Borders!
+    set_cell_margins_tight(table)
+    
     # Header Row - DUNKELGRAU mit weißer Schrift
     hdr_row = table.add_row()
     hdr_cells = hdr_row.cells
@@ -1566,175 +1629,110 @@ def render(starterlist, filename):
     
     set_dark_header_background(hdr_row)
     set_row_height_auto(hdr_row)
+    set_cell_format(hdr_row)
     
+    # Zeilen-Prototypen: jede Zeilenart einmal komplett formatieren,
+    # danach pro Starter/Pause nur noch XML kopieren und Text einsetzen
+    rows = RowPrototypes(table)
+
+    def _starter_prototype(gray):
+        def build(r):
+            set_row_height_auto(r, cant_split=True)
+            if gray:
+                set_light_gray_background(r)
+            for cell, alignment in zip(r.cells, alignments):
+                p = cell.paragraphs[0]
+                p.alignment = alignment
+                optimize_paragraph_spacing(p)
+            set_cell_format(r)
+        return build
+
+    def _break_prototype(gray, cant_split=True, tight=True):
+        def build(r):
+            set_row_height_auto(r, cant_split=cant_split)
+            cells = r.cells
+            p_break = cells[0].paragraphs[0]
+            p_break.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            if tight:
+                optimize_paragraph_spacing(p_break)
+            # Alle 6 Spalten verbinden
+            cell_0 = cells[0]
+            for i in range(1, 6):
+                cell_0.merge(cells[i])
+            if gray:
+                tcPr = cell_0._tc.get_or_add_tcPr()
+                shd = OxmlElement('w:shd')
+                shd.set(qn('w:fill'), 'E8E8E8')
+                tcPr.append(shd)
+            set_cell_format(r)
+        return build
+
+    rows.define("starter", _starter_prototype(False))
+    rows.define("starter_gray", _starter_prototype(True))
+    rows.define("break_first", _break_prototype(False, tight=False))
+    rows.define("break", _break_prototype(False, cant_split=True))
+    rows.define("break_gray", _break_prototype(True, cant_split=True))
+
     # Starter Rows
     starters = safe_get(starterlist, "starters", [])
+    view = get_view(starterlist)
     
     # BREAKS Array holen und Map erstellen (wie in stream_abstammung!)
     breaks = safe_get(starterlist, "breaks", [])
-    breaks_map = {}
-    for br in breaks:
-        try:
-            # WICHTIG: afterNumberInCompetition kann 0 sein!
-            after_num = br.get("afterNumberInCompetition")
-            if after_num is None:
-                after_num = -1
-            else:
-                after_num = int(after_num)
-            breaks_map[after_num] = br
-            print(f"🔍 Break registriert nach Starter #{after_num}: {br}")
-        except:
-            continue
+    # Pausen aus der normalisierten Starterliste (eine Pause je Position, wie bisher)
+    breaks_map = {k: v[-1] for k, v in view.breaks_map.items()}
+    
+    log.debug("=== PAUSE-DEBUG ===")
+    log.debug("Anzahl Starter: %s", len(starters))
+    log.debug("Anzahl Breaks: %s", len(breaks))
+    log.debug("Breaks Map: %s", breaks_map)
     
-    print(f"\n=== PAUSE-DEBUG ===")
-    print(f"Anzahl Starter: {len(starters)}")
-    print(f"Anzahl Breaks: {len(breaks)}")
-    print(f"Breaks Map: {breaks_map}")
+    # Speicherschonend (word_stream): fertige Zeilen sofort aus dem Dokumentbaum auslagern
+    spool = RowSpool(table) if word_streaming else None
+    
+    # Flaggen: jedes Bild nur einmal einbetten, weitere Zeilen verweisen darauf
+    flags = PictureCache(doc.part)
     
     # ROW COUNTER für korrektes Alternieren (inkl. Breaks!)
     row_counter = 0
     
-    # FLAGGEN-PFAD: App läuft von C:\Python, Flaggen sind in C:\Python\flags
-    def find_flag_path(nat_code):
-        r"""Suche Flagge - App läuft von C:\Python aus"""
-        
-        possible_paths = [
-            # Hauptpfade (App läuft von C:\Python)
-            f"flags/{nat_code}.png",              # C:\Python\flags\GER.png
-            f"./flags/{nat_code}.png",            # Explizit C:\Python\flags\GER.png
-            
-            # Absolute Windows-Pfade (Fallback)
-            f"C:/Python/flags/{nat_code}.png",
-            f"C:\\Python\\flags\\{nat_code}.png",
-            
-            # Falls doch woanders
-            f"../flags/{nat_code}.png",
-            f"../../flags/{nat_code}.png",
-        ]
-        
-        for path in possible_paths:
-            try:
-                if os.path.exists(path):
-                    abs_path = os.path.abspath(path)
-                    print(f"✅ Flagge gefunden: {path} -> {abs_path}")
-                    return path
-            except Exception as e:
-                continue
-        
-        print(f"⚠️ Flagge nicht gefunden für: {nat_code}")
-        print(f"   Aktuelles Verzeichnis: {os.getcwd()}")
-        print(f"   Gesuchte Pfade:")
-        for p in possible_paths[:3]:
-            abs_test = os.path.abspath(p)
-            exists = os.path.exists(p)
-            print(f"   - {p} -> {abs_test} {'✅' if exists else '❌'}")
-        return None
-    
     # WICHTIG: Prüfe ob es eine Pause VOR dem ersten Starter gibt (afterNumberInCompetition=0)
     if 0 in breaks_map:
-        print("🎯 PAUSE VOR ERSTEM STARTER GEFUNDEN!")
-        break_info = breaks_map[0]
-        data_row = table.add_row()
-        cells = data_row.cells
-        set_row_height_auto(data_row, cant_split=True)
-        
-        # Pause-Text formatieren (wie andere Pausen)
-        total_seconds = int(break_info.get("totalSeconds", 0) or 0)
-        info_text = break_info.get("informationText", "")
-        
-        if total_seconds > 0:
-            if total_seconds >= 3600:
-                hours = total_seconds // 3600
-                mins = (total_seconds % 3600) // 60
-                break_text = f"Pause ({hours} h {mins:02d} min)"
-            else:
-                mins = total_seconds // 60
-                break_text = f"Pause ({mins} min)"
-            
-            if info_text:
-                break_text = f"{break_text} - {info_text}"
-        else:
-            break_text = info_text or "Pause"
-        
-        # Set break text in first cell
-        p_break = cells[0].paragraphs[0]
-        p_break.clear()
-        run = p_break.add_run(break_text)
-        run.font.name = 'Arial'  # Wie andere Pausen!
-        run.font.size = Pt(10)
-        run.font.bold = True  # Bold, nicht italic!
-        p_break.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        
-        # Clear other cells and merge (6 columns)
-        for i in range(1, 6):
-            cells[i].paragraphs[0].clear()
-        
-        cell_0 = cells[0]
-        for i in range(1, 6):
-            cell_0.merge(cells[i])
+        log.debug("🎯 PAUSE VOR ERSTEM STARTER GEFUNDEN!")
+        break_text = format_break_text(breaks_map[0])
         
         # Hintergrund: Pause vor erstem Starter ist WEISS (nicht grau!)
-        # Keine Hintergrundfarbe setzen = weiß
         # (Zebra-Logik: row_counter=0 → weiß, dann row_counter=1 → grau)
+        p_break = rows.add("break_first")[0]
+        add_run(p_break, RUN_BREAK, break_text)
         
         row_counter += 1  # Nach Pause ist row_counter=1 → nächster Starter wird grau
-        print(f"✅ Pause vor erstem Starter eingefügt (weiß): '{break_text}'")
+        log.debug("✅ Pause vor erstem Starter eingefügt (weiß): '%s'", break_text)
     
     for idx, starter in enumerate(starters):
-        data_row = table.add_row()
-        cells = data_row.cells
-        
-        set_row_height_auto(data_row, cant_split=True)
+        if spool:
+            spool.flush()  # vorherige Zeilen sind fertig -> auslagern
+        row = view.row(starter)
         
         # Check if withdrawn FIRST!
         is_withdrawn = starter.get("withdrawn", False)
         is_hors_concours = starter.get("horsConcours", False)  # AK - Außer Konkurrenz
+        strike = bool(is_withdrawn)  # durchgestrichen, KEINE Farbänderung
         
         # ALTERNATING GRAY basierend auf row_counter
-        if row_counter % 2 == 1:
-            set_light_gray_background(data_row)
+        p0, p1, p2, p3, p4, p5 = rows.add("starter_gray" if row_counter % 2 == 1 else "starter")
         
         row_counter += 1  # Erhöhe nach jeder Datenzeile
         
         # Column 0: # (durchgestrichen wenn withdrawn) + AK darunter wenn horsConcours
         start_number = safe_get(starter, "startNumber", "")
-        p0 = cells[0].paragraphs[0]
-        p0.clear()
-        run = p0.add_run(str(start_number))
-        run.font.name = 'Arial'
-        run.font.size = Pt(8)  # 8pt
-        run.font.bold = False  # NICHT fett
-        if is_withdrawn:
-            run.font.strike = True
-            # KEINE Farbänderung mehr!
-        
-        # AK unter der Startnummer wenn horsConcours
+        add_run(p0, RUN_NUMBER, str(start_number), strike)
         if is_hors_concours:
-            p0.add_run("\n")
-            ak_run = p0.add_run("AK")
-            ak_run.font.name = 'Arial'
-            ak_run.font.size = Pt(7)
-            ak_run.font.bold = True
-            # Wenn withdrawn, auch AK durchstreichen
-            if is_withdrawn:
-                ak_run.font.strike = True
-        
-        p0.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        optimize_paragraph_spacing(p0)
+            add_line_break(p0)
+            add_run(p0, RUN_AK, "AK", strike)
         
         # Column 1: Time MIT SEKUNDEN (durchgestrichen wenn withdrawn)
-        start_time = safe_get(starter, "startTime", "")
-        formatted_time = format_time(start_time)
-        p1 = cells[1].paragraphs[0]
-        p1.clear()
-        run = p1.add_run(formatted_time)
-        run.font.name = 'Arial'
-        run.font.size = Pt(8)  # 8pt
-        run.font.bold = False  # NICHT fett
-        if is_withdrawn:
-            run.font.strike = True
-        p1.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        optimize_paragraph_spacing(p1)
+        add_run(p1, RUN_NUMBER, row.time_str, strike)
         
         # horses Array
         horses = starter.get("horses", [])
@@ -1742,63 +1740,28 @@ def render(starterlist, filename):
         
         # Column 2: CNO (KEINE Umrandung mehr!)
         cno = str(horse.get("cno", "")) if horse else ""
-        p2 = cells[2].paragraphs[0]
-        p2.clear()
         if cno:
-            run = p2.add_run(cno)
-            run.font.name = 'Arial'
-            run.font.size = Pt(8)  # 8pt
-            run.font.bold = False  # NICHT fett
-            if is_withdrawn:
-                run.font.strike = True
-            p2.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        optimize_paragraph_spacing(p2)
-        
-        # Entferne ALLE Borders von ALLEN Zellen dieser Zeile
-        for cell in cells:
-            tc = cell._tc
-            tcPr = tc.get_or_add_tcPr()
-            existing_borders = tcPr.xpath('.//w:tcBorders')
-            for border in existing_borders:
-                tcPr.remove(border)
-        
-        # Column 3: Horse (LINKSBÜNDIG!) - NEUE POSITION!
-        horse_name = horse.get("name", "") if horse else ""
+            add_run(p2, RUN_NUMBER, cno, strike)
         
-        p3 = cells[3].paragraphs[0]
-        p3.clear()
-        p3.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT  # LINKSBÜNDIG!
+        # Column 3: Horse (LINKSBÜNDIG!)
+        horse_name = horse.get("name", "") if horse else ""
         
         # Pferdename in FETT (wie PDF: Arial, 9pt)
         if horse_name:
-            run = p3.add_run(horse_name)
-            run.font.name = 'Arial'
-            run.font.size = Pt(9)  # 9pt fett
-            run.font.bold = True
-            if is_withdrawn:
-                run.font.strike = True
+            add_run(p3, RUN_NAME, horse_name, strike)
             
             # BREED hinter Namen mit " - " (NICHT FETT!)
             breed = horse.get("breed", "") if horse else ""
             if breed:
-                run = p3.add_run(f" - {breed}")
-                run.font.name = 'Arial'
-                run.font.size = Pt(9)  # 9pt
-                run.font.bold = False  # NICHT FETT!
-                if is_withdrawn:
-                    run.font.strike = True
+                add_run(p3, RUN_BREED, f" - {breed}", strike)
         
         if horse:
             horse_details = []
             
             # Alter mit "/" danach
-            breeding_season = horse.get("breedingSeason")
-            if breeding_season:
-                try:
-                    age = 2025 - int(breeding_season)
-                    horse_details.append(f"{age}jähr. /")
-                except:
-                    pass
+            age = row.age
+            if age is not None:
+                horse_details.append(f"{age}jähr. /")
             
             # FARBE zwischen Alter und Geschlecht
             color = horse.get("color", "")
@@ -1833,134 +1796,63 @@ def render(starterlist, filename):
                 horse_details.append(f"/ {fei_number}")
             
             if horse_details:
-                p3.add_run("\n")
-                detail_text = " ".join(horse_details)
-                run = p3.add_run(detail_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(7)  # 7pt für Details
-                if is_withdrawn:
-                    run.font.strike = True
+                add_line_break(p3)
+                add_run(p3, RUN_DETAIL, " ".join(horse_details), strike)  # 7pt für Details
             
             # Owner
             owner = horse.get("owner", "")
             if owner:
-                p3.add_run("\n")
-                run = p3.add_run(f"Besitzer: {owner}")
-                run.font.name = 'Arial'
-                run.font.size = Pt(7)  # 7pt
-                run.font.italic = True
-                if is_withdrawn:
-                    run.font.strike = True
+                add_line_break(p3)
+                add_run(p3, RUN_INFO, f"Besitzer: {owner}", strike)
             
             # Breeder (NEU!)
             breeder = horse.get("breeder", "")
             if breeder:
-                p3.add_run("\n")
-                run = p3.add_run(f"Züchter: {breeder}")
-                run.font.name = 'Arial'
-                run.font.size = Pt(7)  # 7pt
-                run.font.italic = True
-                if is_withdrawn:
-                    run.font.strike = True
+                add_line_break(p3)
+                add_run(p3, RUN_INFO, f"Züchter: {breeder}", strike)
         
-        optimize_paragraph_spacing(p3)
-        
-        # Column 4: Athlete (LINKSBÜNDIG!) - NEUE POSITION!
+        # Column 4: Athlete (LINKSBÜNDIG!)
         athlete = starter.get("athlete", {})
         athlete_name = athlete.get("name", "") if athlete else ""
         
-        p4 = cells[4].paragraphs[0]
-        p4.clear()
-        p4.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT  # LINKSBÜNDIG!
-        
         if athlete_name:
-            run = p4.add_run(athlete_name)
-            run.font.name = 'Arial'
-            run.font.size = Pt(9)
-            run.font.bold = True
-            if is_withdrawn:
-                run.font.strike = True
+            add_run(p4, RUN_NAME, athlete_name, strike)
 
         # Verein / Land unter Reitername (Ausländer-Logik wie im PDF)
-        club = athlete.get("club", "") if athlete else ""
-        nationality = athlete.get("nation", "") if athlete else ""
-        club_or_country = ""
-        if nationality and nationality.upper() != "GER":
-            # Ausländer: Land wenn kein Verein oder Gastlizenz GER
-            if not club or club.strip() == "" or club.strip().upper() == "GASTLIZENZ GER":
-                club_or_country = get_country_name_german(nationality)
-            else:
-                club_or_country = club
-        elif club:
-            # Deutsche: Verein
-            club_or_country = club
+        club_or_country = row.club_or_country_de
 
         if club_or_country:
-            p4.add_run("\n")
-            detail_run = p4.add_run(club_or_country)
-            detail_run.font.name = 'Arial'
-            detail_run.font.size = Pt(7)
-            detail_run.font.bold = False
-            if is_withdrawn:
-                detail_run.font.strike = True
-
-        optimize_paragraph_spacing(p4)
-        
-        # Column 5: Nat. mit echten Flaggen-Icons - NEUE POSITION!
-        nationality = athlete.get("nation", "") if athlete else ""
-        nat_code = get_nationality_code(nationality) if nationality else ""
-        
-        p5 = cells[5].paragraphs[0]
-        p5.clear()
+            add_line_break(p4)
+            add_run(p4, RUN_SMALL, club_or_country, strike)
+        
+        # Column 5: Nat. mit echten Flaggen-Icons
+        nat_code = row.nat_code
+        
         if nat_code:
             # Versuche Flaggen-Icon zu finden
-            flag_path = find_flag_path(nat_code)
+            flag_path = row.flag_path
             
             if flag_path:
                 # Flaggen-Icon einfügen
                 try:
-                    from io import BytesIO
-                    
-                    abs_flag_path = os.path.abspath(flag_path)
-                    
-                    with open(abs_flag_path, 'rb') as f:
-                        image_bytes = BytesIO(f.read())
-                    
-                    run = p5.add_run()
-                    run.add_picture(image_bytes, width=Inches(0.25))
-                    p5.add_run("\n")
-                    
-                    size = len(image_bytes.getvalue())
-                    print(f"✅ Flagge eingefügt: {abs_flag_path} ({size} bytes)")
+                    flags.add(p5, flag_path, Inches(0.25))
+                    add_line_break(p5)
+                    log.debug("✅ Flagge eingefügt: %s", flag_path)
                 except Exception as e:
-                    print(f"⚠️ Konnte Flagge nicht laden: {flag_path} - {e}")
-                    import traceback
-                    traceback.print_exc()
+                    log.warning("⚠️ Konnte Flagge nicht laden: %s - %s", flag_path, e, exc_info=True)
             else:
-                print(f"⚠️ Flagge nicht gefunden für: {nat_code}")
+                log.debug("⚠️ Flagge nicht gefunden für: %s", nat_code)
             
             # Code darunter
-            run = p5.add_run(nat_code)
-            run.font.name = 'Arial'
-            run.font.size = Pt(7)  # 7pt
-            run.font.bold = False  # NICHT fett
-            if is_withdrawn:
-                run.font.strike = True
-            p5.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        optimize_paragraph_spacing(p5)
+            add_run(p5, RUN_SMALL, nat_code, strike)
         
         # BREAK HANDLING - Nach diesem Starter prüfen ob Pause kommt!
         try:
             starter_num = int(safe_get(starter, "startNumber", 0))
             if starter_num in breaks_map:
-                print(f"\n✅ PAUSE nach Starter #{starter_num}!")
+                log.debug("✅ PAUSE nach Starter #%s!", starter_num)
                 break_info = breaks_map[starter_num]
                 
-                break_row = table.add_row()
-                break_cells = break_row.cells
-                
-                set_row_height_auto(break_row, cant_split=True)
-                
                 # HINTERGRUND ALTERNIEREND basierend auf row_counter
                 # row_counter ist jetzt nach der letzten Zeile erhöht worden
                 # Also: wenn row_counter gerade → letzte Zeile war ungerade (grau) → Break weiß
@@ -1968,61 +1860,17 @@ def render(starterlist, filename):
                 break_is_gray = (row_counter % 2 == 1)
                 row_counter += 1  # Erhöhe auch für Break-Zeile!
                 
-                # Format break text
-                total_seconds = int(break_info.get("totalSeconds", 0) or 0)
-                info_text = break_info.get("informationText", "")
-                
-                if total_seconds > 0:
-                    if total_seconds >= 3600:
-                        hours = total_seconds // 3600
-                        mins = (total_seconds % 3600) // 60
-                        break_text = f"Pause ({hours} h {mins:02d} min)"
-                    else:
-                        mins = total_seconds // 60
-                        break_text = f"Pause ({mins} min)"
-                    
-                    if info_text:
-                        break_text = f"{break_text} - {info_text}"
-                else:
-                    break_text = info_text or "Pause"
-                
-                print(f"   Break Text: {break_text}, Gray: {break_is_gray}")
-                
-                # Set break text in first cell
-                p_break = break_cells[0].paragraphs[0]
-                p_break.clear()
-                run = p_break.add_run(break_text)
-                run.font.name = 'Arial'
-                run.font.size = Pt(10)
-                run.font.bold = True
-                p_break.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                optimize_paragraph_spacing(p_break)
-                
-                # Clear other cells and merge (6 columns)
-                for i in range(1, 6):
-                    break_cells[i].paragraphs[0].clear()
+                break_text = format_break_text(break_info)
+                log.debug("Break Text: %s, Gray: %s", break_text, break_is_gray)
                 
-                cell_0 = break_cells[0]
-                for i in range(1, 6):
-                    cell_0.merge(break_cells[i])
-                
-                # Hintergrund nur wenn grau
-                if break_is_gray:
-                    tcPr = cell_0._tc.get_or_add_tcPr()
-                    shd = OxmlElement('w:shd')
-                    shd.set(qn('w:fill'), 'E8E8E8')
-                    tcPr.append(shd)
+                p_break = rows.add("break_gray" if break_is_gray else "break")[0]
+                add_run(p_break, RUN_BREAK, break_text)
                 
         except (ValueError, TypeError):
             pass
     
-    # Tabelle formatieren
-    set_column_widths(table)
-    set_horizontal_borders_only(table)  # NUR horizontale Borders!
-    set_cell_margins_tight(table)
-    
 # SPONSORENLEISTE IM FOOTER - nur wenn show_sponsor_bar aktiv
-    sponsor_logo_path = "logos/sponsorenleiste.png"
+    sponsor_logo_path = asset_path(print_options, "sponsorenleiste.png")
     if show_sponsor_bar and os.path.exists(sponsor_logo_path):
         try:
             def _add_sponsor_to_footer(footer_obj):
@@ -2040,16 +1888,20 @@ def render(starterlist, filename):
                 if show_banner and section.different_first_page_header_footer:
                     _add_sponsor_to_footer(section.first_page_footer)
 
-            print(f"WORD_NAT DEBUG: Sponsorenleiste im Footer hinzugefügt: {sponsor_logo_path}")
+            log.debug("Sponsorenleiste im Footer hinzugefügt: %s", sponsor_logo_path)
         except Exception as e:
-            print(f"WORD_NAT DEBUG: Sponsorenleiste Footer-Fehler: {e}")
+            log.warning("Sponsorenleiste Footer-Fehler: %s", e)
     else:
-        print(f"WORD_NAT DEBUG: Sponsorenleiste nicht gefunden: {sponsor_logo_path}")
+        log.debug("Sponsorenleiste nicht gefunden: %s", sponsor_logo_path)
     
     # Save to output directory
-    print(f"WORD_NAT DEBUG: Saving document to {output_path}")
-    doc.save(output_path)
-    print(f"WORD_NAT DEBUG: Document saved successfully")
+    log.debug("Saving document to %s", output_path)
+    if spool:
+        save_streamed(doc, output_path, spool)
+        log.debug("%s Zeilen gestreamt", spool.rows)
+    else:
+        doc.save(output_path)
+    log.debug("Document saved successfully")
     return output_path
 
 def create_stream(starterlist, template, filename):
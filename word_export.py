@@ -1,8 +1,18 @@
 # word_export.py - Erweitert um prüfungsspezifisches Logo-System
-import importlib
 import os
 import json
 
+from word_templates import registry as word_templates
+
+import export_metrics
+import template_manifest
+from app_logging import get_logger
+from render_context import RenderContext
+
+log = get_logger(__name__)
+
+export_metrics.instrument_docx()
+
 def _find_logo_file(logo_dir: str, basename: str) -> str:
     """Sucht Logo in .png / .jpg / .jpeg"""
     for ext in [".png", ".jpg", ".jpeg"]:
@@ -30,7 +40,7 @@ def _get_banner_sponsor_paths(username: str = None) -> dict:
             found = _find_logo_file("logos", basename)
         if found:
             result[key] = found
-            print(f"WORD EXPORT DEBUG: {key} = {found}")
+            log.debug("%s = %s", key, found)
     return result
     """
     Bestimmt den Logo-Pfad basierend auf XXY-Schema.
@@ -60,22 +70,22 @@ def _get_banner_sponsor_paths(username: str = None) -> dict:
         xxy_code = f"{comp_num_int:02d}{division_num}"
         specific_logo = _find_logo_file(logo_dir, xxy_code)
 
-        print(f"WORD EXPORT DEBUG: Prüfung {comp_num_int}, Abt. {division_num} → Suche: {logo_dir}/{xxy_code}.*")
+        log.debug("Prüfung %s, Abt. %s → Suche: %s/%s.*", comp_num_int, division_num, logo_dir, xxy_code)
 
         if specific_logo:
-            print(f"WORD EXPORT DEBUG: Spezifisches Logo gefunden: {specific_logo}")
+            log.debug("Spezifisches Logo gefunden: %s", specific_logo)
             return specific_logo
 
         fallback = _find_logo_file(logo_dir, "logo")
         if fallback:
-            print(f"WORD EXPORT DEBUG: Standard-Logo verwendet: {fallback}")
+            log.debug("Standard-Logo verwendet: %s", fallback)
             return fallback
 
-        print("WORD EXPORT DEBUG: Kein Logo gefunden")
+        log.debug("Kein Logo gefunden")
         return None
 
     except Exception as e:
-        print(f"WORD EXPORT DEBUG: Fehler bei Logo-Bestimmung: {e}")
+        log.warning("Fehler bei Logo-Bestimmung: %s", e)
         return _find_logo_file("logos", "logo")
 
 def determine_logo_path(starterlist, username: str = None):
@@ -109,22 +119,22 @@ def determine_logo_path(starterlist, username: str = None):
         xxy_code = f"{comp_num_int:02d}{division_num}"
         specific_logo = _find_logo_file(logo_dir, xxy_code)
 
-        print(f"WORD EXPORT DEBUG: Suche Logo: {logo_dir}/{xxy_code}.*")
+        log.debug("Suche Logo: %s/%s.*", logo_dir, xxy_code)
 
         if specific_logo:
-            print(f"WORD EXPORT DEBUG: Spezifisches Logo gefunden: {specific_logo}")
+            log.debug("Spezifisches Logo gefunden: %s", specific_logo)
             return specific_logo
 
         fallback = _find_logo_file(logo_dir, "logo")
         if fallback:
-            print(f"WORD EXPORT DEBUG: Standard-Logo verwendet: {fallback}")
+            log.debug("Standard-Logo verwendet: %s", fallback)
             return fallback
 
-        print("WORD EXPORT DEBUG: Kein Logo gefunden")
+        log.debug("Kein Logo gefunden")
         return None
 
     except Exception as e:
-        print(f"WORD EXPORT DEBUG: Fehler bei Logo-Bestimmung: {e}")
+        log.warning("Fehler bei Logo-Bestimmung: %s", e)
         return _find_logo_file("logos", "logo")
 
 def create_word(starterlist: dict, template_name: str, filename: str, logos_enabled: bool = True, print_options: dict = None, logo_max_width_cm: float = 5.0, username: str = None) -> str:
@@ -140,15 +150,30 @@ def create_word(starterlist: dict, template_name: str, filename: str, logos_enab
     Returns:
         str: Pfad zur erstellten Datei
     """
-    print(f"WORD EXPORT DEBUG: create_word aufgerufen mit template_name='{template_name}', logos_enabled={logos_enabled}")
+    log.debug("create_word aufgerufen mit template_name='%s', logos_enabled=%s", template_name, logos_enabled)
     
+    export_metrics.tag(template=template_name, starters=len(starterlist.get("starters") or []))
+
     # Logo-Pfad bestimmen und in starterlist einfügen
     logo_path = None
     if logos_enabled:
-        logo_path = determine_logo_path(starterlist, username=username)
+        with export_metrics.span("assets", asset="logo"):
+            logo_path = determine_logo_path(starterlist, username=username)
         
-    # Logo-Pfad in starterlist einfügen für Template-Zugriff
-    starterlist_with_logo = starterlist.copy()
+    # Banner und Sponsorenleiste Pfade ermitteln
+    with export_metrics.span("assets", asset="banner_sponsor"):
+        banner_sponsor = _get_banner_sponsor_paths(username=username)
+
+    # Alles für das Template in einem Kontext (eigene Kopien pro Export)
+    context = RenderContext(
+        print_options,
+        banner_path=banner_sponsor.get("bannerPath", ""),
+        sponsor_path=banner_sponsor.get("sponsorPath", ""),
+        logo_path=logo_path,
+        locale=template_manifest.info("word", template_name)["language"],
+        username=username,
+    )
+    starterlist_with_logo = context.apply(starterlist)
     starterlist_with_logo["logoPath"] = logo_path
     starterlist_with_logo["logoMaxWidthCm"] = logo_max_width_cm
 
@@ -159,138 +184,39 @@ def create_word(starterlist: dict, template_name: str, filename: str, logos_enab
     else:
         starterlist_with_logo["spacingTopCm"]    = 3.0
         starterlist_with_logo["spacingBottomCm"] = 2.0
-
-    # Druckoptionen hinzufügen (immer, damit Templates darauf zugreifen können)
-    if print_options:
-        starterlist_with_logo["printOptions"] = print_options
-        print(f"WORD EXPORT DEBUG: print_options hinzugefügt: {print_options}")
-    else:
-        # Sichere Defaults damit Templates keinen KeyError bekommen
-        starterlist_with_logo["printOptions"] = {
-            "sponsor_top":      False,
-            "sponsor_bottom":   False,
-            "single_sided":     False,
-            "show_banner":      True,
-            "show_sponsor_bar": True,
-            "show_title":       True,
-            "show_header":      True,
-        }
-
-    # Banner und Sponsorenleiste Pfade ermitteln
-    banner_sponsor = _get_banner_sponsor_paths(username=username)
-    starterlist_with_logo.update(banner_sponsor)
-    starterlist_with_logo["printOptions"]["bannerPath"]  = banner_sponsor.get("bannerPath", "")
-    starterlist_with_logo["printOptions"]["sponsorPath"] = banner_sponsor.get("sponsorPath", "")
-    
-    # Template-Mapping erweitert um Logo-Varianten UND Stream-Templates
-    template_mapping = {
-        # Standard-Templates (ohne Logo)
-        "word_standard": "templates.word.word_standard",
-        "word_details_modern": "templates.word.word_standard",
-        "word_abstammung": "templates.word.word_abstammung", 
-        "word_dre_3": "templates.word.word_dre_3",
-        "word_dre_5": "templates.word.word_dre_5",
-        
-        # Logo-Varianten
-        "word_standard_logo": "templates.word.word_standard_logo",
-        "word_details_modern_logo": "templates.word.word_standard_logo",
-        "word_abstammung_logo": "templates.word.word_abstammung_logo",
-        "word_dre_3_logo": "templates.word.word_dre_3_logo", 
-        "word_dre_5_logo": "templates.word.word_dre_5_logo",
-        "word_dre_402c_logo": "templates.word_dre_402c_logo",
-        
-        # International Style (mit Flaggen)
-        "word_int": "templates.word.word_int",
-        "word_int_abstammung": "templates.word.word_int_abstammung",
-        
-        # National Style (deutsche Texte)
-        "word_nat": "templates.word.word_nat",
-    }
-    
-    # Template-Modul bestimmen
-    template_module_path = template_mapping.get(template_name)
-    
-    if not template_module_path:
-        # Fallback: versuche Standard-Template
-        print(f"WORD EXPORT WARNING: Template '{template_name}' nicht gefunden, verwende word_standard")
-        template_module_path = "templates.word.word_standard"
-    
-    print(f"WORD EXPORT DEBUG: Verwende Template-Modul: {template_module_path}")
+    log.debug("print_options: %s", starterlist_with_logo["printOptions"])
     
     try:
-        # Template-Modul dynamisch laden - Alternativer Ansatz
-        import sys
-        import os
-        
-        # Template-Pfad zum Python-Pfad hinzufügen
-        # Stream-Templates liegen in templates/stream
-        if template_module_path.startswith("templates.stream"):
-            template_dir = os.path.join(os.getcwd(), "templates", "stream")
-        else:
-            template_dir = os.path.join(os.getcwd(), "templates", "word")
-        
-        if template_dir not in sys.path:
-            sys.path.insert(0, template_dir)
-        
-        # Template-Modul-Name extrahieren
-        module_name = template_module_path.split('.')[-1]  # z.B. "word_standard_logo"
-        
-        # Direkter Import des Moduls
-        template_module = importlib.import_module(module_name)
-
-        # Banner/Sponsorenleiste: User-Dateien temporär nach logos/ kopieren
-        import shutil
-        _temp_copies = {}
-        for src_key, dest_name in [("bannerPath", "banner.png"), ("sponsorPath", "sponsorenleiste.png")]:
-            src  = banner_sponsor.get(src_key, "")
-            dest = os.path.join("logos", dest_name)
-            if src and os.path.exists(src) and os.path.abspath(src) != os.path.abspath(dest):
-                if os.path.exists(dest):
-                    backup = dest + ".bak"
-                    shutil.copy2(dest, backup)
-                    _temp_copies[dest] = backup
-                else:
-                    _temp_copies[dest] = None
-                shutil.copy2(src, dest)
-                print(f"WORD EXPORT DEBUG: Temporär kopiert: {src} → {dest}")
+        # Template aus der Registry (templates/word/*.py, gecacht nach Dateiinhalt)
+        with export_metrics.span("template_load"):
+            template_module = word_templates.get(template_name)
+        log.debug("Verwende Template: %s", template_name)
 
-        try:
+        # Banner und Sponsorenleiste liest das Template aus printOptions (bannerPath/sponsorPath)
+        with export_metrics.span("render"):
             result_path = template_module.render(starterlist_with_logo, filename)
-        finally:
-            for dest, backup in _temp_copies.items():
-                try:
-                    os.remove(dest)
-                    if backup and os.path.exists(backup):
-                        shutil.move(backup, dest)
-                except:
-                    pass
-
-        print(f"WORD EXPORT DEBUG: Word-Dokument erfolgreich erstellt: {result_path}")
+
+        log.debug("Word-Dokument erfolgreich erstellt: %s", result_path)
+        if export_metrics.current() is not None and result_path and os.path.exists(result_path):
+            export_metrics.tag(bytes=os.path.getsize(result_path))
         return result_path
         
     except Exception as e:
-        print(f"WORD EXPORT ERROR: Fehler beim Erstellen des Word-Dokuments: {e}")
+        log.error("Fehler beim Erstellen des Word-Dokuments: %s", e)
         raise
 
+# Anzeigenamen für bekannte Templates; weitere Templates aus dem Ordner erscheinen mit Dateinamen
+TEMPLATE_LABELS = {
+    "word_standard_logo": "Standard mit Logo (6-Spalten kompakt)",
+    "word_abstammung_logo": "Abstammung mit Logo (5-Spalten mit Details)",
+    "word_dre_3_logo": "Dressur 3-Richter mit Logo (7-Spalten)",
+    "word_dre_5_logo": "Dressur 5-Richter mit Logo (9-Spalten)",
+    "word_dre_402c_logo": "Dressur 402,C mit Logo",
+    "word_int": "International Style (mit Flaggen)",
+    "word_nat": "National Style (deutsche Texte mit Flaggen)",
+}
+
 # Verfügbare Templates für UI-Auswahl
 def get_available_word_templates():
-    """Gibt eine Liste der verfügbaren Word-Templates zurück"""
-    return [
-        # Standard-Templates (ohne Logo) 
-        ("word_standard", "Standard (6-Spalten kompakt)"),
-        ("word_abstammung", "Abstammung (5-Spalten mit Details)"),
-        ("word_dre_3", "Dressur 3-Richter (7-Spalten)"),
-        ("word_dre_5", "Dressur 5-Richter (9-Spalten)"),
-        
-        # Logo-Varianten
-        ("word_standard_logo", "Standard mit Logo (6-Spalten kompakt)"),
-        ("word_abstammung_logo", "Abstammung mit Logo (5-Spalten mit Details)"), 
-        ("word_dre_3_logo", "Dressur 3-Richter mit Logo (7-Spalten)"),
-        ("word_dre_5_logo", "Dressur 5-Richter mit Logo (9-Spalten)"),
-        ("word_dre_402c_logo", "Dressur 402,C mit Logo"),
-        
-        # International & National Styles
-        ("word_int", "International Style (mit Flaggen)"),
-        ("word_nat", "National Style (deutsche Texte mit Flaggen)"),
-        ("word_int_abstammung", "International Abstammung (mit Flaggen)"),
-    ]
\ No newline at end of file
+    """Gibt eine Liste der verfügbaren Word-Templates zurück (aus templates/word/)"""
+    return [(name, TEMPLATE_LABELS.get(name, name)) for name in word_templates.names()]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# word_images.py
+#
+# Bild-Cache für Word-Exporte (Flaggen in word_nat / word_int).
+#
+# Bisher wurde jede Flagge pro Starterzeile von der Platte gelesen, von
+# python-docx neu eingelesen und per SHA1 gehasht; zusätzlich sucht
+# python-docx für jede Bild-ID per XPath über das ganze Dokument. Bei einer
+# rein deutschen Liste passiert das 150-mal für dieselbe Datei.
+#
+# Jetzt:
+#   - read_image(): Dateiinhalt pro Prozess einmal im Speicher (mit mtime-Prüfung)
+#   - PictureCache: pro Dokument wird jedes Bild einmal als Part eingebettet;
+#     weitere Zeilen bekommen eine Kopie des fertigen Bild-Runs, der auf
+#     dieselbe Relationship-ID verweist. Nur die Shape-ID wird hochgezählt.
+#
+import os
+import threading
+from copy import deepcopy
+from io import BytesIO
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.text.paragraph import Paragraph
+
+_files = {}  # absoluter Pfad -> (mtime, bytes)
+_files_lock = threading.Lock()
+
+
+def read_image(path):
+    """Bilddatei als Bytes, prozessweit gecacht (neu gelesen wenn die Datei sich ändert)"""
+    abs_path = os.path.abspath(path)
+    mtime = os.path.getmtime(abs_path)
+    with _files_lock:
+        entry = _files.get(abs_path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+    with open(abs_path, "rb") as f:
+        data = f.read()
+    with _files_lock:
+        _files[abs_path] = (mtime, data)
+    return data
+
+
+class PictureCache:
+    """
+    Bild-Runs für ein Dokument: pro (Datei, Breite) einmal über python-docx
+    erzeugt, danach nur noch kopiert.
+    """
+
+    def __init__(self, part):
+        self._part = part      # Dokument-Part (doc.part), in dessen Body die Bilder landen
+        self._runs = {}        # (pfad, breite) -> w:r mit w:drawing
+        self._next_id = None
+
+    def _prototype(self, path, width):
+        key = (path, width)
+        r = self._runs.get(key)
+        if r is None:
+            inline = self._part.new_pic_inline(BytesIO(read_image(path)), width=width)
+            r = Paragraph(parse_xml(f"<w:p {nsdecls('w')}/>"), None).add_run()._r
+            r.add_drawing(inline)
+            self._runs[key] = r
+        return r
+
+    def _shape_id(self):
+        if self._next_id is None:
+            self._next_id = self._part.next_id  # einmal über das Dokument suchen
+        shape_id = self._next_id
+        self._next_id += 1
+        return shape_id
+
+    def add(self, p, path, width):
+        """Hängt das Bild als eigenen Run an den Absatz (w:p) an"""
+        r = deepcopy(self._prototype(path, width))
+        shape_id = self._shape_id()
+        for doc_pr in r.iter(qn("wp:docPr")):
+            doc_pr.set("id", str(shape_id))
+            doc_pr.set("name", f"Picture {shape_id}")
+        p.append(r)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# word_rows.py
+#
+# Zeilen-Prototypen für Word-Tabellen (word_nat, word_int).
+#
+# Bisher wurde jede Starterzeile mit table.add_row() angelegt und Zelle für
+# Zelle über die python-docx-API formatiert (p.clear(), add_run(), Schrift,
+# Ausrichtung, Abstände, Hintergrund, Zeilenhöhe). Bei 150+ Startern sind das
+# tausende API-Aufrufe pro Dokument.
+#
+# Hier wird jede Zeilenart (Starter weiß/grau, Pause ...) einmal komplett mit
+# python-docx formatiert, als XML abgelegt und pro Zeile nur noch mit lxml
+# kopiert. Auch Runs (Schriftart/-größe/fett/kursiv, optional durchgestrichen)
+# liegen als fertige Prototypen vor; pro Zeile wird nur noch Text eingesetzt.
+#
+# Verwendung im Template:
+#     rows = RowPrototypes(table)
+#     rows.define("starter", lambda r: ...)   # r = python-docx Row
+#     paras = rows.add("starter")              # erster w:p je Zelle
+#     add_run(paras[0], NUMBER, "12", strike=True)
+#
+from copy import deepcopy
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt
+from docx.text.paragraph import Paragraph
+
+_EMPTY_P = f"<w:p {nsdecls('w')}/>"
+
+
+class RunStyle:
+    """Vorformatierter Run (Schrift, Größe, fett/kursiv), normal und durchgestrichen"""
+    __slots__ = ("_plain", "_strike")
+
+    def __init__(self, size, bold=None, italic=None, font="Arial"):
+        run = Paragraph(parse_xml(_EMPTY_P), None).add_run()
+        run.font.name = font
+        run.font.size = Pt(size)
+        if bold is not None:
+            run.font.bold = bold
+        if italic is not None:
+            run.font.italic = italic
+        self._plain = run._r
+        run.font.strike = True
+        self._strike = deepcopy(run._r)
+        run.font.strike = None
+
+    def make(self, text, strike=False):
+        r = deepcopy(self._strike if strike else self._plain)
+        r.text = text  # '\n' wird wie bei add_run() zu <w:br/>
+        return r
+
+
+_LINE_BREAK = Paragraph(parse_xml(_EMPTY_P), None).add_run("\n")._r
+
+
+def add_run(p, style, text, strike=False):
+    """Hängt einen Run im Stil style an den Absatz (w:p) an"""
+    p.append(style.make(text, strike))
+
+
+def add_line_break(p):
+    """Zeilenumbruch als eigener Run - entspricht p.add_run("\\n")"""
+    p.append(deepcopy(_LINE_BREAK))
+
+
+class RowPrototypes:
+    """
+    Fertig formatierte Zeilen je Zeilenart, werden pro Datenzeile nur kopiert.
+    define() formatiert eine Probezeile mit python-docx und nimmt sie wieder
+    aus der Tabelle; add() hängt eine Kopie an und liefert die Absätze.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._tbl = table._tbl
+        self._rows = {}
+
+    def define(self, key, build):
+        row = self.table.add_row()
+        build(row)
+        tr = row._tr
+        self._tbl.remove(tr)
+        self._rows[key] = tr
+
+    def add(self, key):
+        tr = deepcopy(self._rows[key])
+        self._tbl.append(tr)
+        return [tc.p_lst[0] for tc in tr.tc_lst]
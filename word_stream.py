@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# word_stream.py
+#
+# Speicherschonendes Schreiben großer Word-Starterlisten.
+#
+# python-docx hält das komplette Dokument als XML-Baum im Speicher und
+# serialisiert es erst bei doc.save(). Bei Sammel-Exporten vieler Prüfungen
+# liegt so pro Worker jede Tabellenzeile bis zum Schluss im Speicher.
+#
+# RowSpool nimmt fertige Tabellenzeilen sofort aus dem Baum, serialisiert sie
+# in eine temporäre Datei und lässt in der Tabelle nur eine Platzhalter-Zeile
+# zurück. save() speichert das (kleine) Dokumentgerüst mit python-docx und
+# schreibt document.xml dann neu ins DOCX-Zip: Teil vor dem Platzhalter,
+# die gespoolten Zeilen blockweise, Teil danach. Alle anderen Parts (Styles,
+# Kopf-/Fußzeilen, Bilder) werden unverändert übernommen.
+#
+# Verwendung im Template:
+#     spool = RowSpool(table)      # nach der Kopfzeile
+#     for starter in starters:
+#         spool.flush()            # vorherige Zeile(n) sind fertig
+#         ... table.add_row() / RowPrototypes.add() ...
+#     save(doc, output_path, spool)
+#
+# Bilder in gespoolten Zeilen müssen beim Anlegen der Zeile schon als Part im
+# Dokument registriert sein (python-docx add_picture / word_images tun das).
+#
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+
+from lxml import etree
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+_MARKER = "toris-stream-rows"
+_MARKER_XML = f"<!--{_MARKER}-->".encode("utf-8")
+_DOCUMENT_XML = "word/document.xml"
+_CHUNK = 1024 * 1024
+
+
+class RowSpool:
+    """Tabellenzeilen hinter dem Platzhalter werden bei flush() ausgelagert"""
+
+    def __init__(self, table):
+        self._tbl = table._tbl
+        self._marker = parse_xml(f"<w:tr {nsdecls('w')}><!--{_MARKER}--></w:tr>")
+        self._tbl.append(self._marker)
+        self._file = tempfile.TemporaryFile()
+        # Namespaces, die der Dokument-Root ohnehin deklariert -> nicht pro Zeile wiederholen
+        root = self._tbl.getroottree().getroot()
+        self._redundant = [
+            f' xmlns:{prefix}="{uri}"'.encode("utf-8")
+            for prefix, uri in root.nsmap.items() if prefix
+        ]
+        self.rows = 0
+
+    def flush(self):
+        """Alle fertigen Zeilen serialisieren und aus dem Dokumentbaum entfernen"""
+        tr = self._marker.getnext()
+        while tr is not None:
+            following = tr.getnext()
+            xml = etree.tostring(tr, encoding="utf-8")
+            start_end = xml.index(b">") + 1
+            start_tag = xml[:start_end]
+            for decl in self._redundant:
+                start_tag = start_tag.replace(decl, b"")
+            self._file.write(start_tag)
+            self._file.write(xml[start_end:])
+            self._tbl.remove(tr)
+            self.rows += 1
+            tr = following
+
+    def write_rows(self, out):
+        self._file.seek(0)
+        shutil.copyfileobj(self._file, out, _CHUNK)
+
+    def close(self):
+        self._file.close()
+
+
+def save(doc, path, spool):
+    """Speichert das Dokument; die gespoolten Zeilen ersetzen den Platzhalter"""
+    spool.flush()
+    skeleton = BytesIO()
+    doc.save(skeleton)
+    skeleton.seek(0)
+    with zipfile.ZipFile(skeleton) as src, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename != _DOCUMENT_XML:
+                dst.writestr(item, data)
+                continue
+            pos = data.find(_MARKER_XML)
+            if pos < 0:
+                raise ValueError("Platzhalter für gespoolte Zeilen nicht gefunden")
+            start = data.rfind(b"<w:tr", 0, pos)
+            end = data.index(b"</w:tr>", pos) + len(b"</w:tr>")
+            with dst.open(item, "w") as out:
+                out.write(data[:start])
+                spool.write_rows(out)
+                out.write(data[end:])
+    # Erst nach Erfolg schließen - bei Fehler kann mit anderem Pfad erneut gespeichert werden
+    spool.close()
+    return path
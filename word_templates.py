@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# word_templates.py
+#
+# Registry der Word-Templates aus templates/word/*.py.
+#
+# Bisher hat create_word die Templates über eine handgepflegte Mapping-Tabelle
+# aufgelöst (mit Einträgen für Module, die es nicht gibt), templates/word in
+# sys.path eingetragen und per importlib.import_module geladen - das Modul
+# blieb dann für immer im Cache, ein hochgeladenes neues Template wurde erst
+# nach einem Neustart aktiv.
+#
+# Jetzt:
+#   - Templates werden aus dem Ordner ermittelt (jede .py mit render())
+#   - geladene Module werden nach Inhalts-Hash (SHA1) gecacht; ändert sich die
+#     Datei (Upload, Löschen), wird sie beim nächsten Zugriff neu geladen
+#   - invalidate() nach Upload/Löschen, warm_up() lädt alle beim App-Start vor
+#
+import hashlib
+import os
+import threading
+
+import template_bundle
+from app_logging import get_logger
+from file_index import index as file_index
+
+log = get_logger(__name__)
+
+WORD_TEMPLATES_DIR = os.path.join("templates", "word")
+
+# Frühere Namen aus der Mapping-Tabelle -> vorhandenes Template
+ALIASES = {
+    "word_details_modern": "word_standard_logo",
+    "word_details_modern_logo": "word_standard_logo",
+}
+
+
+class WordTemplateRegistry:
+    """Lädt Word-Templates einmal pro Dateiinhalt und hält sie im Speicher"""
+
+    def __init__(self, directory=WORD_TEMPLATES_DIR):
+        self.directory = directory
+        self._modules = {}  # name -> (stat_key, sha1, modul)
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.py")
+
+    def names(self):
+        """Alle Templates im Ordner (ohne __init__ o.ä.), sortiert; Liste aus dem Verzeichnis-Index"""
+        return file_index.stems(self.directory, (".py",))
+
+    def resolve(self, name):
+        """Template-Name inkl. Aliasse auf eine vorhandene Datei abbilden"""
+        name = ALIASES.get(name, name)
+        if not os.path.exists(self.path(name)):
+            raise ValueError(f"Word-Template '{name}' nicht gefunden in {self.directory}")
+        return name
+
+    def get(self, name):
+        """Geladenes Template-Modul (neu geladen, wenn sich der Dateiinhalt geändert hat)"""
+        name = self.resolve(name)
+        path = self.path(name)
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._modules.get(name)
+            if entry is not None and entry[0] == stat_key:
+                return entry[2]
+        with open(path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha1(source).hexdigest()
+        with self._lock:
+            entry = self._modules.get(name)
+            if entry is not None and entry[1] == digest:
+                # Nur Zeitstempel geändert (z.B. gleiche Datei erneut hochgeladen)
+                self._modules[name] = (stat_key, digest, entry[2])
+                return entry[2]
+        module = self._load(name, path)
+        with self._lock:
+            self._modules[name] = (stat_key, digest, module)
+        log.debug("%s geladen (%s)", name, digest[:10])
+        return module
+
+    def _load(self, name, path):
+        module = template_bundle.exec_template(f"word_template_{name}", path)
+        if not hasattr(module, "render"):
+            raise AttributeError(f"Word-Template {name} hat keine Funktion render(starterlist, filename)")
+        return module
+
+    def invalidate(self, name=None):
+        """Cache für ein Template (oder alle) verwerfen - nach Upload/Löschen aufrufen"""
+        file_index.invalidate(self.directory)
+        with self._lock:
+            if name is None:
+                self._modules.clear()
+            else:
+                self._modules.pop(ALIASES.get(name, name), None)
+
+    def warm_up(self):
+        """Alle Templates vorladen; fehlerhafte werden nur gemeldet"""
+        loaded = []
+        for name in self.names():
+            try:
+                self.get(name)
+                loaded.append(name)
+            except Exception as e:
+                log.warning("%s konnte nicht geladen werden: %s", name, e)
+        return loaded
+
+
+registry = WordTemplateRegistry()